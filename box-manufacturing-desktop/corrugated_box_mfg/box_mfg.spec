@@ -61,6 +61,8 @@ a = Analysis(
         'whitenoise',
         'whitenoise.middleware',
         'whitenoise.storage',
+        'waitress',
+        'box_mfg.server',
         'box_mfg',
         'finished_goods',
         'inventory',
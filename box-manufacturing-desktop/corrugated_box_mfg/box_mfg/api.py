@@ -0,0 +1,133 @@
+"""
+Shared plumbing for the read-only REST API under ``/api/``.
+
+``ApiViewSet`` adds to DRF's ``ReadOnlyModelViewSet``:
+
+* cursor pagination in the viewset's ``ordering``, which follows an index
+  (``?cursor=``, ``?page_size=`` up to 500)
+* filters declared per viewset: ``filters`` maps query parameters to model
+  lookups, and ``date_field`` takes ``?since=``/``?until=`` (YYYY-MM-DD,
+  inclusive) as plain range lookups so its index can be used
+* sparse fieldsets, ``?fields=id,gsm,total_weight``
+* ``ETag``/``Last-Modified`` on every GET. Both come from one aggregate (row
+  count and newest change) over the filtered rows, so a poll that would get
+  the same answer is sent a 304 without any rows being read or serialized.
+
+Writes still go through the app's own views, which keep the summaries and
+the stock ledger in step.
+"""
+import hashlib
+from datetime import datetime, time, timedelta
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.dateparse import parse_date
+from django.utils.http import http_date, quote_etag
+from rest_framework import serializers, viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
+
+
+class ApiCursorPagination(CursorPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+    def get_ordering(self, request, queryset, view):
+        return view.ordering
+
+
+class SparseFieldsSerializer(serializers.ModelSerializer):
+    """Model serializer that keeps only the fields named in ``?fields=``"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        requested = request.query_params.get('fields') if request is not None else None
+        if not requested:
+            return
+        wanted = {name.strip() for name in requested.split(',') if name.strip()}
+        unknown = wanted - set(self.fields)
+        if unknown:
+            raise ValidationError({'fields': f"Unknown field(s): {', '.join(sorted(unknown))}"})
+        for name in set(self.fields) - wanted:
+            self.fields.pop(name)
+
+
+def _day_start(value, param):
+    try:
+        day = parse_date(value)
+    except ValueError:
+        day = None
+    if day is None:
+        raise ValidationError({param: f"Invalid date '{value}', expected YYYY-MM-DD"})
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+class ApiViewSet(viewsets.ReadOnlyModelViewSet):
+    """Read-only model endpoint with cursor pages, filters, sparse fields and conditional GET.
+
+    Subclasses set ``queryset``, ``serializer_class`` and ``ordering``, and
+    optionally ``filters``, ``date_field`` and ``modified_field``, the column
+    whose newest value says when the filtered rows last changed.
+    """
+    pagination_class = ApiCursorPagination
+    lookup_value_regex = r'\d+'
+    ordering = ('-id',)
+    filters = {}
+    date_field = None
+    modified_field = None
+
+    def filter_queryset(self, queryset):
+        params = self.request.query_params
+        for param, lookup in self.filters.items():
+            value = params.get(param)
+            if value in (None, ''):
+                continue
+            try:
+                queryset = queryset.filter(**{lookup: value})
+            except (ValueError, TypeError, DjangoValidationError):
+                raise ValidationError({param: f"Invalid value '{value}'"})
+        if self.date_field:
+            if params.get('since'):
+                queryset = queryset.filter(**{f'{self.date_field}__gte': _day_start(params['since'], 'since')})
+            if params.get('until'):
+                end = _day_start(params['until'], 'until') + timedelta(days=1)
+                queryset = queryset.filter(**{f'{self.date_field}__lt': end})
+        return queryset
+
+    def change_markers(self, queryset):
+        """``(row count, newest change)`` of ``queryset``, for the response validators"""
+        aggregates = {'count': Count('pk')}
+        if self.modified_field:
+            aggregates['modified'] = Max(self.modified_field)
+        values = queryset.order_by().aggregate(**aggregates)
+        return values['count'], values.get('modified')
+
+    def _conditional(self, queryset, handler, *args, **kwargs):
+        count, modified = self.change_markers(queryset)
+        request = self.request
+        key = f"{request.path}?{sorted(request.query_params.lists())}|{count}|{modified.isoformat() if modified else ''}"
+        etag = quote_etag(hashlib.sha1(key.encode()).hexdigest())
+        last_modified = int(modified.timestamp()) if modified else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response.headers['ETag'] = etag
+            if last_modified is not None:
+                response.headers['Last-Modified'] = http_date(last_modified)
+            # Clients may keep the body but must check back before reusing it
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self._conditional(queryset, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        queryset = self.get_queryset().filter(pk=kwargs[self.lookup_field])
+        return self._conditional(queryset, super().retrieve, *args, **kwargs)
@@ -0,0 +1,215 @@
+"""
+Per-view request metrics.
+
+``RequestMetricsMiddleware`` records each request's SQL query count, time
+spent in the database, time spent rendering templates and total latency,
+keyed by URL name (``finished_goods:order-list``). The last
+``settings.REQUEST_METRICS_WINDOW`` samples of every URL name are kept in
+memory and summarised as rolling percentiles on a staff-only page and as a
+Prometheus text endpoint.
+
+It is switched on with ``settings.REQUEST_METRICS_ENABLED``. When off the
+middleware removes itself at startup (``MiddlewareNotUsed``), so requests
+pay nothing for it.
+
+Samples live in the process that served the request; each server process
+reports its own figures. Template time includes any queries a template
+triggers, so it overlaps with DB time.
+"""
+import hmac
+import math
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.contrib.auth.decorators import user_passes_test
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpResponse
+from django.shortcuts import render
+from django.template.base import Template
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+# (Prometheus metric name, help text, page label, sample index, scale to base unit)
+METRICS = (
+    ('box_mfg_request_duration_seconds', 'Total request latency', 'Latency (ms)', 0, 1000),
+    ('box_mfg_request_db_seconds', 'Time spent running SQL queries', 'DB (ms)', 1, 1000),
+    ('box_mfg_request_template_seconds', 'Time spent rendering templates', 'Templates (ms)', 2, 1000),
+    ('box_mfg_request_queries', 'SQL queries run', 'Queries', 3, 1),
+)
+
+# Timings of the request being handled on this thread
+_current = ContextVar('request_metrics_sample', default=None)
+
+
+class _Sample:
+    __slots__ = ('queries', 'db_ms', 'template_ms', 'template_depth')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_ms = 0.0
+        self.template_ms = 0.0
+        self.template_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_ms += (time.perf_counter() - start) * 1000
+
+
+class MetricsStore:
+    """Rolling window of ``(total_ms, db_ms, template_ms, queries)`` samples per URL name"""
+
+    def __init__(self, window):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples = {}
+        # Request count and per-metric totals since startup, for Prometheus _count and _sum
+        self._totals = {}
+
+    def add(self, view_name, sample):
+        with self._lock:
+            samples = self._samples.get(view_name)
+            if samples is None:
+                samples = self._samples[view_name] = deque(maxlen=self.window)
+                self._totals[view_name] = [0] * (len(sample) + 1)
+            samples.append(sample)
+            totals = self._totals[view_name]
+            totals[0] += 1
+            for index, value in enumerate(sample, 1):
+                totals[index] += value
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+            self._totals.clear()
+
+    def summary(self):
+        """``[{'view', 'count', 'window', 'stats': [{'quantiles', 'sum'}, ...]}]`` ordered by p90 latency"""
+        with self._lock:
+            snapshot = {
+                name: (list(samples), list(self._totals[name])) for name, samples in self._samples.items()
+            }
+        rows = []
+        for name, (samples, totals) in snapshot.items():
+            stats = []
+            for _, _, _, index, _ in METRICS:
+                values = sorted(sample[index] for sample in samples)
+                stats.append({
+                    'quantiles': [percentile(values, q) for q in QUANTILES],
+                    'sum': totals[index + 1],
+                })
+            rows.append({'view': name, 'count': totals[0], 'window': len(samples), 'stats': stats})
+        rows.sort(key=lambda row: row['stats'][0]['quantiles'][1], reverse=True)
+        return rows
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of the sorted ``values``"""
+    if not values:
+        return 0
+    return values[max(0, math.ceil(q * len(values)) - 1)]
+
+
+store = MetricsStore(getattr(settings, 'REQUEST_METRICS_WINDOW', 500))
+
+_template_render = Template.render
+
+
+def _timed_template_render(self, context):
+    sample = _current.get()
+    if sample is None:
+        return _template_render(self, context)
+    # Included templates render inside their parent; only time the outermost
+    sample.template_depth += 1
+    start = time.perf_counter()
+    try:
+        return _template_render(self, context)
+    finally:
+        sample.template_depth -= 1
+        if not sample.template_depth:
+            sample.template_ms += (time.perf_counter() - start) * 1000
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_METRICS_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        Template.render = _timed_template_render
+
+    def __call__(self, request):
+        sample = _Sample()
+        token = _current.set(sample)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(sample))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total_ms = (time.perf_counter() - start) * 1000
+
+        # Static files and unmatched URLs have no view to attribute them to
+        match = request.resolver_match
+        if match is not None and match.view_name:
+            store.add(match.view_name, (total_ms, sample.db_ms, sample.template_ms, sample.queries))
+        return response
+
+
+def _allowed(request):
+    token = getattr(settings, 'REQUEST_METRICS_TOKEN', '')
+    # Constant-time, and on bytes since compare_digest rejects non-ASCII strings
+    header = request.headers.get('Authorization', '').encode()
+    if token and hmac.compare_digest(header, f'Bearer {token}'.encode()):
+        return True
+    return request.user.is_authenticated and request.user.is_staff
+
+
+def _label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+@user_passes_test(lambda u: u.is_staff)
+def metrics_page(request):
+    """Staff page with each view's rolling percentiles"""
+    if request.method == 'POST' and request.POST.get('action') == 'reset':
+        store.clear()
+    rows = store.summary()
+    for row in rows:
+        row['columns'] = [[round(value, 1) for value in stat['quantiles']] for stat in row['stats']]
+    return render(request, 'request_metrics.html', {
+        'enabled': getattr(settings, 'REQUEST_METRICS_ENABLED', False),
+        'window': store.window,
+        'quantiles': [f'p{int(q * 100)}' for q in QUANTILES],
+        'metric_labels': [label for _, _, label, _, _ in METRICS],
+        'column_count': 2 + len(METRICS) * len(QUANTILES),
+        'rows': rows,
+    })
+
+
+def metrics_prometheus(request):
+    """The same figures in the Prometheus text exposition format, as summaries"""
+    if not _allowed(request):
+        return HttpResponse('Forbidden', status=403, content_type='text/plain')
+    rows = store.summary()
+    lines = []
+    for metric_index, (name, help_text, _, _, scale) in enumerate(METRICS):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} summary')
+        for row in rows:
+            view = _label(row['view'])
+            stat = row['stats'][metric_index]
+            for q, value in zip(QUANTILES, stat['quantiles']):
+                lines.append(f'{name}{{view="{view}",quantile="{q}"}} {value / scale:.6g}')
+            lines.append(f'{name}_sum{{view="{view}"}} {stat["sum"] / scale:.6g}')
+            lines.append(f'{name}_count{{view="{view}"}} {row["count"]}')
+    return HttpResponse('\n'.join(lines) + '\n', content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,122 @@
+"""
+Production server launcher for box_mfg.
+
+Runs ``box_mfg.wsgi`` under waitress (pure Python, works on the Windows
+desktop build) or gunicorn (Linux/Docker, optionally with an ASGI worker
+class such as ``uvicorn.workers.UvicornWorker`` for ``box_mfg.asgi``).
+Everything is configured from the environment:
+
+    BOX_MFG_SERVER        waitress (default) or gunicorn
+    BOX_MFG_HOST          bind address, default 127.0.0.1
+    BOX_MFG_PORT          bind port, default 8000
+    BOX_MFG_WORKERS       gunicorn worker processes, default 2 x CPUs + 1 (max 8)
+    BOX_MFG_THREADS       threads per worker, default 8
+    BOX_MFG_KEEPALIVE     seconds to keep idle connections open, default 5
+    BOX_MFG_TIMEOUT       seconds before a stuck request's worker is restarted, default 60
+    BOX_MFG_WORKER_CLASS  gunicorn worker class, default gthread
+
+Run directly with ``python -m box_mfg.server`` or through
+``run_server.py --serve``.
+"""
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(f"Ignoring invalid {name}={value!r}, using {default}")
+        return default
+
+
+def server_config():
+    cpus = os.cpu_count() or 1
+    return {
+        'server': os.environ.get('BOX_MFG_SERVER', 'waitress').lower(),
+        'host': os.environ.get('BOX_MFG_HOST', '127.0.0.1'),
+        'port': _env_int('BOX_MFG_PORT', 8000),
+        'workers': _env_int('BOX_MFG_WORKERS', min(2 * cpus + 1, 8)),
+        'threads': _env_int('BOX_MFG_THREADS', 8),
+        'keepalive': _env_int('BOX_MFG_KEEPALIVE', 5),
+        'timeout': _env_int('BOX_MFG_TIMEOUT', 60),
+        'worker_class': os.environ.get('BOX_MFG_WORKER_CLASS', 'gthread'),
+    }
+
+
+def announce_ready(config):
+    # The Electron shell waits for this line on stdout before loading the app
+    print(f"Starting server at http://{config['host']}:{config['port']}/", flush=True)
+
+
+def serve_waitress(config):
+    from waitress import create_server
+    from box_mfg.wsgi import application
+
+    # waitress is a single process; concurrency comes from its thread pool.
+    # It has no per-request timeout, so BOX_MFG_TIMEOUT does not apply here.
+    server = create_server(
+        application,
+        host=config['host'],
+        port=config['port'],
+        threads=config['threads'],
+        channel_timeout=config['keepalive'],
+        ident='box_mfg',
+    )
+    logger.info(f"waitress listening on {config['host']}:{config['port']} with {config['threads']} threads")
+    announce_ready(config)
+    server.run()
+
+
+def serve_gunicorn(config):
+    from gunicorn.app.base import BaseApplication
+
+    class BoxMfgApplication(BaseApplication):
+        def load_config(self):
+            options = {
+                'bind': f"{config['host']}:{config['port']}",
+                'workers': config['workers'],
+                'threads': config['threads'],
+                'keepalive': config['keepalive'],
+                'timeout': config['timeout'],
+                'worker_class': config['worker_class'],
+                'when_ready': lambda server: announce_ready(config),
+            }
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            if 'uvicorn' in config['worker_class'].lower():
+                from box_mfg.asgi import application
+            else:
+                from box_mfg.wsgi import application
+            return application
+
+    logger.info(
+        f"gunicorn listening on {config['host']}:{config['port']} with "
+        f"{config['workers']} workers x {config['threads']} threads ({config['worker_class']})"
+    )
+    BoxMfgApplication().run()
+
+
+def serve(config=None):
+    config = config or server_config()
+    if config['server'] == 'gunicorn':
+        if os.name == 'nt':
+            logger.warning("gunicorn does not run on Windows, falling back to waitress")
+        else:
+            return serve_gunicorn(config)
+    elif config['server'] != 'waitress':
+        logger.warning(f"Unknown BOX_MFG_SERVER {config['server']!r}, using waitress")
+    return serve_waitress(config)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'box_mfg.settings')
+    serve()
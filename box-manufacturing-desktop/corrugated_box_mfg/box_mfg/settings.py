@@ -41,6 +41,8 @@ INSTALLED_APPS = [
 
 # Middleware configuration
 MIDDLEWARE = [
+    # First, so its latency covers the rest of the stack; removes itself unless REQUEST_METRICS_ENABLED
+    'box_mfg.request_metrics.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -76,6 +78,29 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'box_mfg.wsgi.application'
 
+# SQLite tuning, applied to every new connection through init_command.
+# WAL lets the overview pages keep reading while an intake form writes, and
+# IMMEDIATE transactions make writers queue on the busy timeout instead of
+# failing with "database is locked". Each pragma can be overridden with a
+# SQLITE_<NAME> environment variable, e.g. SQLITE_CACHE_SIZE=-131072.
+SQLITE_PRAGMAS = {
+    'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+    # Negative values are KiB, so this is a 64 MB page cache
+    'cache_size': int(os.environ.get('SQLITE_CACHE_SIZE', -64 * 1024)),
+    'temp_store': os.environ.get('SQLITE_TEMP_STORE', 'MEMORY'),
+}
+SQLITE_OPTIONS = {
+    'init_command': ';'.join(f'PRAGMA {name}={value}' for name, value in SQLITE_PRAGMAS.items()),
+    # Seconds a connection waits for a lock before giving up
+    'timeout': float(os.environ.get('SQLITE_BUSY_TIMEOUT', 20)),
+    'transaction_mode': os.environ.get('SQLITE_TRANSACTION_MODE', 'IMMEDIATE'),
+}
+
+# Seconds between background PRAGMA optimize / WAL checkpoint runs (0 disables)
+SQLITE_MAINTENANCE_INTERVAL = int(os.environ.get('SQLITE_MAINTENANCE_INTERVAL', 3600))
+
 # Database configuration
 # Use docker_settings.py if running in Docker (DJANGO_DB_HOST is set)
 if os.environ.get('DJANGO_DB_HOST'):
@@ -88,6 +113,7 @@ elif getattr(sys, 'frozen', False):
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': os.environ.get('DATABASE_PATH'),
+            'OPTIONS': SQLITE_OPTIONS,
         }
     }
 else:
@@ -95,8 +121,54 @@ else:
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': BASE_DIR / 'db.sqlite3',
+            'OPTIONS': SQLITE_OPTIONS,
+        }
+    }
+
+# Cache configuration
+# The desktop build runs as several short-lived processes around one SQLite
+# file, so it shares a file-based cache next to the executable.
+if 'CACHES' in globals():
+    # Set by docker_settings.py: gunicorn workers share a table in Postgres
+    pass
+elif getattr(sys, 'frozen', False):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('CACHE_DIR', str(Path(sys.executable).parent / 'cache')),
         }
     }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'box-mfg',
+        }
+    }
+
+# Upper bound on how stale the dashboard can get if an invalidation is missed
+DASHBOARD_CACHE_TIMEOUT = int(os.environ.get('DASHBOARD_CACHE_TIMEOUT', 300))
+
+# Read-only REST API at /api/ (see box_mfg/api.py). Browser sessions work as
+# they are; integrations can log in with HTTP Basic auth.
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'rest_framework.authentication.SessionAuthentication',
+        'rest_framework.authentication.BasicAuthentication',
+    ],
+    'DEFAULT_PERMISSION_CLASSES': ['rest_framework.permissions.IsAuthenticated'],
+}
+
+# Per-view query count and latency percentiles at /metrics/ (see box_mfg/request_metrics.py)
+REQUEST_METRICS_ENABLED = os.environ.get('REQUEST_METRICS_ENABLED', '0').lower() in ('1', 'true', 'yes')
+# Samples kept per URL name for the rolling percentiles
+REQUEST_METRICS_WINDOW = int(os.environ.get('REQUEST_METRICS_WINDOW', 500))
+# Lets a Prometheus scraper read /metrics/prometheus/ with "Authorization: Bearer <token>"
+REQUEST_METRICS_TOKEN = os.environ.get('REQUEST_METRICS_TOKEN', '')
+
+# Inventory log entries older than this many days are moved to the archive
+# table by the archive_inventory_logs command
+INVENTORY_LOG_RETENTION_DAYS = int(os.environ.get('INVENTORY_LOG_RETENTION_DAYS', 90))
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -0,0 +1,63 @@
+"""
+Periodic upkeep for the SQLite database.
+
+``optimize_database`` runs ``PRAGMA optimize`` so the query planner's
+statistics keep up with the growing transaction tables, and checkpoints the
+WAL so the ``-wal`` file next to ``db.sqlite3`` doesn't grow without bound.
+``start_maintenance_thread`` repeats it every
+``settings.SQLITE_MAINTENANCE_INTERVAL`` seconds for the life of the server.
+"""
+import logging
+import threading
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+def optimize_database(using='default'):
+    """Run PRAGMA optimize and a WAL checkpoint.
+
+    Returns the ``(busy, log pages, checkpointed pages)`` row from
+    ``wal_checkpoint``, or ``None`` for non-SQLite databases.
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA optimize')
+        # TRUNCATE also shrinks the -wal file back to zero bytes when no
+        # reader is holding it open
+        cursor.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        return cursor.fetchone()
+
+
+def _maintenance_loop(interval, stop_event):
+    while not stop_event.wait(interval):
+        try:
+            result = optimize_database()
+            logger.info(f"SQLite maintenance finished: wal_checkpoint={result}")
+        except Exception as e:
+            logger.warning(f"SQLite maintenance failed: {e}")
+        finally:
+            # The thread owns its own connection; don't keep it open between runs
+            connections.close_all()
+
+
+def start_maintenance_thread(interval=None):
+    """Start the background maintenance thread and return its stop event.
+
+    Returns ``None`` when maintenance is disabled or the database isn't SQLite.
+    """
+    interval = settings.SQLITE_MAINTENANCE_INTERVAL if interval is None else interval
+    if interval <= 0 or connections['default'].vendor != 'sqlite':
+        return None
+    stop_event = threading.Event()
+    thread = threading.Thread(
+        target=_maintenance_loop, args=(interval, stop_event),
+        name='sqlite-maintenance', daemon=True,
+    )
+    thread.start()
+    logger.info(f"SQLite maintenance scheduled every {interval} s")
+    return stop_event
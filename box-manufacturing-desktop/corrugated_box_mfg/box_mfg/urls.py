@@ -2,7 +2,29 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from rest_framework.routers import DefaultRouter
+
 from inventory.views import inventory_home
+from inventory import api as inventory_api
+from finished_goods import api as finished_goods_api
+
+from .request_metrics import metrics_page, metrics_prometheus
+
+# Read-only REST API, see box_mfg/api.py
+api = DefaultRouter()
+api.register('paper-reels', inventory_api.PaperReelViewSet)
+api.register('pasting-gum', inventory_api.PastingGumViewSet)
+api.register('ink', inventory_api.InkViewSet)
+api.register('strapping-rolls', inventory_api.StrappingRollViewSet)
+api.register('pin-coils', inventory_api.PinCoilViewSet)
+api.register('summaries/paper-reels', inventory_api.PaperReelSummaryViewSet)
+api.register('summaries/pasting-gum', inventory_api.PastingGumSummaryViewSet)
+api.register('summaries/ink', inventory_api.InkSummaryViewSet)
+api.register('summaries/strapping-rolls', inventory_api.StrappingRollSummaryViewSet)
+api.register('summaries/pin-coils', inventory_api.PinCoilSummaryViewSet)
+api.register('inventory-logs', inventory_api.InventoryLogViewSet)
+api.register('boxes', finished_goods_api.BoxDetailsViewSet)
+api.register('orders', finished_goods_api.BoxOrderViewSet)
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -11,4 +33,7 @@ urlpatterns = [
     path('finished-goods/', include('finished_goods.urls', namespace='finished_goods')),
     path('data-cleanup/', include('data_cleanup.urls', namespace='data_cleanup')),
     path('accounts/', include('accounts.urls')),
+    path('api/', include(api.urls)),
+    path('metrics/', metrics_page, name='request-metrics'),
+    path('metrics/prometheus/', metrics_prometheus, name='request-metrics-prometheus'),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,191 @@
+"""
+Background cleanup jobs.
+
+Each cleanup action deletes a fixed list of tables, children before parents,
+inside a single transaction, so a failure leaves nothing half-deleted. Rows
+are removed with raw ``DELETE`` statements over primary key ranges rather
+than ``QuerySet.delete()``, which would load every row to collect cascades
+and send signals nobody needs here. Jobs run on a thread and
+publish their progress to the cache for the dashboard to poll.
+"""
+import logging
+import threading
+import uuid
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from inventory.models import (
+    PaperReel, PastingGum, Ink, StrappingRoll, PinCoil,
+    PaperReelSummary, PastingGumSummary, InkSummary, StrappingRollSummary, PinCoilSummary,
+    InventoryLog, ArchivedInventoryLog, FieldSuggestion, StockAlert, StockReservation, PaperCostLayer,
+    StockMovement, StockIssue,
+)
+from inventory.alerts import invalidate_alerts
+from inventory.availability import invalidate_paper_availability
+from inventory.dashboard import invalidate_dashboard
+from inventory.suggestions import invalidate_suggestions
+from inventory.summaries import clear_reservations
+from finished_goods.models import (
+    BoxOrder, BoxDetails, BoxPaperRequirements, MaterialRequirement, ManufacturingCost
+)
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 5000
+JOB_CACHE_TIMEOUT = 60 * 60
+RUNNING_JOB_KEY = 'data_cleanup:running'
+
+# Reservations are not in the list: see _detach_from_orders
+ORDER_MODELS = [MaterialRequirement, ManufacturingCost, BoxOrder]
+TEMPLATE_MODELS = [BoxPaperRequirements, BoxDetails]
+INVENTORY_MODELS = [
+    StockReservation, PaperCostLayer, StockMovement, StockIssue, InventoryLog, ArchivedInventoryLog,
+    PaperReelSummary, PastingGumSummary, InkSummary, StrappingRollSummary, PinCoilSummary,
+    PaperReel, PastingGum, Ink, StrappingRoll, PinCoil,
+    FieldSuggestion, StockAlert,
+]
+
+# Tables each action clears, in delete order
+CLEANUP_ACTIONS = {
+    'inventory': INVENTORY_MODELS,
+    'orders': ORDER_MODELS,
+    'templates': TEMPLATE_MODELS,
+    'all': list(dict.fromkeys(ORDER_MODELS + TEMPLATE_MODELS + INVENTORY_MODELS)),
+}
+
+
+class CleanupError(Exception):
+    pass
+
+
+def _job_key(job_id):
+    return f"data_cleanup:job:{job_id}"
+
+
+def get_job(job_id):
+    return cache.get(_job_key(job_id))
+
+
+def _save_job(job):
+    cache.set(_job_key(job['id']), job, JOB_CACHE_TIMEOUT)
+
+
+def delete_table(model, on_progress=None):
+    """Delete every row of ``model`` in primary key chunks. Returns rows deleted."""
+    bounds = model.objects.aggregate(low=Min('pk'), high=Max('pk'))
+    if bounds['low'] is None:
+        return 0
+    table = connection.ops.quote_name(model._meta.db_table)
+    pk = connection.ops.quote_name(model._meta.pk.column)
+    deleted = 0
+    with connection.cursor() as cursor:
+        for start in range(bounds['low'], bounds['high'] + 1, CHUNK_SIZE):
+            cursor.execute(
+                f"DELETE FROM {table} WHERE {pk} >= %s AND {pk} < %s",
+                [start, start + CHUNK_SIZE],
+            )
+            deleted += cursor.rowcount
+            if on_progress:
+                on_progress(deleted)
+    return deleted
+
+
+def _detach_from_orders():
+    """Drop open reservations and keep consumed ones and stock issues without their order.
+
+    Consumed and issued stock stays taken off the summaries, so its ledger
+    rows must stay too or ``rebuild_summaries`` would put the stock back.
+    The raw ``DELETE`` of orders does not apply ``SET_NULL`` itself.
+    """
+    StockIssue.objects.filter(order__isnull=False).update(order=None)
+    StockReservation.objects.exclude(status='CONSUMED').delete()
+    StockReservation.objects.filter(order__isnull=False).update(order=None)
+
+
+def run_cleanup(action, job=None):
+    """Clear the tables for ``action`` in one transaction. Returns ``{model name: rows}``."""
+    models = CLEANUP_ACTIONS[action]
+    if action == 'templates' and BoxOrder.objects.exists():
+        raise CleanupError("Cannot delete box templates while orders exist. Clear orders first.")
+
+    counts = {model: model.objects.count() for model in models}
+    if job is not None:
+        job['total'] = sum(counts.values())
+        _save_job(job)
+
+    deleted = {}
+    with transaction.atomic():
+        if BoxOrder in models:
+            _detach_from_orders()
+        for model in models:
+            done_before = sum(deleted.values())
+
+            def on_progress(rows, model=model, done_before=done_before):
+                if job is not None:
+                    job['done'] = done_before + rows
+                    job['current'] = model._meta.verbose_name_plural
+                    _save_job(job)
+
+            deleted[model._meta.label] = delete_table(model, on_progress)
+        if BoxOrder in models or StockReservation in models:
+            clear_reservations()
+        transaction.on_commit(invalidate_dashboard)
+        if FieldSuggestion in models:
+            transaction.on_commit(invalidate_suggestions)
+        if StockAlert in models:
+            invalidate_alerts()
+        if PaperReelSummary in models:
+            invalidate_paper_availability()
+    return deleted
+
+
+def _run_job(job):
+    job['status'] = 'running'
+    _save_job(job)
+    try:
+        job['deleted'] = run_cleanup(job['action'], job)
+        job['status'] = 'done'
+        job['message'] = f"Deleted {sum(job['deleted'].values())} records."
+    except CleanupError as e:
+        job['status'] = 'failed'
+        job['message'] = str(e)
+    except Exception as e:
+        logger.error(f"Cleanup job {job['id']} failed: {e}", exc_info=True)
+        job['status'] = 'failed'
+        job['message'] = f"Cleanup failed, no data was deleted: {e}"
+    finally:
+        job['finished_at'] = timezone.now().isoformat()
+        _save_job(job)
+        cache.delete(RUNNING_JOB_KEY)
+        connection.close()
+
+
+def start_cleanup_job(action, user=None):
+    """Start ``action`` on a background thread and return the job id.
+
+    Raises ``CleanupError`` if another cleanup is still running.
+    """
+    if action not in CLEANUP_ACTIONS:
+        raise CleanupError(f"Unknown cleanup action: {action}")
+    job_id = uuid.uuid4().hex
+    if not cache.add(RUNNING_JOB_KEY, job_id, JOB_CACHE_TIMEOUT):
+        raise CleanupError("Another cleanup is already running.")
+    job = {
+        'id': job_id,
+        'action': action,
+        'status': 'pending',
+        'done': 0,
+        'total': None,
+        'current': None,
+        'deleted': {},
+        'message': '',
+        'user': getattr(user, 'username', None),
+        'started_at': timezone.now().isoformat(),
+        'finished_at': None,
+    }
+    _save_job(job)
+    threading.Thread(target=_run_job, args=(job,), name=f"cleanup-{job_id}", daemon=True).start()
+    return job_id
@@ -9,4 +9,5 @@ urlpatterns = [
     path('clear-orders/', views.clear_orders, name='clear_orders'),
     path('clear-templates/', views.clear_templates, name='clear_templates'),
     path('clear-all/', views.clear_all, name='clear_all'),
+    path('jobs/<str:job_id>/', views.job_status, name='job_status'),
 ]
\ No newline at end of file
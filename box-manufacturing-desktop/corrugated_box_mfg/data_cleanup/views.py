@@ -1,18 +1,20 @@
 from django.shortcuts import render, redirect
 from django.contrib import messages
 from django.contrib.auth.decorators import user_passes_test
+from django.http import JsonResponse
+from django.urls import reverse
 from django.views.decorators.http import require_POST
 
 # Import inventory models
 from inventory.models import (
-    PaperReel, PastingGum, Ink, StrappingRoll, PinCoil,
-    PaperReelSummary, PastingGumSummary, InkSummary, StrappingRollSummary, PinCoilSummary,
-    InventoryLog
+    PaperReel, PastingGum, Ink, StrappingRoll, PinCoil, InventoryLog
 )
 
 # Import finished goods models
 from finished_goods.models import BoxOrder, BoxDetails, MaterialRequirement, ManufacturingCost
 
+from .jobs import CleanupError, get_job, start_cleanup_job
+
 @user_passes_test(lambda u: u.is_staff)
 def cleanup_dashboard(request):
     """Show the cleanup dashboard with stats and cleanup options"""
@@ -34,141 +36,60 @@ def cleanup_dashboard(request):
         },
         'templates_stats': {
             'box_templates': BoxDetails.objects.count()
-        }
+        },
+        # Set after a cleanup is started so the page can poll its progress
+        'job_id': request.GET.get('job'),
     }
     
     return render(request, 'data_cleanup/dashboard.html', context)
 
+def _start_job(request, action, confirm_message):
+    """Queue a cleanup job and send the browser back to the dashboard to watch it"""
+    if 'confirm' not in request.POST:
+        messages.warning(request, confirm_message)
+        return redirect('data_cleanup:dashboard')
+    try:
+        job_id = start_cleanup_job(action, request.user)
+    except CleanupError as e:
+        messages.error(request, str(e))
+        return redirect('data_cleanup:dashboard')
+    return redirect(f"{reverse('data_cleanup:dashboard')}?job={job_id}")
+
 @require_POST
 @user_passes_test(lambda u: u.is_staff)
 def clear_inventory(request):
     """Clear all inventory data"""
-    if 'confirm' in request.POST:
-        # Delete all inventory log entries
-        log_count = InventoryLog.objects.count()
-        InventoryLog.objects.all().delete()
-        
-        # Delete all summary records
-        summaries_count = (
-            PaperReelSummary.objects.count() +
-            PastingGumSummary.objects.count() +
-            InkSummary.objects.count() +
-            StrappingRollSummary.objects.count() +
-            PinCoilSummary.objects.count()
-        )
-        
-        PaperReelSummary.objects.all().delete()
-        PastingGumSummary.objects.all().delete()
-        InkSummary.objects.all().delete()
-        StrappingRollSummary.objects.all().delete()
-        PinCoilSummary.objects.all().delete()
-        
-        # Delete all transaction records
-        transactions_count = (
-            PaperReel.objects.count() +
-            PastingGum.objects.count() +
-            Ink.objects.count() +
-            StrappingRoll.objects.count() +
-            PinCoil.objects.count()
-        )
-        
-        PaperReel.objects.all().delete()
-        PastingGum.objects.all().delete()
-        Ink.objects.all().delete()
-        StrappingRoll.objects.all().delete()
-        PinCoil.objects.all().delete()
-        
-        messages.success(
-            request, 
-            f"Successfully deleted {log_count} logs, {summaries_count} summaries, and {transactions_count} transactions."
-        )
-    else:
-        messages.warning(request, "Confirmation required to clear inventory data.")
-    
-    return redirect('data_cleanup:dashboard')
+    return _start_job(request, 'inventory', "Confirmation required to clear inventory data.")
 
 @require_POST
 @user_passes_test(lambda u: u.is_staff)
 def clear_orders(request):
     """Clear all order data"""
-    if 'confirm' in request.POST:
-        # First delete related data
-        mr_count = MaterialRequirement.objects.count()
-        mc_count = ManufacturingCost.objects.count()
-        MaterialRequirement.objects.all().delete()
-        ManufacturingCost.objects.all().delete()
-        
-        # Then delete orders
-        order_count = BoxOrder.objects.count()
-        BoxOrder.objects.all().delete()
-        
-        messages.success(
-            request, 
-            f"Successfully deleted {order_count} orders, {mr_count} material requirements, and {mc_count} manufacturing costs."
-        )
-    else:
-        messages.warning(request, "Confirmation required to clear order data.")
-    
-    return redirect('data_cleanup:dashboard')
+    return _start_job(request, 'orders', "Confirmation required to clear order data.")
 
 @require_POST
 @user_passes_test(lambda u: u.is_staff)
 def clear_templates(request):
     """Clear all box template data"""
-    if 'confirm' in request.POST:
-        # Check if there are orders that depend on templates
-        if BoxOrder.objects.exists():
-            messages.error(
-                request, 
-                "Cannot delete box templates while orders exist. Clear orders first."
-            )
-        else:
-            template_count = BoxDetails.objects.count()
-            BoxDetails.objects.all().delete()
-            messages.success(request, f"Successfully deleted {template_count} box templates.")
-    else:
-        messages.warning(request, "Confirmation required to clear template data.")
-    
-    return redirect('data_cleanup:dashboard')
+    # Checked again inside the job, but fail fast while the user is still here
+    if 'confirm' in request.POST and BoxOrder.objects.exists():
+        messages.error(
+            request, 
+            "Cannot delete box templates while orders exist. Clear orders first."
+        )
+        return redirect('data_cleanup:dashboard')
+    return _start_job(request, 'templates', "Confirmation required to clear template data.")
 
 @require_POST
 @user_passes_test(lambda u: u.is_staff)
 def clear_all(request):
     """Clear all data (complete system reset)"""
-    if 'confirm' in request.POST:
-        # First clear orders since they depend on templates
-        mr_count = MaterialRequirement.objects.count()
-        mc_count = ManufacturingCost.objects.count()
-        order_count = BoxOrder.objects.count()
-        MaterialRequirement.objects.all().delete()
-        ManufacturingCost.objects.all().delete()
-        BoxOrder.objects.all().delete()
-        
-        # Then clear templates
-        template_count = BoxDetails.objects.count()
-        BoxDetails.objects.all().delete()
-        
-        # Finally clear inventory
-        log_count = InventoryLog.objects.count()
-        InventoryLog.objects.all().delete()
-        
-        PaperReelSummary.objects.all().delete()
-        PastingGumSummary.objects.all().delete()
-        InkSummary.objects.all().delete()
-        StrappingRollSummary.objects.all().delete()
-        PinCoilSummary.objects.all().delete()
-        
-        PaperReel.objects.all().delete()
-        PastingGum.objects.all().delete()
-        Ink.objects.all().delete()
-        StrappingRoll.objects.all().delete()
-        PinCoil.objects.all().delete()
-        
-        messages.success(
-            request, 
-            f"Complete system reset successful. Deleted {order_count} orders, {template_count} templates, and all inventory data."
-        )
-    else:
-        messages.warning(request, "Confirmation required for complete system reset.")
-    
-    return redirect('data_cleanup:dashboard')
+    return _start_job(request, 'all', "Confirmation required for complete system reset.")
+
+@user_passes_test(lambda u: u.is_staff)
+def job_status(request, job_id):
+    """Progress of a cleanup job, polled by the dashboard"""
+    job = get_job(job_id)
+    if job is None:
+        return JsonResponse({'error': 'Job not found'}, status=404)
+    return JsonResponse(job)
@@ -1,6 +1,22 @@
 # Example Django settings override for Docker
 import os
 
+# Connection reuse. By default each worker thread keeps its connection open
+# for DJANGO_DB_CONN_MAX_AGE seconds, and Django pings it before reuse.
+# Set DJANGO_DB_POOL=1 to use psycopg's connection pool instead, which needs
+# psycopg[pool]. Django doesn't allow the pool and persistent connections at
+# the same time, so CONN_MAX_AGE is forced to 0 in that case.
+DB_POOL = os.environ.get('DJANGO_DB_POOL') == '1'
+
+DB_OPTIONS = {}
+if DB_POOL:
+    DB_OPTIONS['pool'] = {
+        'min_size': int(os.environ.get('DJANGO_DB_POOL_MIN_SIZE', 2)),
+        'max_size': int(os.environ.get('DJANGO_DB_POOL_MAX_SIZE', 10)),
+        # Seconds a request waits for a free connection before erroring
+        'timeout': float(os.environ.get('DJANGO_DB_POOL_TIMEOUT', 10)),
+    }
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -8,6 +24,20 @@ DATABASES = {
         'USER': os.environ.get('DJANGO_DB_USER', 'boxuser'),
         'PASSWORD': os.environ.get('DJANGO_DB_PASSWORD', 'boxpass'),
         'HOST': os.environ.get('DJANGO_DB_HOST', 'db'),
-        'PORT': 5432,
+        'PORT': int(os.environ.get('DJANGO_DB_PORT', 5432)),
+        'CONN_MAX_AGE': 0 if DB_POOL else int(os.environ.get('DJANGO_DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': not DB_POOL,
+        'OPTIONS': DB_OPTIONS,
+    }
+}
+
+# Every gunicorn worker is its own process, so a per-process LocMemCache would
+# split the cleanup job progress and lock, the dashboard, alert, availability
+# and suggestion caches between them. They share a table in Postgres instead,
+# created by `manage.py createcachetable` on startup.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': os.environ.get('DJANGO_CACHE_TABLE', 'box_mfg_cache'),
     }
 }
@@ -0,0 +1,68 @@
+"""
+Read-only API endpoints for box templates and orders (see ``box_mfg.api``).
+"""
+from django.db.models import Count, Max
+from rest_framework import serializers
+
+from box_mfg.api import ApiViewSet, SparseFieldsSerializer
+
+from .models import BoxDetails, BoxOrder, BoxPaperRequirements
+
+
+class BoxPaperRequirementsSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = BoxPaperRequirements
+        exclude = ('id', 'box')
+
+
+class BoxDetailsSerializer(SparseFieldsSerializer):
+    paper_requirements = BoxPaperRequirementsSerializer(read_only=True)
+
+    class Meta:
+        model = BoxDetails
+        fields = '__all__'
+
+
+class BoxOrderSerializer(SparseFieldsSerializer):
+    box_name = serializers.CharField(source='box_template.box_name', read_only=True)
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    total_cost = serializers.DecimalField(
+        source='manufacturing_cost.total_cost', max_digits=10, decimal_places=2, read_only=True,
+    )
+    suggested_price = serializers.DecimalField(
+        source='manufacturing_cost.suggested_price', max_digits=10, decimal_places=2, read_only=True,
+    )
+    unit_price = serializers.DecimalField(
+        source='manufacturing_cost.unit_price', max_digits=10, decimal_places=2, read_only=True,
+    )
+    costed_at = serializers.DateTimeField(source='material_requirement.computed_at', read_only=True)
+
+    class Meta:
+        model = BoxOrder
+        fields = '__all__'
+
+
+class BoxDetailsViewSet(ApiViewSet):
+    queryset = BoxDetails.objects.select_related('paper_requirements')
+    serializer_class = BoxDetailsSerializer
+    ordering = ('-created_at', '-id')
+    date_field = 'created_at'
+    modified_field = 'updated_at'
+    filters = {'flute_type': 'flute_type', 'num_plies': 'num_plies'}
+
+
+class BoxOrderViewSet(ApiViewSet):
+    queryset = BoxOrder.objects.select_related('box_template', 'material_requirement', 'manufacturing_cost')
+    serializer_class = BoxOrderSerializer
+    ordering = ('-created_at', '-id')
+    date_field = 'created_at'
+    filters = {'status': 'status', 'customer': 'customer_name', 'box_template': 'box_template_id'}
+
+    def change_markers(self, queryset):
+        # Re-costing an order rewrites its stored costing, not the order row
+        values = queryset.order_by().aggregate(
+            count=Count('pk'),
+            updated=Max('updated_at'),
+            costed=Max('material_requirement__computed_at'),
+        )
+        return values['count'], max(filter(None, (values['updated'], values['costed'])), default=None)
@@ -0,0 +1,199 @@
+"""
+Box calculation engine.
+
+Computes shrinkage, flute size, board sizes, UPS, surface area, paper
+weights and cost estimates for any number of boxes at once. Every formula
+works on NumPy arrays, so costing a few hundred candidate boxes from an RFQ
+is a handful of array operations rather than a loop over boxes.
+"""
+import numpy as np
+
+# Shrinkage applied to the finished dimensions
+LENGTH_SHRINKAGE = 1.006
+BREADTH_SHRINKAGE = 1.006
+HEIGHT_SHRINKAGE = 1.0112
+
+# Take-Up Factor for flute papers
+FLUTE_TUF = 1.35
+
+# Assume paper costs ₹80 per kg (adjust as needed)
+PAPER_COST_PER_KG = 80
+LABOR_COST_PERCENTAGE = 0.3
+
+# Paper layers: (name, minimum plies that use it, exact ply count or None, uses TUF)
+PAPER_LAYERS = [
+    ('top_paper', 3, None, False),
+    ('bottom_paper', 3, None, False),
+    ('flute_paper', 5, None, True),
+    ('flute_paper1', 7, 7, True),
+    ('middle_paper', 7, 7, False),
+    ('flute_paper2', 7, 7, True),
+]
+
+MAX_BATCH_SIZE = 1000
+
+
+def _column(specs, field, default=0, dtype=float):
+    return np.array([spec.get(field) or default for spec in specs], dtype=dtype)
+
+
+def calculate_boxes(specs):
+    """Calculate every box in ``specs`` in one vectorised pass.
+
+    Each spec is a mapping with ``length``, ``breadth``, ``height`` (cm),
+    ``flute_type``, ``num_plies`` and the ``<layer>_gsm`` values. Returns a
+    dict of arrays, one element per box; use ``box_result`` to pull out a
+    single box in the JSON shape the order form expects.
+    """
+    length = _column(specs, 'length')
+    breadth = _column(specs, 'breadth')
+    height = _column(specs, 'height')
+    num_plies = _column(specs, 'num_plies', default=3, dtype=int)
+
+    calc = {
+        'length': length,
+        'breadth': breadth,
+        'height': height,
+        'num_plies': num_plies,
+        'flute_type': [spec.get('flute_type') or 'B' for spec in specs],
+    }
+
+    # Calculate dimensions with shrinkage
+    calc['length_with_shrinkage'] = length * LENGTH_SHRINKAGE
+    calc['breadth_with_shrinkage'] = breadth * BREADTH_SHRINKAGE
+    calc['height_with_shrinkage'] = height * HEIGHT_SHRINKAGE
+
+    # Calculate flute size
+    flute_size = (breadth + 0.635) * 1.013575 / 2
+    calc['flute_size'] = flute_size
+
+    # Board size calculations in inches
+    calc['full_length_in'] = ((length + breadth) * 2 + 3.5 + 0.5) / 2.54
+    calc['half_length_in'] = ((length + breadth) + 3.5 + 0.4) / 2.54
+    calc['reel_size_1up'] = ((height + flute_size + flute_size) + 0.8) / 2.54
+    calc['reel_size_2up'] = (((height + flute_size + flute_size) * 2) + 0.8) / 2.54
+    reel_width = (breadth + height) / 2.54
+    calc['reel_width'] = reel_width
+
+    # Determine UPS (number of boards to cut from a sheet)
+    calc['ups'] = np.select(
+        [
+            reel_width < 20,
+            (reel_width >= 20) & (reel_width < 40),
+            reel_width < 60,
+            calc['full_length_in'] > 60,
+        ],
+        ['2 board length', '1 board length', 'full length', 'half length'],
+        default='Unknown',
+    )
+
+    # Surface area in square meters: top/bottom plus both pairs of sides
+    length_m = length / 100
+    breadth_m = breadth / 100
+    height_m = height / 100
+    calc['length_m'] = length_m
+    calc['breadth_m'] = breadth_m
+    calc['height_m'] = height_m
+    total_area = 2 * (length_m * breadth_m) + 2 * (length_m * height_m) + 2 * (breadth_m * height_m)
+    calc['total_area'] = total_area
+
+    # Weight in kg = (area in m² × GSM) / 1000, × TUF for flute papers.
+    # Layers a box doesn't have weigh nothing and are masked out.
+    total_material_weight = np.zeros(len(specs))
+    for layer, min_plies, exact_plies, uses_tuf in PAPER_LAYERS:
+        gsm = _column(specs, f'{layer}_gsm')
+        used = num_plies == exact_plies if exact_plies else num_plies >= min_plies
+        weight = total_area * gsm * FLUTE_TUF / 1000 if uses_tuf else total_area * gsm / 1000
+        weight = np.where(used, weight, 0.0)
+        calc[f'{layer}_gsm'] = gsm
+        calc[f'{layer}_used'] = used
+        calc[f'{layer}_weight'] = weight
+        total_material_weight = total_material_weight + weight
+    calc['total_material_weight'] = total_material_weight
+
+    # Cost calculations
+    material_cost = total_material_weight * PAPER_COST_PER_KG
+    labor_cost = material_cost * LABOR_COST_PERCENTAGE
+    calc['material_cost'] = material_cost
+    calc['labor_cost'] = labor_cost
+    calc['total_cost'] = material_cost + labor_cost
+    return calc
+
+
+def box_result(calc, i):
+    """Plain-python result for box ``i`` of a ``calculate_boxes`` batch"""
+    paper_weights = {}
+    for layer, _, _, _ in PAPER_LAYERS:
+        if calc[f'{layer}_used'][i]:
+            paper_weights[f'{layer}_weight'] = round(float(calc[f'{layer}_weight'][i]), 2)
+
+    return {
+        'dimensions': {
+            'length': float(calc['length_with_shrinkage'][i]),
+            'breadth': float(calc['breadth_with_shrinkage'][i]),
+            'height': float(calc['height_with_shrinkage'][i]),
+            'flute_size': float(calc['flute_size'][i]),
+        },
+        'board_sizes': {
+            'full_length_in': float(calc['full_length_in'][i]),
+            'half_length_in': float(calc['half_length_in'][i]),
+            'reel_size_1up': float(calc['reel_size_1up'][i]),
+            'reel_size_2up': float(calc['reel_size_2up'][i]),
+            'reel_width': float(calc['reel_width'][i]),
+        },
+        'ups': str(calc['ups'][i]),
+        'paper_weights': paper_weights,
+        'total_area': round(float(calc['total_area'][i]), 4),
+        'total_material_weight': round(float(calc['total_material_weight'][i]), 2),
+        'cost_estimates': {
+            'material_cost': round(float(calc['material_cost'][i]), 2),
+            'labor_cost': round(float(calc['labor_cost'][i]), 2),
+            'total_cost': round(float(calc['total_cost'][i]), 2),
+        },
+    }
+
+
+def constants():
+    return {
+        'length_shrinkage_factor': LENGTH_SHRINKAGE,
+        'breadth_shrinkage_factor': BREADTH_SHRINKAGE,
+        'height_shrinkage_factor': HEIGHT_SHRINKAGE,
+        'flute_tuf': FLUTE_TUF,
+        'paper_cost_per_kg': PAPER_COST_PER_KG,
+        'labor_cost_percentage': LABOR_COST_PERCENTAGE,
+    }
+
+
+def formulas(calc, i):
+    """Step-by-step formula strings for box ``i``, shown on the order form"""
+    length, breadth, height = (float(calc[k][i]) for k in ('length', 'breadth', 'height'))
+    flute_size = float(calc['flute_size'][i])
+    length_m, breadth_m, height_m = (float(calc[k][i]) for k in ('length_m', 'breadth_m', 'height_m'))
+    total_area = float(calc['total_area'][i])
+    total_material_weight = float(calc['total_material_weight'][i])
+    material_cost = float(calc['material_cost'][i])
+    labor_cost = float(calc['labor_cost'][i])
+    return {
+        'dimensions': {
+            'length': f"{length} × 1.006 = {calc['length_with_shrinkage'][i]:.2f} cm",
+            'breadth': f"{breadth} × 1.006 = {calc['breadth_with_shrinkage'][i]:.2f} cm",
+            'height': f"{height} × 1.0112 = {calc['height_with_shrinkage'][i]:.2f} cm",
+            'flute_size': f"({breadth} + 0.635) × 1.013575 ÷ 2 = {flute_size:.2f} cm",
+        },
+        'board_sizes': {
+            'full_length': f"(({length} + {breadth}) × 2 + 3.5 + 0.5) ÷ 2.54 = {calc['full_length_in'][i]:.2f} in",
+            'half_length': f"(({length} + {breadth}) + 3.5 + 0.4) ÷ 2.54 = {calc['half_length_in'][i]:.2f} in",
+            'reel_size_1up': f"(({height} + {flute_size} + {flute_size}) + 0.8) ÷ 2.54 = {calc['reel_size_1up'][i]:.2f} in",
+            'reel_size_2up': f"((({height} + {flute_size} + {flute_size}) × 2) + 0.8) ÷ 2.54 = {calc['reel_size_2up'][i]:.2f} in",
+        },
+        'surface_area': f"2 × ({length_m:.4f} × {breadth_m:.4f} + {length_m:.4f} × {height_m:.4f} + {breadth_m:.4f} × {height_m:.4f}) = {total_area:.4f} m²",
+        'paper_weights': {
+            'top_paper': f"{total_area:.4f} × {float(calc['top_paper_gsm'][i])} ÷ 1000 = {calc['top_paper_weight'][i]:.2f} kg",
+            'bottom_paper': f"{total_area:.4f} × {float(calc['bottom_paper_gsm'][i])} ÷ 1000 = {calc['bottom_paper_weight'][i]:.2f} kg",
+        },
+        'costs': {
+            'material_cost': f"{total_material_weight:.2f} × {PAPER_COST_PER_KG} = {material_cost:.2f}",
+            'labor_cost': f"{material_cost:.2f} × 0.3 = {labor_cost:.2f}",
+            'total_cost': f"{material_cost:.2f} + {labor_cost:.2f} = {material_cost + labor_cost:.2f}",
+        },
+    }
@@ -0,0 +1,169 @@
+"""
+Order costing pipeline.
+
+``cost_order`` is the one place an order's material quantities and costs are
+worked out: paper per (GSM, BF) from the calculation engine at its landed
+FIFO cost, pasting gum and ink at the stock-weighted average price of what
+is on hand, labour on top of material and the margin on top of that. All
+arithmetic is in ``Decimal``. Quotes use the result directly; orders store
+it in ``MaterialRequirement`` and ``ManufacturingCost`` through
+``save_costing``, so order pages only ever read stored figures.
+"""
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F, Sum
+
+from inventory.models import InkSummary, PastingGumSummary
+
+from .models import MaterialRequirement, ManufacturingCost
+from .requirements import (
+    ADHESIVE_KG_PER_BOX, INK_KG_PER_BOX, check_paper_availability, paper_requirements, price_paper,
+)
+from .reservations import release_order, reserve_order
+
+# Labour as a share of material cost
+LABOR_COST_RATIO = Decimal('0.3')
+# Adhesive price per kg when there is no gum in stock to price it from
+ADHESIVE_COST_PER_KG = Decimal('2')
+
+CENT = Decimal('0.01')
+
+
+def average_price_per_kg(summaries):
+    """Stock-weighted average ``avg_price_per_kg`` of ``summaries``, or None if none are in stock"""
+    totals = summaries.filter(total_weight__gt=0).aggregate(
+        value=Sum(F('avg_price_per_kg') * F('total_weight')),
+        weight=Sum('total_weight'),
+    )
+    if not totals['weight']:
+        return None
+    return Decimal(str(totals['value'])) / Decimal(str(totals['weight']))
+
+
+def cost_order(box, quantity, profit_margin, check_stock=False):
+    """Materials, costs and price of ``quantity`` boxes of ``box``.
+
+    With ``check_stock`` each paper line also carries the availability
+    fields from ``check_paper_availability``.
+    """
+    profit_margin = Decimal(str(profit_margin))
+    if check_stock:
+        paper = check_paper_availability(box, quantity)
+    else:
+        paper = paper_requirements(box, quantity)
+    price_paper(paper)
+    paper_cost = sum((entry['cost'] for entry in paper), Decimal('0'))
+
+    adhesive_kg = ADHESIVE_KG_PER_BOX * quantity
+    gum_price = average_price_per_kg(PastingGumSummary.objects.all()) or ADHESIVE_COST_PER_KG
+    gum_cost = adhesive_kg * gum_price
+
+    ink_kg = ink_cost = Decimal('0')
+    if box.print_color:
+        ink_kg = INK_KG_PER_BOX * quantity
+        ink_price = average_price_per_kg(InkSummary.objects.filter(color__iexact=box.print_color.strip()))
+        ink_cost = ink_kg * (ink_price or Decimal('0'))
+
+    material_cost = paper_cost + gum_cost + ink_cost
+    labor_cost = material_cost * LABOR_COST_RATIO
+    total_cost = material_cost + labor_cost
+    suggested_price = total_cost * (1 + profit_margin / 100)
+
+    def layer_kg(layer):
+        return sum((entry['layer_kg'].get(layer, Decimal('0')) for entry in paper), Decimal('0'))
+
+    return {
+        'paper': paper,
+        'top_paper_weight': layer_kg('top_paper'),
+        'bottom_paper_weight': layer_kg('bottom_paper'),
+        'adhesive_weight': adhesive_kg.quantize(CENT),
+        'ink_weight': ink_kg.quantize(CENT),
+        'paper_cost': paper_cost.quantize(CENT),
+        'gum_cost': gum_cost.quantize(CENT),
+        'ink_cost': ink_cost.quantize(CENT),
+        'material_cost': material_cost.quantize(CENT),
+        'labor_cost': labor_cost.quantize(CENT),
+        'total_cost': total_cost.quantize(CENT),
+        'profit_margin': profit_margin,
+        'suggested_price': suggested_price.quantize(CENT),
+        'unit_price': (suggested_price / quantity).quantize(CENT) if quantity else Decimal('0'),
+    }
+
+
+def paper_breakdown(paper):
+    """Paper lines as stored on ``MaterialRequirement.breakdown``"""
+    return [
+        {
+            'gsm': entry['gsm'],
+            'bf': entry['bf'],
+            'layers': entry['layers'],
+            'kg': entry['required_kg'],
+            'cost': entry['cost'],
+        }
+        for entry in paper
+    ]
+
+
+def stored_paper_breakdown(order, material):
+    """Paper lines stored on ``material``, the order's ``MaterialRequirement``.
+
+    Orders costed before the lines were stored have none; theirs are worked
+    out from the template, with the stored paper cost spread over them by
+    weight, so old orders keep the figures they were quoted.
+    """
+    if material.breakdown:
+        return material.breakdown
+    paper = paper_requirements(order.box_template, order.quantity)
+    total_kg = sum((entry['required_kg'] for entry in paper), Decimal('0'))
+    paper_cost = Decimal(str(material.paper_cost))
+    for entry in paper:
+        share = entry['required_kg'] / total_kg if total_kg else Decimal('0')
+        entry['cost'] = (paper_cost * share).quantize(CENT)
+    return paper_breakdown(paper)
+
+
+def costing_records(costing):
+    """``MaterialRequirement`` and ``ManufacturingCost`` field values of a ``cost_order`` result"""
+    material = {
+        'top_paper_weight': costing['top_paper_weight'],
+        'bottom_paper_weight': costing['bottom_paper_weight'],
+        'adhesive_weight': costing['adhesive_weight'],
+        'ink_weight': costing['ink_weight'],
+        'paper_cost': costing['paper_cost'],
+        'gum_cost': costing['gum_cost'],
+        'ink_cost': costing['ink_cost'],
+        'breakdown': paper_breakdown(costing['paper']),
+    }
+    cost = {
+        'material_cost': costing['material_cost'],
+        'labor_cost': costing['labor_cost'],
+        'total_cost': costing['total_cost'],
+        'profit_margin': costing['profit_margin'],
+        'suggested_price': costing['suggested_price'],
+        'unit_price': costing['unit_price'],
+    }
+    return material, cost
+
+
+def save_costing(order, costing=None):
+    """Store ``costing`` (worked out afresh if None) as the order's requirements and cost"""
+    if costing is None:
+        costing = cost_order(order.box_template, order.quantity, order.profit_margin)
+    material_values, cost_values = costing_records(costing)
+    with transaction.atomic():
+        material, _ = MaterialRequirement.objects.update_or_create(box_order=order, defaults=material_values)
+        cost, _ = ManufacturingCost.objects.update_or_create(box_order=order, defaults=cost_values)
+    return material, cost
+
+
+def recost_template_orders(box):
+    """Cost and reserve the still-placed orders of ``box`` again after the template changed"""
+    orders = box.boxorder_set.filter(status='PLACED').select_related('box_template__paper_requirements')
+    with transaction.atomic():
+        for order in orders:
+            # Hand back the old reservation first so the order is priced from its own place in the queue
+            release_order(order)
+            save_costing(order)
+            reserve_order(order)
+    return len(orders)
@@ -36,6 +36,7 @@ class BoxPaperRequirementsForm(forms.ModelForm):
             num_plies = int(kwargs['data'].get('num_plies'))
         elif kwargs.get('instance') and hasattr(kwargs['instance'], 'box'):
             num_plies = kwargs['instance'].box.num_plies
+        self.num_plies = num_plies
         
         # Add fields for 5 ply
         if num_plies >= 5:
@@ -60,7 +61,8 @@ class BoxPaperRequirementsForm(forms.ModelForm):
 
     def clean(self):
         cleaned_data = super().clean()
-        num_plies = cleaned_data.get('num_plies')
+        # num_plies belongs to the box form; use the ply count resolved in __init__
+        num_plies = self.num_plies
         
         # For 3-ply boxes, only top and bottom paper are required
         # For 5-ply boxes, also require flute_paper
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from finished_goods.costing import save_costing, stored_paper_breakdown
+from finished_goods.models import BoxOrder
+from finished_goods.reservations import CONSUMED_STATUSES
+
+
+class Command(BaseCommand):
+    help = "Work out and store the material requirements and costs of existing orders again"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help="Also go through orders in manufacturing or later (default: placed orders only). "
+                 "Their stock is consumed, so they keep their figures and only get missing paper lines filled in",
+        )
+        parser.add_argument(
+            '--include-consumed', action='store_true',
+            help="With --all, recost orders in manufacturing or later too, replacing their figures",
+        )
+
+    def handle(self, *args, **options):
+        orders = BoxOrder.objects.select_related('box_template__paper_requirements', 'material_requirement')
+        if not options['all']:
+            orders = orders.filter(status='PLACED')
+        recosted = filled = 0
+        for order in orders.iterator():
+            if order.status in CONSUMED_STATUSES and not options['include_consumed']:
+                material = getattr(order, 'material_requirement', None)
+                if material is not None and not material.breakdown:
+                    material.breakdown = stored_paper_breakdown(order, material)
+                    material.save(update_fields=['breakdown'])
+                    filled += 1
+                continue
+            save_costing(order)
+            recosted += 1
+        self.stdout.write(self.style.SUCCESS(f"Recosted {recosted} orders, filled in paper lines on {filled}"))
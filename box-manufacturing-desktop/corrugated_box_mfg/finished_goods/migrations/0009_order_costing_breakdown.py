@@ -0,0 +1,50 @@
+# Generated by Django 6.1.2 on 2026-10-17 19:44
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+def move_legacy_figures(apps, schema_editor):
+    # ink_cost used to hold the adhesive weight, and the unit price was worked out on display
+    MaterialRequirement = apps.get_model('finished_goods', 'MaterialRequirement')
+    MaterialRequirement.objects.update(adhesive_weight=models.F('ink_cost'), ink_cost=0)
+    ManufacturingCost = apps.get_model('finished_goods', 'ManufacturingCost')
+    for cost in ManufacturingCost.objects.select_related('box_order').filter(box_order__quantity__gt=0):
+        cost.unit_price = cost.suggested_price / cost.box_order.quantity
+        cost.save(update_fields=['unit_price'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finished_goods', '0008_ordernumbersequence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='manufacturingcost',
+            name='unit_price',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10),
+        ),
+        migrations.AddField(
+            model_name='materialrequirement',
+            name='adhesive_weight',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10),
+        ),
+        migrations.AddField(
+            model_name='materialrequirement',
+            name='breakdown',
+            field=models.JSONField(default=list, encoder=django.core.serializers.json.DjangoJSONEncoder),
+        ),
+        migrations.AddField(
+            model_name='materialrequirement',
+            name='computed_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='materialrequirement',
+            name='ink_weight',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10),
+        ),
+        migrations.RunPython(move_legacy_figures, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 6.1.2 on 2026-10-17 19:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finished_goods', '0009_order_costing_breakdown'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='boxdetails',
+            index=models.Index(fields=['created_at'], name='fg_box_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='boxorder',
+            index=models.Index(fields=['created_at'], name='fg_order_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='boxorder',
+            index=models.Index(fields=['status', 'created_at'], name='fg_order_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='boxorder',
+            index=models.Index(fields=['customer_name', 'created_at'], name='fg_order_customer_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.1.2 on 2026-10-17 19:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finished_goods', '0010_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='boxorder',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -1,5 +1,5 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
-from django.utils import timezone
 
 class BoxDetails(models.Model):
     FLUTE_CHOICES = [
@@ -21,6 +21,11 @@ class BoxDetails(models.Model):
     order_quantity = models.IntegerField(default=1000)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at'], name='fg_box_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.box_name} ({self.length}x{self.breadth}x{self.height})"
@@ -75,7 +80,15 @@ class BoxOrder(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PLACED')
     notes = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # The order list is newest first, optionally filtered by status or customer
+            models.Index(fields=['created_at'], name='fg_order_created_idx'),
+            models.Index(fields=['status', 'created_at'], name='fg_order_status_idx'),
+            models.Index(fields=['customer_name', 'created_at'], name='fg_order_customer_idx'),
+        ]
     
     def __str__(self):
         return f"Order #{self.order_number} - {self.customer_name}"
@@ -97,21 +110,31 @@ class BoxOrder(models.Model):
     def save(self, *args, **kwargs):
         if not self.order_number:
             # Generate order number like ORD-2023-00001
-            last_order = BoxOrder.objects.all().order_by('id').last()
-            if not last_order:
-                self.order_number = f'ORD-{timezone.now().year}-00001'
-            else:
-                order_id = int(last_order.order_number.split('-')[-1]) + 1
-                self.order_number = f'ORD-{timezone.now().year}-{order_id:05d}'
+            from .order_numbers import next_order_number
+            self.order_number = next_order_number()
         super().save(*args, **kwargs)
 
+class OrderNumberSequence(models.Model):
+    """Last order number handed out in each calendar year"""
+    year = models.PositiveIntegerField(unique=True)
+    last_value = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"ORD-{self.year}: {self.last_value}"
+
 class MaterialRequirement(models.Model):
+    """Materials of an order as worked out by ``costing.cost_order``; weights in kg"""
     box_order = models.OneToOneField(BoxOrder, on_delete=models.CASCADE, related_name='material_requirement')
     top_paper_weight = models.DecimalField(max_digits=10, decimal_places=2)
     bottom_paper_weight = models.DecimalField(max_digits=10, decimal_places=2)
+    adhesive_weight = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    ink_weight = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     ink_cost = models.DecimalField(max_digits=10, decimal_places=2)
     paper_cost = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     gum_cost = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    # Paper lines: [{'gsm', 'bf', 'layers', 'kg', 'cost'}]
+    breakdown = models.JSONField(default=list, encoder=DjangoJSONEncoder)
+    computed_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"Materials for {self.box_order}"
@@ -123,6 +146,7 @@ class ManufacturingCost(models.Model):
     total_cost = models.DecimalField(max_digits=10, decimal_places=2)
     profit_margin = models.DecimalField(max_digits=5, decimal_places=2)
     suggested_price = models.DecimalField(max_digits=10, decimal_places=2)
+    unit_price = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     
     def __str__(self):
         return f"Cost for {self.box_order}"
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""
+Order number allocation.
+
+Numbers look like ``ORD-2025-00042`` and restart at 1 every calendar year.
+Each year has one ``OrderNumberSequence`` row, and a number (or a block of
+numbers for bulk imports) is taken with a single atomic UPDATE on that row,
+so two clerks saving at the same moment can never get the same number.
+"""
+import sqlite3
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F, Max
+from django.utils import timezone
+
+from .models import BoxOrder, OrderNumberSequence
+
+ORDER_PREFIX = 'ORD'
+
+
+def format_order_number(year, value):
+    return f'{ORDER_PREFIX}-{year}-{value:05d}'
+
+
+def _supports_returning():
+    if connection.vendor == 'postgresql':
+        return True
+    return connection.vendor == 'sqlite' and sqlite3.sqlite_version_info >= (3, 35)
+
+
+def _increment(year, count):
+    """Bump the year's counter by ``count``; return the new last value or None"""
+    if _supports_returning():
+        table = connection.ops.quote_name(OrderNumberSequence._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {table} SET last_value = last_value + %s WHERE year = %s RETURNING last_value",
+                [count, year],
+            )
+            row = cursor.fetchone()
+        return row[0] if row else None
+    # The UPDATE takes the row (or SQLite database) write lock, so the read
+    # below in the same transaction cannot see another writer's increment.
+    if not OrderNumberSequence.objects.filter(year=year).update(last_value=F('last_value') + count):
+        return None
+    return OrderNumberSequence.objects.get(year=year).last_value
+
+
+def _existing_last_value(year):
+    """Highest number already used in ``year``, for seeding a new sequence row"""
+    prefix = f'{ORDER_PREFIX}-{year}-'
+    last = BoxOrder.objects.filter(order_number__startswith=prefix).aggregate(
+        last=Max('order_number')
+    )['last']
+    if not last:
+        return 0
+    try:
+        return int(last.rsplit('-', 1)[-1])
+    except ValueError:
+        return 0
+
+
+def reserve_order_numbers(count=1, year=None):
+    """Atomically reserve ``count`` consecutive order numbers.
+
+    Returns the numbers as formatted strings. Reserved numbers are never
+    handed out again, even if the caller ends up not using them.
+    """
+    if count < 1:
+        raise ValueError("count must be at least 1")
+    year = year or timezone.now().year
+    with transaction.atomic():
+        last_value = _increment(year, count)
+        if last_value is None:
+            try:
+                with transaction.atomic():
+                    OrderNumberSequence.objects.create(
+                        year=year, last_value=_existing_last_value(year) + count
+                    )
+            except IntegrityError:
+                # Another request created this year's row first
+                pass
+            else:
+                last_value = OrderNumberSequence.objects.get(year=year).last_value
+            if last_value is None:
+                last_value = _increment(year, count)
+    first_value = last_value - count + 1
+    return [format_order_number(year, value) for value in range(first_value, last_value + 1)]
+
+
+def next_order_number():
+    return reserve_order_numbers(1)[0]
@@ -0,0 +1,155 @@
+"""
+Paper requirements of an order and how they compare with stock.
+
+The weight of every paper layer comes from the calculation engine, so the
+kilograms here match what the box form shows. Layers are grouped by the
+(GSM, BF) set on the box's ``BoxPaperRequirements`` and checked against the
+cached per-(GSM, BF) stock in ``inventory.availability``.
+"""
+import math
+from decimal import Decimal
+
+from inventory.availability import get_paper_availability, paper_key
+from inventory.cost_layers import fifo_cost
+from inventory.models import PaperReelSummary
+
+from .calculations import PAPER_COST_PER_KG, PAPER_LAYERS, calculate_boxes
+
+# Stock is reported 'low' when the order would use more than this share of it
+LOW_STOCK_RATIO = Decimal('0.8')
+
+ADHESIVE_KG_PER_BOX = Decimal('0.05')
+# Rough ink usage for a printed box until print coverage is modelled
+INK_KG_PER_BOX = Decimal('0.005')
+
+
+def box_spec(box, paper):
+    """Calculation engine spec for a box template and its paper requirements"""
+    spec = {
+        'length': float(box.length),
+        'breadth': float(box.breadth),
+        'height': float(box.height),
+        'flute_type': box.flute_type,
+        'num_plies': box.num_plies,
+    }
+    for layer, _, _, _ in PAPER_LAYERS:
+        gsm = getattr(paper, f'{layer}_gsm', None)
+        spec[f'{layer}_gsm'] = float(gsm) if gsm else 0
+    return spec
+
+
+def paper_requirements(box, quantity):
+    """Paper needed for ``quantity`` boxes, one entry per (GSM, BF).
+
+    Returns a list of ``{'gsm', 'bf', 'layers', 'layer_kg', 'required_kg'}``
+    dicts, or an empty list if the template has no paper requirements.
+    """
+    try:
+        paper = box.paper_requirements
+    except box.__class__.paper_requirements.RelatedObjectDoesNotExist:
+        return []
+
+    calc = calculate_boxes([box_spec(box, paper)])
+    grouped = {}
+    for layer, _, _, _ in PAPER_LAYERS:
+        gsm = getattr(paper, f'{layer}_gsm')
+        bf = getattr(paper, f'{layer}_bf')
+        if not calc[f'{layer}_used'][0] or not gsm or bf is None:
+            continue
+        key = paper_key(gsm, bf)
+        entry = grouped.setdefault(key, {
+            'gsm': key[0], 'bf': key[1], 'layers': [], 'layer_kg': {}, 'required_kg': Decimal('0'),
+        })
+        kg = Decimal(str(float(calc[f'{layer}_weight'][0]))) * quantity
+        entry['layers'].append(layer)
+        entry['layer_kg'][layer] = kg.quantize(Decimal('0.01'))
+        entry['required_kg'] += kg
+    for entry in grouped.values():
+        entry['required_kg'] = entry['required_kg'].quantize(Decimal('0.01'))
+    return list(grouped.values())
+
+
+def stock_status(required, available):
+    if available < required:
+        return 'insufficient'
+    if required > available * LOW_STOCK_RATIO:
+        return 'low'
+    return 'adequate'
+
+
+def check_paper_availability(box, quantity):
+    """``paper_requirements`` with ``available_kg``, ``shortfall_kg`` and ``status`` added"""
+    requirements = paper_requirements(box, quantity)
+    availability = get_paper_availability((entry['gsm'], entry['bf']) for entry in requirements)
+    for entry in requirements:
+        available = availability[(entry['gsm'], entry['bf'])]
+        entry['available_kg'] = available
+        entry['shortfall_kg'] = max(entry['required_kg'] - available, Decimal('0'))
+        entry['status'] = stock_status(entry['required_kg'], available)
+    return requirements
+
+
+def allocate_stock(rows, required, unit_weight=None):
+    """Split ``required`` kg over ``rows``, most available first.
+
+    Returns ``[(row, quantity)]`` in the row's stock unit; with
+    ``unit_weight`` set quantities are whole bags/cans of that many kg.
+    Whatever the rows cannot cover goes on the best stocked row, so an
+    oversold item shows a negative ``available`` instead of being dropped.
+    """
+    rows = sorted(rows, key=lambda row: row.available, reverse=True)
+    if not rows or required <= 0:
+        return []
+
+    def units(row, kg):
+        if unit_weight is None:
+            return kg
+        return Decimal(math.ceil(kg / getattr(row, unit_weight)))
+
+    def weight(row, quantity):
+        return quantity if unit_weight is None else quantity * getattr(row, unit_weight)
+
+    allocations = {}
+    remaining = required
+    for row in rows:
+        if remaining <= 0 or row.available <= 0:
+            break
+        quantity = min(units(row, remaining), Decimal(math.floor(row.available)) if unit_weight else row.available)
+        if quantity > 0:
+            allocations[row] = quantity
+            remaining -= weight(row, quantity)
+    if remaining > 0:
+        allocations[rows[0]] = allocations.get(rows[0], Decimal('0')) + units(rows[0], remaining)
+    return list(allocations.items())
+
+
+def paper_stock(requirements):
+    """Attach the matching ``PaperReelSummary`` rows to each requirement as ``rows``"""
+    summaries = PaperReelSummary.objects.filter(gsm__in={entry['gsm'] for entry in requirements})
+    for entry in requirements:
+        entry['rows'] = [
+            summary for summary in summaries
+            if paper_key(summary.gsm, summary.bf) == (entry['gsm'], entry['bf'])
+        ]
+    return requirements
+
+
+def price_paper(requirements):
+    """Add ``cost``, the landed FIFO cost of the paper, to each requirement.
+
+    Each requirement is priced from the stock it would be drawn from, next
+    in line after what is already reserved. Paper with no purchase history
+    falls back to the calculation engine's standard price per kg.
+    """
+    for entry in paper_stock(requirements):
+        cost = Decimal('0')
+        remaining = entry['required_kg']
+        for summary, kg in allocate_stock(entry['rows'], entry['required_kg']):
+            layered = fifo_cost(summary, kg)
+            if layered is not None:
+                cost += layered
+                remaining -= kg
+        if remaining > 0:
+            cost += remaining * Decimal(PAPER_COST_PER_KG)
+        entry['cost'] = cost.quantize(Decimal('0.01'))
+    return requirements
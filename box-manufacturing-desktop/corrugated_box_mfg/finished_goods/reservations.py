@@ -0,0 +1,118 @@
+"""
+Stock reserved for orders.
+
+A new order reserves the paper, pasting gum and ink it needs, spread over
+the matching summary rows with the most stock available. When the order goes
+into manufacturing its reservations are consumed, i.e. taken off stock, and
+moving it back to ``PLACED`` puts them back; both are recorded in the
+``StockMovement`` ledger. Deleting an order releases what it still has
+reserved. Every step is one ``UPDATE`` per summary row via
+``adjust_stock``, which also keeps the row's ``available`` figure current.
+"""
+from django.db import transaction
+
+from inventory.availability import normalize_bf
+from inventory.issues import issue_unit_cost
+from inventory.models import PaperReelSummary, PastingGumSummary, InkSummary, StockMovement, StockReservation
+from inventory.summaries import SUMMARY_MODEL_SPECS, adjust_stock
+
+from .requirements import (
+    ADHESIVE_KG_PER_BOX, INK_KG_PER_BOX, allocate_stock, paper_requirements, paper_stock,
+)
+
+RESERVATION_SUMMARY_MODELS = {model.__name__: model for model in (PaperReelSummary, PastingGumSummary, InkSummary)}
+
+# Statuses in which an order's material has been issued to the floor
+CONSUMED_STATUSES = {'MANUFACTURING', 'PRODUCTION_COMPLETE', 'SHIPPED', 'DELIVERED', 'COMPLETED'}
+
+
+def order_allocations(order):
+    """Stock an order needs, as ``[(summary row, quantity)]``"""
+    box = order.box_template
+    allocations = []
+
+    for entry in paper_stock(paper_requirements(box, order.quantity)):
+        allocations += allocate_stock(entry['rows'], entry['required_kg'])
+
+    adhesive_kg = ADHESIVE_KG_PER_BOX * order.quantity
+    allocations += allocate_stock(PastingGumSummary.objects.filter(weight_per_bag__gt=0), adhesive_kg, 'weight_per_bag')
+
+    if box.print_color:
+        ink_kg = INK_KG_PER_BOX * order.quantity
+        inks = InkSummary.objects.filter(color__iexact=box.print_color.strip(), weight_per_can__gt=0)
+        allocations += allocate_stock(inks, ink_kg, 'weight_per_can')
+    return allocations
+
+
+def _item_label(summary):
+    if isinstance(summary, PaperReelSummary):
+        return f"Paper {summary.gsm} GSM / {normalize_bf(summary.bf)} BF / {summary.size}"
+    if isinstance(summary, PastingGumSummary):
+        return f"Gum {summary.gum_type} ({summary.weight_per_bag} kg bags)"
+    return f"Ink {summary.color} ({summary.weight_per_can} kg cans)"
+
+
+def reserve_order(order):
+    """Reserve the stock a newly placed order needs. Returns the reservations made."""
+    with transaction.atomic():
+        reservations = []
+        for summary, quantity in order_allocations(order):
+            adjust_stock(summary, reserved=quantity)
+            reservations.append(StockReservation(
+                order=order,
+                summary_type=type(summary).__name__,
+                summary_id=summary.pk,
+                item=_item_label(summary),
+                quantity=quantity,
+            ))
+        StockReservation.objects.bulk_create(reservations)
+    return reservations
+
+
+def _move(order, from_status, to_status, reserved_sign, consumed_sign):
+    reservations = list(order.reservations.filter(status=from_status))
+    if not reservations:
+        return 0
+    summaries = {}
+    for summary_type, model in RESERVATION_SUMMARY_MODELS.items():
+        ids = [r.summary_id for r in reservations if r.summary_type == summary_type]
+        if ids:
+            summaries.update({(summary_type, s.pk): s for s in model.objects.filter(pk__in=ids)})
+    movements = []
+    for reservation in reservations:
+        summary = summaries.get((reservation.summary_type, reservation.summary_id))
+        if summary is None:
+            continue
+        if consumed_sign:
+            spec = SUMMARY_MODEL_SPECS[type(summary)]
+            movements.append(StockMovement(
+                kind=spec.kind,
+                item_key=spec.format_key(tuple(spec.summary_lookup(summary).values())),
+                company_name='',
+                quantity=reservation.quantity,
+                unit_cost=issue_unit_cost(spec, summary, reservation.quantity),
+                direction='OUT' if consumed_sign > 0 else 'IN',
+                source='CONSUMPTION',
+                item_id=reservation.pk,
+            ))
+        adjust_stock(
+            summary,
+            reserved=reserved_sign * reservation.quantity,
+            consumed=consumed_sign * reservation.quantity,
+        )
+    StockMovement.objects.bulk_create(movements)
+    return order.reservations.filter(pk__in=[r.pk for r in reservations]).update(status=to_status)
+
+
+def sync_order_reservations(order):
+    """Consume or restore an order's reservations to match its status"""
+    with transaction.atomic():
+        if order.status in CONSUMED_STATUSES:
+            return _move(order, 'RESERVED', 'CONSUMED', reserved_sign=-1, consumed_sign=1)
+        return _move(order, 'CONSUMED', 'RESERVED', reserved_sign=1, consumed_sign=-1)
+
+
+def release_order(order):
+    """Hand back whatever an order still has reserved"""
+    with transaction.atomic():
+        return _move(order, 'RESERVED', 'RELEASED', reserved_sign=-1, consumed_sign=0)
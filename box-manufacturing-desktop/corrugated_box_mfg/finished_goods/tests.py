@@ -1,3 +1,327 @@
+import json
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from data_cleanup.jobs import run_cleanup
+from inventory.issues import issue_stock
+from inventory.models import (
+    InkSummary, PaperReelSummary, PastingGumSummary, StockIssue, StockMovement, StockReservation,
+)
+from inventory.summaries import rebuild_summaries
+
+from .models import BoxDetails, BoxOrder, BoxPaperRequirements, ManufacturingCost, MaterialRequirement
+
+
+def make_box(name='Carton'):
+    return BoxDetails.objects.create(
+        box_name=name, length=30, breadth=20, height=15, flute_type='B', num_plies=3,
+    )
+
+
+def make_order(box, customer='Acme', status='PLACED'):
+    order = BoxOrder.objects.create(customer_name=customer, box_template=box, quantity=1000, status=status)
+    MaterialRequirement.objects.create(
+        box_order=order, top_paper_weight=10, bottom_paper_weight=10, ink_cost=0,
+    )
+    ManufacturingCost.objects.create(
+        box_order=order, material_cost=100, labor_cost=30, total_cost=130,
+        profit_margin=15, suggested_price=Decimal('149.50'),
+    )
+    return order
+
+
+class ListViewQueryCountTests(TestCase):
+    """List pages must cost the same number of queries however many rows they show"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('tester', password='pw')
+        self.client.force_login(self.user)
+
+    def assertConstantQueries(self, url, add_rows):
+        add_rows(2)
+        with CaptureQueriesContext(connection) as few:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        add_rows(20)
+        with self.assertNumQueries(len(few)):
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_order_list_query_count_is_constant(self):
+        def add_orders(count):
+            for i in range(count):
+                make_order(make_box(f"Box {i}"), customer=f"Customer {i % 3}")
+        self.assertConstantQueries(reverse('finished_goods:order-list'), add_orders)
+
+    def test_box_list_query_count_is_constant(self):
+        def add_boxes(count):
+            for i in range(count):
+                make_box(f"Box {i}")
+        self.assertConstantQueries(reverse('finished_goods:box-list'), add_boxes)
+
+
+class OrderListFilterTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('tester', password='pw'))
+        box = make_box()
+        self.placed = make_order(box, customer='Acme')
+        self.shipped = make_order(box, customer='Globex', status='SHIPPED')
+        BoxOrder.objects.filter(pk=self.shipped.pk).update(created_at=timezone.now() - timedelta(days=10))
+
+    def listed(self, **params):
+        response = self.client.get(reverse('finished_goods:order-list'), params)
+        return {order.pk for order in response.context['orders']}
+
+    def test_filters(self):
+        self.assertEqual(self.listed(status='SHIPPED'), {self.shipped.pk})
+        self.assertEqual(self.listed(customer='Acme'), {self.placed.pk})
+        since = (timezone.now() - timedelta(days=1)).date().isoformat()
+        self.assertEqual(self.listed(date_from=since), {self.placed.pk})
+        self.assertEqual(self.listed(date_to=since), {self.shipped.pk})
+        # Unknown values are ignored rather than failing the page
+        self.assertEqual(self.listed(status='BOGUS', date_from='2024-02-30'), {self.placed.pk, self.shipped.pk})
+
+    def test_pagination(self):
+        box = make_box('Other')
+        for _ in range(30):
+            make_order(box)
+        response = self.client.get(reverse('finished_goods:order-list'), {'page': 2, 'customer': 'Acme'})
+        self.assertTrue(response.context['is_paginated'])
+        self.assertEqual(len(response.context['orders']), 31 - 25)
+        self.assertEqual(response.context['filter_query'], 'customer=Acme')
+
+
+class ReservationLedgerTests(TestCase):
+    """Summaries kept up incrementally must match a rebuild from the ledgers at every step"""
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('tester', password='pw'))
+        common = {
+            'company_name': 'Mill', 'price_per_kg': '40', 'freight': '0', 'extra_charges': '0', 'tax_percent': '0',
+        }
+        for size in ('40', '44'):
+            self.client.post(reverse('add_inventory'), dict(
+                common, item_type='Paper Reel', gsm='120', bf='18', size=size, total_weight='150',
+            ))
+        self.client.post(reverse('add_inventory'), dict(
+            common, item_type='Pasting Gum', gum_type='Starch', weight_per_bag='25', total_qty='15',
+        ))
+        self.client.post(reverse('add_inventory'), dict(
+            common, item_type='Ink', color='Red', weight_per_can='5', total_qty='2',
+        ))
+        self.box = BoxDetails.objects.create(
+            box_name='Printed', length=30, breadth=20, height=15, flute_type='B', num_plies=3, print_color='Red',
+        )
+        BoxPaperRequirements.objects.create(
+            box=self.box, top_paper_gsm=120, top_paper_bf=18, bottom_paper_gsm=120, bottom_paper_bf=18,
+            flute_paper_gsm=120, flute_paper_bf=18,
+        )
+
+    def snapshot(self):
+        fields = ['total_weight', 'reserved', 'available']
+        return {
+            'paper': list(PaperReelSummary.objects.order_by('pk').values_list(*fields)),
+            'gum': list(PastingGumSummary.objects.order_by('pk').values_list('total_bags', *fields)),
+            'ink': list(InkSummary.objects.order_by('pk').values_list('total_cans', *fields)),
+        }
+
+    def assertMatchesRebuild(self):
+        live = self.snapshot()
+        rebuild_summaries()
+        self.assertEqual(live, self.snapshot())
+
+    def place_order(self, status='PLACED'):
+        response = self.client.post(reverse('finished_goods:order-create'), {
+            'customer_name': 'Acme', 'box_template': self.box.pk, 'quantity': 200,
+            'profit_margin': '15', 'status': status,
+        })
+        self.assertEqual(response.status_code, 302)
+        return BoxOrder.objects.latest('pk')
+
+    def test_create_manufacture_delete(self):
+        self.place_order()
+        order = BoxOrder.objects.get()
+        self.assertTrue(order.reservations.exists())
+        self.assertMatchesRebuild()
+
+        self.client.post(reverse('finished_goods:update-status', args=[order.pk]), {'status': 'MANUFACTURING'})
+        self.assertFalse(order.reservations.exclude(status='CONSUMED').exists())
+        # Every consumed reservation leaves the ledger as stock going out
+        consumption = StockMovement.objects.filter(source='CONSUMPTION')
+        self.assertEqual(
+            sorted(consumption.values_list('item_id', 'direction', 'quantity')),
+            sorted((r.pk, 'OUT', r.quantity) for r in order.reservations.all()),
+        )
+        consumed = self.snapshot()
+        self.assertMatchesRebuild()
+
+        # Back to placed puts the stock back in, and then out again
+        self.client.post(reverse('finished_goods:update-status', args=[order.pk]), {'status': 'PLACED'})
+        self.assertEqual(consumption.filter(direction='IN').count(), order.reservations.count())
+        self.assertMatchesRebuild()
+        self.client.post(reverse('finished_goods:update-status', args=[order.pk]), {'status': 'MANUFACTURING'})
+
+        order.delete()
+        # The consumed rows outlive the order, and so does the stock they took
+        self.assertFalse(StockReservation.objects.exclude(status='CONSUMED', order=None).exists())
+        self.assertEqual(self.snapshot(), consumed)
+        self.assertMatchesRebuild()
+
+    def test_clearing_orders_keeps_consumed_stock(self):
+        self.place_order('MANUFACTURING')
+        self.place_order()
+        before = self.snapshot()
+        run_cleanup('orders')
+        self.assertFalse(BoxOrder.objects.exists())
+        self.assertFalse(StockReservation.objects.exclude(status='CONSUMED', order=None).exists())
+        after = self.snapshot()
+        # Only the placed order's reservations are handed back
+        self.assertEqual([row[:-2] for row in after['paper']], [row[:-2] for row in before['paper']])
+        self.assertTrue(all(row[-2] == 0 for rows in after.values() for row in rows))
+        self.assertMatchesRebuild()
+
+    def test_clearing_orders_changes_the_summary_etag(self):
+        self.place_order()
+        url = '/api/summaries/paper-reels/'
+        etag = self.client.get(url)['ETag']
+        run_cleanup('orders')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_clearing_orders_keeps_stock_issues(self):
+        order = self.place_order()
+        line = {'item_type': 'Pasting Gum', 'gum_type': 'Starch', 'weight_per_bag': '25', 'quantity': '1'}
+        issue_stock([line], order)
+        run_cleanup('orders')
+        self.assertEqual(StockIssue.objects.get().order, None)
+        self.assertMatchesRebuild()
+
+    def test_failed_create_leaves_nothing_behind(self):
+        with mock.patch('finished_goods.views.reserve_order', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.place_order()
+        self.assertFalse(BoxOrder.objects.exists())
+        self.assertFalse(MaterialRequirement.objects.exists())
+
+    def test_delete_placed_order_releases_stock(self):
+        order = self.place_order()
+        before = self.snapshot()
+        order.delete()
+        after = self.snapshot()
+        self.assertTrue(all(row[-2] == 0 for rows in after.values() for row in rows))
+        self.assertNotEqual(before, after)
+        self.assertMatchesRebuild()
+
+
+class LegacyOrderTests(TestCase):
+    """Orders costed before paper lines were stored on MaterialRequirement"""
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('tester', password='pw'))
+        box = make_box()
+        BoxPaperRequirements.objects.create(
+            box=box, top_paper_gsm=120, top_paper_bf=18, bottom_paper_gsm=150, bottom_paper_bf=20,
+            flute_paper_gsm=120, flute_paper_bf=18,
+        )
+        self.placed = make_order(box)
+        self.shipped = make_order(box, status='SHIPPED')
+        MaterialRequirement.objects.update(paper_cost=Decimal('90'))
+
+    def test_detail_page_shows_paper_lines(self):
+        response = self.client.get(reverse('finished_goods:order-detail', args=[self.shipped.pk]))
+        paper = {name: line for name, line in response.context['material_requirements'].items()
+                 if name.startswith('Paper')}
+        self.assertEqual(len(paper), 2)
+        self.assertEqual(sum(line['cost'] for line in paper.values()), Decimal('90'))
+
+    def test_recost_all_keeps_consumed_figures(self):
+        call_command('recost_orders', '--all', stdout=StringIO())
+        material = MaterialRequirement.objects.get(box_order=self.shipped)
+        self.assertEqual(len(material.breakdown), 2)
+        self.assertEqual(material.paper_cost, Decimal('90'))
+        self.assertEqual(ManufacturingCost.objects.get(box_order=self.shipped).suggested_price, Decimal('149.50'))
+        # Placed orders are recosted from stock as before
+        self.assertNotEqual(ManufacturingCost.objects.get(box_order=self.placed).suggested_price, Decimal('149.50'))
+
+        call_command('recost_orders', '--all', '--include-consumed', stdout=StringIO())
+        self.assertNotEqual(ManufacturingCost.objects.get(box_order=self.shipped).suggested_price, Decimal('149.50'))
+
+
+class BatchCalculationTests(TestCase):
+    box = {'length': 30, 'breadth': 20, 'height': 15, 'flute_type': 'B', 'num_plies': 3, 'top_paper_gsm': 120}
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('tester', password='pw'))
+
+    def post(self, *boxes):
+        return self.client.post(
+            reverse('finished_goods:box-calculations-batch'), json.dumps({'boxes': list(boxes)}),
+            content_type='application/json',
+        )
+
+    def test_valid_batch(self):
+        response = self.post(self.box, dict(self.box, quantity=100))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 2)
+
+    def test_rejects_impossible_boxes(self):
+        for bad in (
+            {'length': float('nan')}, {'breadth': 0}, {'height': -5}, {'length': float('inf')},
+            {'top_paper_gsm': -120}, {'quantity': -1}, {'quantity': float('inf')},
+        ):
+            with self.subTest(**bad):
+                response = self.post(self.box, dict(self.box, **bad))
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('box 1', response.json()['error'])
+
+
+class OrderApiTests(TestCase):
+    url = '/api/orders/'
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('tester', password='pw'))
+        box = make_box()
+        self.placed = make_order(box)
+        self.shipped = make_order(box, status='SHIPPED')
+
+    def test_filters(self):
+        rows = self.client.get(self.url, {'status': 'SHIPPED', 'fields': 'id,status'}).json()['results']
+        self.assertEqual(rows, [{'id': self.shipped.pk, 'status': 'SHIPPED'}])
+        self.assertEqual(self.client.get(self.url, {'box_template': 'x'}).status_code, 400)
+
+    def test_recosting_changes_the_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        # Recosting rewrites the stored costing but leaves the order row alone
+        MaterialRequirement.objects.filter(box_order=self.placed).update(
+            computed_at=timezone.now() + timedelta(minutes=1),
+        )
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class OrderRequirementsTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('tester', password='pw'))
+        self.box = make_box()
+
+    def get(self, **params):
+        return self.client.get(reverse('finished_goods:calculate-requirements'), dict(
+            {'template_id': self.box.pk, 'quantity': 100}, **params,
+        ))
 
-# Create your tests here.
+    def test_margin(self):
+        self.assertEqual(self.get().status_code, 200)
+        self.assertEqual(self.get(margin='').status_code, 200)
+        for margin in ('abc', 'NaN', 'Infinity', '-5'):
+            with self.subTest(margin=margin):
+                response = self.get(margin=margin)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {'error': 'Missing or invalid parameters'})
+        self.assertEqual(self.get(quantity='many').status_code, 400)
@@ -1,16 +1,29 @@
 import json
+import math
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views.generic import CreateView, UpdateView, DetailView, ListView
 from django.urls import reverse_lazy
 from django.http import JsonResponse
+from django.db import transaction
 from django.db.models import Q
 from django.views.decorators.http import require_POST
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from decimal import Decimal
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from datetime import datetime, time, timedelta
+from decimal import Decimal, InvalidOperation
 
-from .models import BoxDetails, BoxPaperRequirements, BoxOrder, MaterialRequirement, ManufacturingCost
+from .models import BoxDetails, BoxPaperRequirements, BoxOrder
 from .forms import BoxDetailsForm, BoxPaperRequirementsForm, BoxOrderForm
+from .costing import cost_order, recost_template_orders, save_costing, stored_paper_breakdown
+from .reservations import reserve_order, sync_order_reservations
+from .calculations import (
+    MAX_BATCH_SIZE, PAPER_LAYERS, box_result, calculate_boxes,
+    constants as calculation_constants, formulas as calculation_formulas,
+)
+
+LIST_PAGE_SIZE = 25
 
 @login_required
 def get_field_suggestions(request):
@@ -69,7 +82,8 @@ class BoxListView(LoginRequiredMixin, ListView):
     model = BoxDetails
     template_name = 'finished_goods/box_list.html'
     context_object_name = 'boxes'
-    ordering = ['-created_at']
+    ordering = ['-created_at', '-id']
+    paginate_by = LIST_PAGE_SIZE
     login_url = '/accounts/login/'
 
 class BoxDetailView(LoginRequiredMixin, DetailView):
@@ -85,176 +99,112 @@ class BoxUpdateView(LoginRequiredMixin, UpdateView):
     success_url = reverse_lazy('finished_goods:box-list')
     login_url = '/accounts/login/'
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        paper = BoxPaperRequirements.objects.filter(box=self.object).first()
+        if self.request.POST:
+            context['paper_form'] = BoxPaperRequirementsForm(data=self.request.POST, instance=paper)
+        else:
+            context['paper_form'] = BoxPaperRequirementsForm(instance=paper)
+        return context
+
     def form_valid(self, form):
-        response = super().form_valid(form)
-        # Update associated BoxPaperRequirements
-        BoxPaperRequirements.objects.update_or_create(
-            box=self.object,
-            defaults={
-                'top_paper_gsm': form.cleaned_data.get('top_paper_gsm', 0),
-                'bottom_paper_gsm': form.cleaned_data.get('bottom_paper_gsm', 0)
-            }
-        )
+        paper_form = self.get_context_data()['paper_form']
+        if not paper_form.is_valid():
+            return self.render_to_response(self.get_context_data(form=form))
+        with transaction.atomic():
+            response = super().form_valid(form)
+            # Update associated BoxPaperRequirements
+            paper_requirements = paper_form.save(commit=False)
+            paper_requirements.box = self.object
+            paper_requirements.save()
+            # Orders not yet in manufacturing follow the new template
+            recost_template_orders(self.object)
         return response
 
+def parse_box_spec(data):
+    """Read one box spec (dimensions, flute, plies, GSMs) from a dict-like"""
+    spec = {
+        'length': float(data.get('length', 0)),
+        'breadth': float(data.get('breadth', 0)),
+        'height': float(data.get('height', 0)),
+        'flute_type': data.get('flute_type', 'B'),
+        'num_plies': int(data.get('num_plies', 3)),
+    }
+    for layer, _, _, _ in PAPER_LAYERS:
+        spec[f'{layer}_gsm'] = float(data.get(f'{layer}_gsm') or 0)
+    return spec
+
+def check_box_spec(spec):
+    """Raise ``ValueError`` unless a parsed spec describes a real box"""
+    for field in ('length', 'breadth', 'height'):
+        if not math.isfinite(spec[field]) or spec[field] <= 0:
+            raise ValueError(f"{field} must be a number greater than 0")
+    for layer, _, _, _ in PAPER_LAYERS:
+        gsm = spec[f'{layer}_gsm']
+        if not math.isfinite(gsm) or gsm < 0:
+            raise ValueError(f"{layer}_gsm must be a number of at least 0")
+
 @login_required
 def get_box_calculations(request):
-    # Get basic box dimensions
-    length = float(request.GET.get('length', 0))
-    breadth = float(request.GET.get('breadth', 0))
-    height = float(request.GET.get('height', 0))
-    flute_type = request.GET.get('flute_type', 'B')
-    num_plies = int(request.GET.get('num_plies', 3))
-    
-    # Get paper specifications with 0 as default
-    top_paper_gsm = float(request.GET.get('top_paper_gsm', 0))
-    bottom_paper_gsm = float(request.GET.get('bottom_paper_gsm', 0))
-    
-    # Calculate dimensions with shrinkage (as per requirements)
-    length_with_shrinkage = length * 1.006
-    breadth_with_shrinkage = breadth * 1.006
-    height_with_shrinkage = height * 1.0112
-    
-    # Calculate flute size
-    flute_size = (breadth + 0.635) * 1.013575 / 2
-    
-    # Board size calculations in inches
-    full_length_in = ((length + breadth) * 2 + 3.5 + 0.5) / 2.54
-    half_length_in = ((length + breadth) + 3.5 + 0.4) / 2.54
-    reel_size_1up = ((height + flute_size + flute_size) + 0.8) / 2.54
-    reel_size_2up = (((height + flute_size + flute_size) * 2) + 0.8) / 2.54
-    reel_size = (breadth + height) / 2.54
-    
-    # Determine UPS (number of boards to cut from a sheet)
-    ups = "Unknown"
-    reel_width = (breadth + height) / 2.54
-    
-    if reel_width < 20:
-        ups = "2 board length"
-    elif reel_width >= 20 and reel_width < 40:
-        ups = "1 board length"
-    elif reel_width < 60:
-        ups = "full length"
-    elif full_length_in > 60:
-        ups = "half length"
-    
-    # FIX: Calculate paper weights based on dimensions and GSM - corrected calculation
-    tuf = 1.35  # Take-Up Factor for flute papers
-    
-    # Calculate surface area in square meters
-    # For a box, we need to account for all sides (length, breadth, height)
-    # Convert centimeters to meters by dividing by 100
-    length_m = length / 100
-    breadth_m = breadth / 100
-    height_m = height / 100
-    
-    # Calculate area for each side and total
-    top_bottom_area = 2 * (length_m * breadth_m)  # Top and bottom
-    side_area_1 = 2 * (length_m * height_m)       # Two sides
-    side_area_2 = 2 * (breadth_m * height_m)      # Two sides
-    total_area = top_bottom_area + side_area_1 + side_area_2
-    
-    # Paper weight calculation (GSM = grams per square meter)
-    # Weight in kg = (area in m² × GSM) / 1000
-    top_paper_weight = (total_area * top_paper_gsm) / 1000
-    bottom_paper_weight = (total_area * bottom_paper_gsm) / 1000
-    
-    # Initialize additional weights
-    additional_weights = {}
-    
-    # Calculate additional paper weights based on ply count
-    if num_plies >= 5:
-        flute_paper_gsm = float(request.GET.get('flute_paper_gsm', 0))
-        # Flute paper uses more material due to corrugation (hence TUF)
-        additional_weights['flute_paper_weight'] = (total_area * flute_paper_gsm * tuf) / 1000
-    
-    if num_plies == 7:
-        flute_paper1_gsm = float(request.GET.get('flute_paper1_gsm', 0))
-        middle_paper_gsm = float(request.GET.get('middle_paper_gsm', 0))
-        flute_paper2_gsm = float(request.GET.get('flute_paper2_gsm', 0))
-        
-        additional_weights['flute_paper1_weight'] = (total_area * flute_paper1_gsm * tuf) / 1000
-        additional_weights['middle_paper_weight'] = (total_area * middle_paper_gsm) / 1000
-        additional_weights['flute_paper2_weight'] = (total_area * flute_paper2_gsm * tuf) / 1000
-    
-    # Calculate total material weight
-    total_material_weight = top_paper_weight + bottom_paper_weight + sum(additional_weights.values())
-    
-    # Cost calculations
-    # Assume paper costs ₹80 per kg (adjust as needed)
-    paper_cost_per_kg = 80
-    material_cost = total_material_weight * paper_cost_per_kg
-    labor_cost = material_cost * 0.3  # 30% of material cost
-    total_cost = material_cost + labor_cost
-    
-    # Add more detailed data for the step-by-step calculation
+    calc = calculate_boxes([parse_box_spec(request.GET)])
     response_data = {
-        'dimensions': {
-            'length': length_with_shrinkage,
-            'breadth': breadth_with_shrinkage,
-            'height': height_with_shrinkage,
-            'flute_size': flute_size,
-        },
-        'board_sizes': {
-            'full_length_in': full_length_in,
-            'half_length_in': half_length_in,
-            'reel_size_1up': reel_size_1up,
-            'reel_size_2up': reel_size_2up,
-            'reel_width': reel_width,
-        },
-        'ups': ups,
-        'paper_weights': {
-            'top_paper_weight': round(top_paper_weight, 2),
-            'bottom_paper_weight': round(bottom_paper_weight, 2),
-            **{k: round(v, 2) for k, v in additional_weights.items()}
-        },
-        'total_area': round(total_area, 4),
-        'total_material_weight': round(total_material_weight, 2),
-        'cost_estimates': {
-            'material_cost': round(material_cost, 2),
-            'labor_cost': round(labor_cost, 2),
-            'total_cost': round(total_cost, 2)
-        },
-        'constants': {
-            'length_shrinkage_factor': 1.006,
-            'breadth_shrinkage_factor': 1.006,
-            'height_shrinkage_factor': 1.0112,
-            'flute_tuf': tuf,
-            'paper_cost_per_kg': paper_cost_per_kg,
-            'labor_cost_percentage': 0.3
-        },
-        'formulas': {
-            'dimensions': {
-                'length': f"{length} × 1.006 = {length_with_shrinkage:.2f} cm",
-                'breadth': f"{breadth} × 1.006 = {breadth_with_shrinkage:.2f} cm",
-                'height': f"{height} × 1.0112 = {height_with_shrinkage:.2f} cm",
-                'flute_size': f"({breadth} + 0.635) × 1.013575 ÷ 2 = {flute_size:.2f} cm",
-            },
-            'board_sizes': {
-                'full_length': f"(({length} + {breadth}) × 2 + 3.5 + 0.5) ÷ 2.54 = {full_length_in:.2f} in",
-                'half_length': f"(({length} + {breadth}) + 3.5 + 0.4) ÷ 2.54 = {half_length_in:.2f} in",
-                'reel_size_1up': f"(({height} + {flute_size} + {flute_size}) + 0.8) ÷ 2.54 = {reel_size_1up:.2f} in",
-                'reel_size_2up': f"((({height} + {flute_size} + {flute_size}) × 2) + 0.8) ÷ 2.54 = {reel_size_2up:.2f} in",
-            },
-            'surface_area': f"2 × ({length_m:.4f} × {breadth_m:.4f} + {length_m:.4f} × {height_m:.4f} + {breadth_m:.4f} × {height_m:.4f}) = {total_area:.4f} m²",
-            'paper_weights': {
-                'top_paper': f"{total_area:.4f} × {top_paper_gsm} ÷ 1000 = {top_paper_weight:.2f} kg",
-                'bottom_paper': f"{total_area:.4f} × {bottom_paper_gsm} ÷ 1000 = {bottom_paper_weight:.2f} kg",
-            },
-            'costs': {
-                'material_cost': f"{total_material_weight:.2f} × {paper_cost_per_kg} = {material_cost:.2f}",
-                'labor_cost': f"{material_cost:.2f} × 0.3 = {labor_cost:.2f}",
-                'total_cost': f"{material_cost:.2f} + {labor_cost:.2f} = {total_cost:.2f}"
-            }
-        }
+        **box_result(calc, 0),
+        'constants': calculation_constants(),
+        'formulas': calculation_formulas(calc, 0),
     }
-    
-    import logging
-    logger = logging.getLogger(__name__)
-    logger.info(f"Box calculations response data: {response_data}")
-    
     return JsonResponse(response_data)
 
+@login_required
+@require_POST
+def batch_box_calculations(request):
+    """
+    Calculate many candidate boxes in one request.
+    Expects JSON ``{"boxes": [{...box spec..., "quantity": 1000}, ...]}``; the
+    optional quantity gives each box's order cost and the batch total.
+    """
+    try:
+        boxes = json.loads(request.body).get('boxes')
+        if not isinstance(boxes, list) or not boxes:
+            return JsonResponse({'error': 'Expected a non-empty "boxes" list'}, status=400)
+        if len(boxes) > MAX_BATCH_SIZE:
+            return JsonResponse({'error': f'At most {MAX_BATCH_SIZE} boxes per request'}, status=400)
+        specs, quantities = [], []
+        for i, box in enumerate(boxes):
+            try:
+                spec = parse_box_spec(box)
+                check_box_spec(spec)
+                quantity = int(box.get('quantity') or 0)
+                if quantity < 0:
+                    raise ValueError("quantity cannot be negative")
+            except (ValueError, TypeError, AttributeError, OverflowError) as e:
+                raise ValueError(f"box {i}: {e}")
+            specs.append(spec)
+            quantities.append(quantity)
+    except (ValueError, TypeError, AttributeError) as e:
+        return JsonResponse({'error': f'Invalid box specification: {e}'}, status=400)
+
+    calc = calculate_boxes(specs)
+    order_costs = calc['total_cost'] * quantities
+    results = []
+    for i, box in enumerate(boxes):
+        result = box_result(calc, i)
+        result['ref'] = box.get('ref', i)
+        result['quantity'] = quantities[i]
+        result['order_total_cost'] = round(float(order_costs[i]), 2)
+        results.append(result)
+
+    return JsonResponse({
+        'count': len(results),
+        'results': results,
+        'total_cost': round(float(order_costs.sum()), 2),
+        'constants': calculation_constants(),
+    })
+
+def box_template_choices():
+    """Box templates for the order form's pickers, loading only the columns they show"""
+    return BoxDetails.objects.only('id', 'box_name', 'length', 'breadth', 'height').order_by('box_name')
+
 class BoxOrderCreateView(LoginRequiredMixin, CreateView):
     model = BoxOrder
     form_class = BoxOrderForm
@@ -262,10 +212,15 @@ class BoxOrderCreateView(LoginRequiredMixin, CreateView):
     success_url = reverse_lazy('finished_goods:order-list')
     login_url = '/accounts/login/'
 
+    def get_form(self, form_class=None):
+        form = super().get_form(form_class)
+        form.fields['box_template'].queryset = box_template_choices()
+        return form
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         # Add box templates to the context
-        context['box_templates'] = BoxDetails.objects.all()
+        context['box_templates'] = box_template_choices()
         
         # If a template is selected in the query params
         if 'template' in self.request.GET:
@@ -278,120 +233,72 @@ class BoxOrderCreateView(LoginRequiredMixin, CreateView):
         return context
     
     def form_valid(self, form):
-        response = super().form_valid(form)
-        
-        # Calculate and save material requirements
-        box_template = form.cleaned_data.get('box_template')
-        quantity = form.cleaned_data.get('quantity')
-        
-        if box_template and quantity:
-            # Create material requirements
-            materials = self.calculate_materials(box_template, quantity)
-            MaterialRequirement.objects.create(
-                box_order=self.object,
-                **materials
-            )
-            
-            # Create manufacturing cost
-            costs = self.calculate_costs(materials, form.cleaned_data.get('profit_margin'))
-            ManufacturingCost.objects.create(
-                box_order=self.object,
-                **costs
-            )
-            
+        # Cost the order once and store the breakdown, then hold the paper,
+        # gum and ink it needs (or take it off stock straight away if the
+        # order starts out in manufacturing). All of it or none of it.
+        with transaction.atomic():
+            response = super().form_valid(form)
+            save_costing(self.object)
+            reserve_order(self.object)
+            sync_order_reservations(self.object)
         return response
-    
-    def calculate_materials(self, box_template, quantity):
-        # This is placeholder logic - replace with your actual calculation logic
-        return {
-            'top_paper_weight': box_template.area * quantity * 1.1,  # 10% waste
-            'bottom_paper_weight': box_template.area * quantity * 0.8,  # Use original field name
-            'ink_cost': quantity * 0.05,  # Use original field name
-        }
-    
-    def calculate_costs(self, materials, profit_margin):
-        # Convert materials values to Decimal if they aren't already
-        top_paper_weight = Decimal(str(materials['top_paper_weight']))
-        bottom_paper_weight = Decimal(str(materials['bottom_paper_weight']))
-        ink_cost = Decimal(str(materials['ink_cost']))
-        
-        # Use Decimal for all calculations
-        material_cost = (top_paper_weight * Decimal('0.02')) + \
-                       (bottom_paper_weight * Decimal('0.015')) + \
-                       (ink_cost * Decimal('2'))
-        
-        labor_cost = material_cost * Decimal('0.3')  # Assume labor is 30% of material cost
-        total_cost = material_cost + labor_cost
-        
-        # Convert profit_margin to Decimal if it's not already
-        if not isinstance(profit_margin, Decimal):
-            profit_margin = Decimal(str(profit_margin))
-            
-        suggested_price = total_cost * (Decimal('1') + (profit_margin / Decimal('100')))
-        
-        return {
-            'material_cost': material_cost,
-            'labor_cost': labor_cost,
-            'total_cost': total_cost,
-            'profit_margin': profit_margin,
-            'suggested_price': suggested_price
-        }
 
 @login_required
 def calculate_order_requirements(request):
     template_id = request.GET.get('template_id')
-    quantity = int(request.GET.get('quantity', 0))
-    margin = float(request.GET.get('margin', 15))
-    
-    if not template_id or quantity <= 0:
-        return JsonResponse({'error': 'Missing or invalid parameters'})
+    try:
+        quantity = int(request.GET.get('quantity', 0))
+        margin = Decimal(request.GET.get('margin') or 15)
+    except (ValueError, InvalidOperation):
+        quantity, margin = 0, None
+
+    # Decimal also reads "NaN" and "Infinity", which no margin can be
+    if not template_id or quantity <= 0 or margin is None or not margin.is_finite() or margin < 0:
+        return JsonResponse({'error': 'Missing or invalid parameters'}, status=400)
     
     try:
-        box_template = BoxDetails.objects.get(id=template_id)
-        
-        # Calculate material requirements
-        requirements = [
-            {
-                'material_name': 'Kraft Paper',
-                'quantity': round(box_template.area * quantity * 1.1, 2),  # 10% waste
-                'unit': 'sqm'
-            },
-            {
-                'material_name': 'Corrugated Medium',
-                'quantity': round(box_template.area * quantity * 0.8, 2),
-                'unit': 'sqm'
-            },
-            {
-                'material_name': 'Adhesive',
-                'quantity': round(quantity * 0.05, 2),
-                'unit': 'kg'
-            }
-        ]
-        
-        # Check inventory status (simplified example)
-        inventory_status = {
-            'Kraft Paper': 'adequate',
-            'Corrugated Medium': 'low',
-            'Adhesive': 'adequate'
-        }
+        box_template = BoxDetails.objects.select_related('paper_requirements').get(id=template_id)
+        costing = cost_order(box_template, quantity, margin, check_stock=True)
         
-        # Calculate manufacturing costs
-        material_cost = sum(item['quantity'] * (2 if item['material_name'] == 'Adhesive' else 0.02) for item in requirements)
-        labor_cost = material_cost * 0.3  # Assume labor is 30% of material cost
-        total_cost = material_cost + labor_cost
-        suggested_price = total_cost * (1 + (margin / 100))
+        # Paper per GSM/BF from the box's paper requirements, checked against stock
+        requirements = []
+        inventory_status = {}
+        shortfalls = {}
+        for entry in costing['paper']:
+            material_name = f"Paper {entry['gsm']} GSM / {entry['bf']} BF"
+            requirements.append({
+                'material_name': material_name,
+                'quantity': float(entry['required_kg']),
+                'unit': 'kg',
+                'available': float(entry['available_kg']),
+                'cost': float(entry['cost']),
+            })
+            inventory_status[material_name] = entry['status']
+            if entry['shortfall_kg']:
+                shortfalls[material_name] = float(entry['shortfall_kg'])
+        requirements.append({
+            'material_name': 'Adhesive',
+            'quantity': float(costing['adhesive_weight']),
+            'unit': 'kg',
+            'cost': float(costing['gum_cost']),
+        })
+        if costing['ink_weight']:
+            requirements.append({
+                'material_name': f"Ink ({box_template.print_color})",
+                'quantity': float(costing['ink_weight']),
+                'unit': 'kg',
+                'cost': float(costing['ink_cost']),
+            })
         
         manufacturing_costs = {
-            'material_cost': round(material_cost, 2),
-            'labor_cost': round(labor_cost, 2),
-            'total_cost': round(total_cost, 2),
-            'profit_margin': margin,
-            'suggested_price': round(suggested_price, 2)
+            field: float(costing[field])
+            for field in ('material_cost', 'labor_cost', 'total_cost', 'profit_margin', 'suggested_price')
         }
         
         return JsonResponse({
             'requirements': requirements,
             'inventory_status': inventory_status,
+            'shortfalls': shortfalls,
             'manufacturing_costs': manufacturing_costs
         })
     except BoxDetails.DoesNotExist:
@@ -399,51 +306,91 @@ def calculate_order_requirements(request):
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
+def parse_filter_date(value):
+    try:
+        return parse_date(value or '')
+    except ValueError:
+        return None
+
 class BoxOrderListView(LoginRequiredMixin, ListView):
     model = BoxOrder
     template_name = 'finished_goods/order_list.html'
     context_object_name = 'orders'
-    ordering = ['-created_at']
+    ordering = ['-created_at', '-id']
+    paginate_by = LIST_PAGE_SIZE
     login_url = '/accounts/login/'
 
+    def get_filters(self):
+        """Status, customer and created date range from the query string"""
+        params = self.request.GET
+        filters = {}
+        status = params.get('status')
+        if status in dict(BoxOrder.STATUS_CHOICES):
+            filters['status'] = status
+        if params.get('customer'):
+            filters['customer_name'] = params['customer']
+        # Whole days as datetime ranges, so the created_at indexes can be used
+        date_from = parse_filter_date(params.get('date_from'))
+        if date_from:
+            filters['created_at__gte'] = timezone.make_aware(datetime.combine(date_from, time.min))
+        date_to = parse_filter_date(params.get('date_to'))
+        if date_to:
+            filters['created_at__lt'] = timezone.make_aware(datetime.combine(date_to + timedelta(days=1), time.min))
+        return filters
+
+    def get_queryset(self):
+        return (
+            super().get_queryset()
+            .filter(**self.get_filters())
+            .select_related('box_template', 'material_requirement', 'manufacturing_cost')
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        query = self.request.GET.copy()
+        query.pop('page', None)
+        context.update({
+            'status_choices': BoxOrder.STATUS_CHOICES,
+            'customers': BoxOrder.objects.order_by('customer_name').values_list('customer_name', flat=True).distinct(),
+            'filters': self.request.GET,
+            'filter_query': query.urlencode(),
+        })
+        return context
+
 class BoxOrderDetailView(LoginRequiredMixin, DetailView):
     model = BoxOrder
     template_name = 'finished_goods/order_detail.html'
     context_object_name = 'order'
     login_url = '/accounts/login/'
+    queryset = BoxOrder.objects.select_related('box_template__paper_requirements', 'material_requirement', 'manufacturing_cost')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        order = self.get_object()
-        try:
-            material_requirements = MaterialRequirement.objects.get(box_order=order)
-            context['material_requirements'] = {
-                'Kraft Paper': {
-                    'quantity': material_requirements.top_paper_weight,
-                    'unit': 'sqm',
-                    'cost': material_requirements.paper_cost
-                },
-                'Corrugated Medium': {
-                    'quantity': material_requirements.bottom_paper_weight,
-                    'unit': 'sqm',
-                    'cost': material_requirements.paper_cost * Decimal('0.7')  # Estimated cost
-                },
-                'Adhesive': {
-                    'quantity': material_requirements.ink_cost,
+        order = self.object
+        # Both are stored by the costing pipeline; older orders may lack them
+        material = getattr(order, 'material_requirement', None)
+        if material is not None:
+            requirements = {}
+            for line in stored_paper_breakdown(order, material):
+                requirements[f"Paper {line['gsm']} GSM / {line['bf']} BF"] = {
+                    'quantity': line['kg'],
                     'unit': 'kg',
-                    'cost': material_requirements.gum_cost
+                    'cost': Decimal(line['cost']),
                 }
+            requirements['Adhesive'] = {
+                'quantity': material.adhesive_weight,
+                'unit': 'kg',
+                'cost': material.gum_cost,
             }
-        except (MaterialRequirement.DoesNotExist, AttributeError):
-            pass
-        
-        try:
-            manufacturing_cost = ManufacturingCost.objects.get(box_order=order)
-            manufacturing_cost.unit_price = manufacturing_cost.suggested_price / order.quantity if order.quantity else 0
-            context['manufacturing_cost'] = manufacturing_cost
-        except ManufacturingCost.DoesNotExist:
-            pass
-            
+            if material.ink_weight:
+                requirements['Ink'] = {
+                    'quantity': material.ink_weight,
+                    'unit': 'kg',
+                    'cost': material.ink_cost,
+                }
+            context['material_requirements'] = requirements
+        context['manufacturing_cost'] = getattr(order, 'manufacturing_cost', None)
+        context['reservations'] = order.reservations.order_by('id')
         return context
 
 @login_required
@@ -460,8 +407,10 @@ def update_order_status(request, pk):
             status = request.POST.get('status')
             
         if status in [choice[0] for choice in BoxOrder.STATUS_CHOICES]:
-            order.status = status
-            order.save()
+            with transaction.atomic():
+                order.status = status
+                order.save()
+                sync_order_reservations(order)
             return JsonResponse({'success': True})
         return JsonResponse({'success': False, 'error': 'Invalid status'})
     except BoxOrder.DoesNotExist:
@@ -472,7 +421,9 @@ def update_order_status(request, pk):
 def search_box_template(request):
     query = request.GET.get('q', '')
     if query:
-        boxes = BoxDetails.objects.filter(box_name__icontains(query)[:10])
+        boxes = BoxDetails.objects.filter(box_name__icontains=query).only(
+            'id', 'box_name', 'length', 'breadth', 'height', 'flute_type', 'num_plies',
+        ).order_by('box_name')[:10]
         results = [{
             'id': box.id,
             'name': box.box_name,
@@ -4,7 +4,10 @@ from .models import (
     PaperReel, PastingGum, Ink, StrappingRoll, PinCoil,
     # Summary models
     PaperReelSummary, PastingGumSummary, InkSummary, 
-    StrappingRollSummary, PinCoilSummary
+    StrappingRollSummary, PinCoilSummary,
+    # Activity log
+    InventoryLog, ArchivedInventoryLog,
+    StockAlert, StockReservation, StockMovement, StockIssue
 )
 
 # Register transaction models
@@ -20,3 +23,74 @@ admin.site.register(PastingGumSummary)
 admin.site.register(InkSummary)
 admin.site.register(StrappingRollSummary)
 admin.site.register(PinCoilSummary)
+
+# Activity log, hot and archived. Besides the date drill-down, any date range
+# can be searched from the URL, e.g. ?timestamp__date__gte=2024-01-01&timestamp__date__lte=2024-03-31
+@admin.register(InventoryLog)
+class InventoryLogAdmin(admin.ModelAdmin):
+    list_display = ('timestamp', 'action', 'item_type', 'item_id', 'user', 'details')
+    list_filter = ('action', 'item_type')
+    search_fields = ('item_type', '=item_id', 'user', 'details')
+    date_hierarchy = 'timestamp'
+
+@admin.register(ArchivedInventoryLog)
+class ArchivedInventoryLogAdmin(admin.ModelAdmin):
+    list_display = ('timestamp', 'action', 'item_type', 'item_id', 'user', 'details', 'archive_month')
+    list_filter = ('archive_month', 'action', 'item_type')
+    search_fields = ('item_type', '=item_id', 'user', 'details')
+    date_hierarchy = 'timestamp'
+    readonly_fields = [field.name for field in ArchivedInventoryLog._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+# Append-only cross-material ledger; rows are written by the inventory views and intake
+@admin.register(StockMovement)
+class StockMovementAdmin(admin.ModelAdmin):
+    list_display = ('timestamp', 'direction', 'kind', 'item_key', 'quantity', 'unit_cost', 'company_name', 'source')
+    list_filter = ('kind', 'direction', 'source')
+    search_fields = ('item_key', 'company_name', '=item_id')
+    date_hierarchy = 'timestamp'
+    readonly_fields = [field.name for field in StockMovement._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+@admin.register(StockIssue)
+class StockIssueAdmin(admin.ModelAdmin):
+    list_display = ('timestamp', 'kind', 'item_key', 'quantity', 'unit_cost', 'order', 'shift', 'issued_by')
+    list_filter = ('kind', 'shift')
+    search_fields = ('item_key', 'shift', 'issued_by', '=order__id')
+    date_hierarchy = 'timestamp'
+    readonly_fields = [field.name for field in StockIssue._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+    # Deleting an issue here would leave its stock off the summaries until the next rebuild
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+@admin.register(StockAlert)
+class StockAlertAdmin(admin.ModelAdmin):
+    list_display = ('item', 'level', 'quantity', 'threshold', 'is_active', 'raised_at', 'resolved_at')
+    list_filter = ('is_active', 'level', 'summary_type')
+    search_fields = ('item',)
+
+@admin.register(StockReservation)
+class StockReservationAdmin(admin.ModelAdmin):
+    list_display = ('order', 'item', 'quantity', 'status', 'created_at', 'updated_at')
+    list_filter = ('status', 'summary_type')
+    search_fields = ('item', 'order__order_number')
+    list_select_related = ('order',)
+    readonly_fields = [field.name for field in StockReservation._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+    # Reserved and consumed stock moves with the order; deleting a row here would skip that
+    def has_delete_permission(self, request, obj=None):
+        return False
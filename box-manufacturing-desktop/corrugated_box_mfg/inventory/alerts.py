@@ -0,0 +1,111 @@
+"""
+Stock alert engine.
+
+Thresholds are checked only for the summary rows a write actually changed:
+``summary_changed`` carries the row lookup, so each inventory transaction
+costs one summary read and one indexed lookup of that row's active alert.
+A ``StockAlert`` is raised when stock leaves the min/max range and resolved
+when it comes back. The list of active alerts is cached for the dashboard
+badge and the alerts endpoint.
+"""
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import StockAlert
+from .summaries import SUMMARY_MODEL_SPECS
+
+ACTIVE_ALERTS_CACHE_KEY = 'inventory:active_alerts'
+
+
+def stock_level(summary, spec):
+    """``'LOW'``, ``'HIGH'`` or ``None`` if stock is within the thresholds"""
+    quantity = getattr(summary, spec.stock_field)
+    if quantity < summary.min_stock_alert:
+        return 'LOW'
+    if quantity > summary.max_stock_alert:
+        return 'HIGH'
+    return None
+
+
+def item_label(summary, spec):
+    return f"{spec.model._meta.verbose_name.title()} " + " / ".join(
+        str(getattr(summary, field)) for field in spec.keys
+    )
+
+
+def _evaluate(summary, spec, active):
+    """Move ``summary``'s alert state on if it changed. Returns True if anything was written."""
+    level = stock_level(summary, spec)
+    quantity = Decimal(str(getattr(summary, spec.stock_field)))
+
+    if active is not None and active.level == level:
+        if active.quantity != quantity:
+            StockAlert.objects.filter(pk=active.pk).update(quantity=quantity)
+            return True
+        return False
+
+    if active is not None:
+        StockAlert.objects.filter(pk=active.pk).update(is_active=False, resolved_at=timezone.now())
+    if level is not None:
+        try:
+            with transaction.atomic():
+                StockAlert.objects.create(
+                    summary_type=type(summary).__name__,
+                    summary_id=summary.pk,
+                    item=item_label(summary, spec),
+                    level=level,
+                    quantity=quantity,
+                    threshold=summary.min_stock_alert if level == 'LOW' else summary.max_stock_alert,
+                )
+        except IntegrityError:
+            # A concurrent write raised the alert first
+            pass
+    return True
+
+
+def evaluate_alerts(summary_model, lookup=None):
+    """Re-check the rows of ``summary_model`` matching ``lookup`` (all rows if None)"""
+    spec = SUMMARY_MODEL_SPECS.get(summary_model)
+    if spec is None:
+        return
+    summaries = summary_model.objects.all()
+    if lookup is not None:
+        summaries = summaries.filter(**lookup)
+    active_alerts = StockAlert.objects.filter(summary_type=summary_model.__name__, is_active=True)
+    if lookup is not None:
+        active_alerts = active_alerts.filter(summary_id__in=summaries.values('pk'))
+    active = {alert.summary_id: alert for alert in active_alerts}
+
+    changed = False
+    with transaction.atomic():
+        for summary in summaries:
+            changed |= _evaluate(summary, spec, active.get(summary.pk))
+    if changed:
+        invalidate_alerts()
+
+
+def invalidate_alerts():
+    transaction.on_commit(lambda: cache.delete(ACTIVE_ALERTS_CACHE_KEY))
+
+
+def get_active_alerts():
+    """Currently active alerts as plain dicts, newest first"""
+    alerts = cache.get(ACTIVE_ALERTS_CACHE_KEY)
+    if alerts is None:
+        alerts = [
+            {
+                'id': alert.id,
+                'item': alert.item,
+                'level': alert.level,
+                'quantity': str(alert.quantity),
+                'threshold': str(alert.threshold),
+                'raised_at': alert.raised_at.isoformat(),
+            }
+            for alert in StockAlert.objects.filter(is_active=True).order_by('-raised_at')
+        ]
+        cache.set(ACTIVE_ALERTS_CACHE_KEY, alerts, settings.DASHBOARD_CACHE_TIMEOUT)
+    return alerts
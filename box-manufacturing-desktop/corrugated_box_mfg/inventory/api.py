@@ -0,0 +1,108 @@
+"""
+Read-only API endpoints for the inventory tables (see ``box_mfg.api``).
+
+Transaction rows carry only their receipt timestamp, so their listings
+take the newest ``StockMovement`` as their last change: every add, edit and
+delete appends one, and the ledger's timestamp index answers ``MAX`` with a
+single seek.
+"""
+from django.db.models import Count, Max
+
+from box_mfg.api import ApiViewSet, SparseFieldsSerializer
+
+from .models import (
+    PaperReel, PastingGum, Ink, StrappingRoll, PinCoil,
+    PaperReelSummary, PastingGumSummary, InkSummary, StrappingRollSummary, PinCoilSummary,
+    InventoryLog, StockMovement,
+)
+
+
+def serializer_for(model):
+    """Sparse-fieldset serializer of every column of ``model``"""
+    meta = type('Meta', (), {'model': model, 'fields': '__all__'})
+    return type(f'{model.__name__}Serializer', (SparseFieldsSerializer,), {'Meta': meta})
+
+
+class TransactionViewSet(ApiViewSet):
+    ordering = ('-timestamp', '-id')
+    date_field = 'timestamp'
+    filters = {'company': 'company_name'}
+
+    def change_markers(self, queryset):
+        count = queryset.order_by().aggregate(count=Count('pk'))['count']
+        return count, StockMovement.objects.aggregate(modified=Max('timestamp'))['modified']
+
+
+class PaperReelViewSet(TransactionViewSet):
+    queryset = PaperReel.objects.all()
+    serializer_class = serializer_for(PaperReel)
+    filters = {**TransactionViewSet.filters, 'gsm': 'gsm', 'bf': 'bf', 'size': 'size'}
+
+
+class PastingGumViewSet(TransactionViewSet):
+    queryset = PastingGum.objects.all()
+    serializer_class = serializer_for(PastingGum)
+    filters = {**TransactionViewSet.filters, 'gum_type': 'gum_type'}
+
+
+class InkViewSet(TransactionViewSet):
+    queryset = Ink.objects.all()
+    serializer_class = serializer_for(Ink)
+    filters = {**TransactionViewSet.filters, 'color': 'color'}
+
+
+class StrappingRollViewSet(TransactionViewSet):
+    queryset = StrappingRoll.objects.all()
+    serializer_class = serializer_for(StrappingRoll)
+    filters = {**TransactionViewSet.filters, 'roll_type': 'roll_type'}
+
+
+class PinCoilViewSet(TransactionViewSet):
+    queryset = PinCoil.objects.all()
+    serializer_class = serializer_for(PinCoil)
+    filters = {**TransactionViewSet.filters, 'coil_type': 'coil_type'}
+
+
+class SummaryViewSet(ApiViewSet):
+    # Every summary write sets last_updated, including reservations and issues
+    ordering = ('id',)
+    modified_field = 'last_updated'
+
+
+class PaperReelSummaryViewSet(SummaryViewSet):
+    queryset = PaperReelSummary.objects.all()
+    serializer_class = serializer_for(PaperReelSummary)
+    filters = {'gsm': 'gsm', 'bf': 'bf', 'size': 'size'}
+
+
+class PastingGumSummaryViewSet(SummaryViewSet):
+    queryset = PastingGumSummary.objects.all()
+    serializer_class = serializer_for(PastingGumSummary)
+    filters = {'gum_type': 'gum_type'}
+
+
+class InkSummaryViewSet(SummaryViewSet):
+    queryset = InkSummary.objects.all()
+    serializer_class = serializer_for(InkSummary)
+    filters = {'color': 'color'}
+
+
+class StrappingRollSummaryViewSet(SummaryViewSet):
+    queryset = StrappingRollSummary.objects.all()
+    serializer_class = serializer_for(StrappingRollSummary)
+    filters = {'roll_type': 'roll_type'}
+
+
+class PinCoilSummaryViewSet(SummaryViewSet):
+    queryset = PinCoilSummary.objects.all()
+    serializer_class = serializer_for(PinCoilSummary)
+    filters = {'coil_type': 'coil_type'}
+
+
+class InventoryLogViewSet(ApiViewSet):
+    queryset = InventoryLog.objects.all()
+    serializer_class = serializer_for(InventoryLog)
+    ordering = ('-timestamp', '-id')
+    date_field = 'timestamp'
+    modified_field = 'timestamp'
+    filters = {'action': 'action', 'item_type': 'item_type'}
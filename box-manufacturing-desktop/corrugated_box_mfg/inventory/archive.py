@@ -0,0 +1,68 @@
+"""
+Archival of old inventory log entries.
+
+``InventoryLog`` gains a row for every add, edit and delete, but the
+dashboard and overview only show the most recent few. ``archive_logs`` moves
+entries older than the retention period into ``ArchivedInventoryLog``, in
+batches, each batch copied and deleted in one transaction. Archived entries
+stay searchable from the admin by item, month and date range.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import InventoryLog, ArchivedInventoryLog
+
+BATCH_SIZE = 1000
+
+
+def archive_cutoff(days=None):
+    days = settings.INVENTORY_LOG_RETENTION_DAYS if days is None else days
+    return timezone.now() - timedelta(days=days)
+
+
+def _archive_row(log):
+    logged = timezone.localtime(log.timestamp) if timezone.is_aware(log.timestamp) else log.timestamp
+    return ArchivedInventoryLog(
+        original_id=log.id,
+        item_type=log.item_type,
+        item_id=log.item_id,
+        action=log.action,
+        details=log.details,
+        timestamp=log.timestamp,
+        user=log.user,
+        archive_month=logged.date().replace(day=1),
+    )
+
+
+def archive_logs(days=None, batch_size=BATCH_SIZE, dry_run=False):
+    """Move log entries older than ``days`` into the archive table.
+
+    Returns ``{archive month: entries moved}``; with ``dry_run`` nothing is
+    moved and the counts are what would have been.
+    """
+    cutoff = archive_cutoff(days)
+    old_logs = InventoryLog.objects.filter(timestamp__lt=cutoff).order_by('timestamp', 'id')
+    moved = {}
+
+    if dry_run:
+        for log in old_logs.only('timestamp').iterator(chunk_size=batch_size):
+            month = _archive_row(log).archive_month
+            moved[month] = moved.get(month, 0) + 1
+        return moved
+
+    while True:
+        with transaction.atomic():
+            batch = list(old_logs[:batch_size])
+            if not batch:
+                break
+            rows = [_archive_row(log) for log in batch]
+            ArchivedInventoryLog.objects.bulk_create(rows, batch_size=batch_size)
+            # InventoryLog has no relations or delete signals, so this is a
+            # single DELETE ... WHERE id IN (...) without loading the rows again
+            InventoryLog.objects.filter(id__in=[log.id for log in batch]).delete()
+        for row in rows:
+            moved[row.archive_month] = moved.get(row.archive_month, 0) + 1
+    return moved
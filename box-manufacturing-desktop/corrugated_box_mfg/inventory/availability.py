@@ -0,0 +1,91 @@
+"""
+Paper stock available per (GSM, BF), for order requirement checks.
+
+Availability is the summed ``available`` weight (on hand less what orders
+have reserved) of every ``PaperReelSummary`` size with that GSM and BF. Each (gsm, bf) figure is cached on its own;
+lookups fetch all the keys an order needs with one ``get_many`` and fill any
+misses with one grouped query. A paper summary change drops just its own key,
+and a full rebuild bumps a generation number that retires every key at once.
+"""
+import time
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Sum
+
+from .models import PaperReelSummary
+
+GENERATION_KEY = 'paper_availability:generation'
+
+
+def normalize_bf(bf):
+    """BF as entered on reels ('18', '18.0', ' 18 ') and boxes (Decimal 18.00) compare equal"""
+    text = str(bf).strip()
+    try:
+        return format(Decimal(text).normalize(), 'f')
+    except InvalidOperation:
+        return text.lower()
+
+
+def paper_key(gsm, bf):
+    return int(Decimal(str(gsm))), normalize_bf(bf)
+
+
+def _generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        # Start from the clock so an evicted counter never reuses old keys
+        cache.add(GENERATION_KEY, time.time_ns(), None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def _cache_key(generation, key):
+    return f"paper_availability:{generation}:{key[0]}:{key[1]}"
+
+
+def get_paper_availability(keys):
+    """``{(gsm, bf): kg in stock}`` for each ``paper_key`` in ``keys``"""
+    keys = set(keys)
+    if not keys:
+        return {}
+    generation = _generation()
+    cache_keys = {_cache_key(generation, key): key for key in keys}
+    cached = cache.get_many(list(cache_keys))
+    availability = {cache_keys[cache_key]: Decimal(value) for cache_key, value in cached.items()}
+
+    missing = keys - availability.keys()
+    if missing:
+        fetched = {key: Decimal('0') for key in missing}
+        rows = (
+            PaperReelSummary.objects
+            .filter(gsm__in={gsm for gsm, _ in missing})
+            .values('gsm', 'bf')
+            .annotate(weight=Sum('available'))
+            .order_by()
+        )
+        for row in rows:
+            key = paper_key(row['gsm'], row['bf'])
+            if key in fetched:
+                fetched[key] += row['weight'] or 0
+        cache.set_many(
+            {_cache_key(generation, key): str(weight) for key, weight in fetched.items()},
+            settings.DASHBOARD_CACHE_TIMEOUT,
+        )
+        availability.update(fetched)
+    return availability
+
+
+def invalidate_paper_availability(lookup=None):
+    """Drop the cached figure for ``lookup``'s (gsm, bf), or every figure if None"""
+    def invalidate():
+        if lookup and 'gsm' in lookup and 'bf' in lookup:
+            cache.delete(_cache_key(_generation(), paper_key(lookup['gsm'], lookup['bf'])))
+            return
+        try:
+            cache.incr(GENERATION_KEY)
+        except ValueError:
+            cache.add(GENERATION_KEY, time.time_ns(), None)
+    transaction.on_commit(invalidate)
@@ -0,0 +1,131 @@
+"""
+FIFO landed-cost layers for paper reels.
+
+Every reel received becomes a ``PaperCostLayer`` of its (gsm, bf, size)
+summary row, carrying running kg and cost totals. Stock leaves in receiving
+order, so everything received but no longer available (used, or promised
+to an order) sits at the front of the queue: the next kg out is at position
+``cum_weight_end - available``. Pricing N kg from there is two prefix-cost
+lookups, each an index seek, however long the purchase history gets.
+
+Receiving appends layers; deleting or editing a reel lays its row's layers
+out again, which touches only that row.
+"""
+from decimal import Decimal
+
+from django.db import transaction
+
+from .models import PaperReel, PaperReelSummary, PaperCostLayer
+
+ZERO = Decimal('0')
+
+REBUILD_CHUNK_SIZE = 2000
+
+
+def landed_cost_per_kg(reel):
+    """Price, freight, extra charges and tax of a reel, per kg"""
+    weight = Decimal(str(reel.total_weight))
+    if not weight:
+        return ZERO
+    return (Decimal(str(reel.total_price)) / weight).quantize(Decimal('0.0001'))
+
+
+def _layers(summary, reels, weight_before=ZERO, cost_before=ZERO):
+    layers = []
+    for reel in reels:
+        weight = Decimal(str(reel.total_weight))
+        cost_per_kg = landed_cost_per_kg(reel)
+        layers.append(PaperCostLayer(
+            summary=summary,
+            reel=reel,
+            weight=weight,
+            cost_per_kg=cost_per_kg,
+            cum_weight_start=weight_before,
+            cum_weight_end=weight_before + weight,
+            cum_cost_start=cost_before,
+        ))
+        weight_before += weight
+        cost_before += weight * cost_per_kg
+    return layers
+
+
+def last_layer(summary):
+    return summary.cost_layers.order_by('-cum_weight_end', '-id').first()
+
+
+def relayer(summary, exclude=()):
+    """Lay out ``summary``'s cost layers again from its reels, skipping ``exclude`` pks"""
+    summary.cost_layers.all().delete()
+    reels = PaperReel.objects.filter(gsm=summary.gsm, bf=summary.bf, size=summary.size).order_by('id')
+    if exclude:
+        reels = reels.exclude(pk__in=exclude)
+    PaperCostLayer.objects.bulk_create(_layers(summary, reels), batch_size=500)
+
+
+def record_reels(reels, action='add'):
+    """Keep the cost layers in step with reels just added, or about to be deleted"""
+    groups = {}
+    for reel in reels:
+        groups.setdefault((reel.gsm, reel.bf, reel.size), []).append(reel)
+    with transaction.atomic():
+        for (gsm, bf, size), group in groups.items():
+            summary = PaperReelSummary.objects.select_for_update().filter(gsm=gsm, bf=bf, size=size).first()
+            if summary is None:
+                continue
+            if action == 'delete':
+                relayer(summary, exclude={reel.pk for reel in group})
+                continue
+            group.sort(key=lambda reel: reel.pk)
+            last = last_layer(summary)
+            if last is not None and group[0].pk < last.reel_id:
+                # An edited reel keeps its place in the queue
+                relayer(summary)
+                continue
+            weight_before = last.cum_weight_end if last else ZERO
+            cost_before = last.cum_cost_start + last.weight * last.cost_per_kg if last else ZERO
+            PaperCostLayer.objects.bulk_create(_layers(summary, group, weight_before, cost_before), batch_size=500)
+
+
+def rebuild_cost_layers():
+    """Recompute every cost layer from the reels. Returns the number of layers written."""
+    summaries = {(s.gsm, s.bf, s.size): s for s in PaperReelSummary.objects.all()}
+    # Running (kg, cost) of each summary row; reels are read in id order so
+    # only one chunk of them is held at a time
+    totals = {}
+    reels = PaperReel.objects.order_by('id').only('gsm', 'bf', 'size', 'total_weight', 'total_price')
+    count = 0
+    with transaction.atomic():
+        PaperCostLayer.objects.all().delete()
+        layers = []
+        for reel in reels.iterator(chunk_size=REBUILD_CHUNK_SIZE):
+            summary = summaries.get((reel.gsm, reel.bf, reel.size))
+            if summary is None:
+                continue
+            layer, = _layers(summary, [reel], *totals.get(summary.pk, (ZERO, ZERO)))
+            totals[summary.pk] = (layer.cum_weight_end, layer.cum_cost_start + layer.weight * layer.cost_per_kg)
+            layers.append(layer)
+            if len(layers) >= REBUILD_CHUNK_SIZE:
+                PaperCostLayer.objects.bulk_create(layers, batch_size=500)
+                count += len(layers)
+                layers = []
+        PaperCostLayer.objects.bulk_create(layers, batch_size=500)
+    return count + len(layers)
+
+
+def _prefix_cost(summary, weight, last):
+    """Landed cost of the first ``weight`` kg ever received into ``summary``"""
+    layer = summary.cost_layers.filter(cum_weight_end__gte=weight).order_by('cum_weight_end', 'id').first()
+    if layer is None:
+        # Past everything received: price the rest at the latest cost
+        layer = last
+    return layer.cum_cost_start + (weight - layer.cum_weight_start) * layer.cost_per_kg
+
+
+def fifo_cost(summary, kg):
+    """Landed cost of the next ``kg`` to leave ``summary``'s stock, or None if it has no layers"""
+    last = last_layer(summary)
+    if last is None:
+        return None
+    kg = Decimal(str(kg))
+    start = max(last.cum_weight_end - Decimal(str(summary.available)), ZERO)
+    return (_prefix_cost(summary, start + kg, last) - _prefix_cost(summary, start, last)).quantize(Decimal('0.01'))
@@ -0,0 +1,49 @@
+"""
+Cached snapshot of the data shown on the dashboard (``inventory_home``).
+
+The snapshot is built lazily on the first request after a change and kept in
+Django's cache until an inventory write or order save invalidates it (see
+``inventory.signals``), so repeated dashboard loads run no queries for it.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import (
+    PaperReelSummary, PastingGumSummary, InkSummary,
+    StrappingRollSummary, PinCoilSummary, InventoryLog
+)
+
+DASHBOARD_CACHE_KEY = 'inventory:dashboard'
+
+
+def build_dashboard_snapshot():
+    """Evaluate every dashboard query into plain lists that can be cached"""
+    from finished_goods.models import BoxOrder
+
+    return {
+        'paper_reels': list(PaperReelSummary.objects.all()),
+        'pasting_gum': list(PastingGumSummary.objects.all()),
+        'ink_stock': list(InkSummary.objects.all()),
+        'strapping_rolls': list(StrappingRollSummary.objects.all()),
+        'pin_coils': list(PinCoilSummary.objects.all()),
+        'recent_orders': list(BoxOrder.objects.all().order_by('-created_at')[:5]),
+        'activity_logs': list(InventoryLog.objects.all()[:10]),
+    }
+
+
+def get_dashboard_snapshot():
+    snapshot = cache.get(DASHBOARD_CACHE_KEY)
+    if snapshot is None:
+        snapshot = build_dashboard_snapshot()
+        cache.set(DASHBOARD_CACHE_KEY, snapshot, settings.DASHBOARD_CACHE_TIMEOUT)
+    return snapshot
+
+
+def invalidate_dashboard():
+    """Drop the snapshot once the current transaction commits.
+
+    Deleting before commit would let a concurrent request cache the old data
+    again before the write becomes visible.
+    """
+    transaction.on_commit(lambda: cache.delete(DASHBOARD_CACHE_KEY))
@@ -0,0 +1,123 @@
+"""
+CSV and XLSX exports of the inventory tables.
+
+Rows are read with ``values_list`` over the model's own columns and
+``iterator(chunk_size=...)``, and written out one chunk at a time, so an
+export of years of history holds only a chunk in memory and the first bytes
+go out before the last rows are read. The same generator feeds the
+download view (through ``StreamingHttpResponse``) and the
+``export_inventory`` command.
+
+XLSX files are zip archives and cannot be sent while they are written, so
+``write_xlsx`` fills a file with openpyxl's write-only workbook, which
+streams rows to disk instead of building the sheet in memory.
+"""
+import csv
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .models import (
+    PaperReel, PastingGum, Ink, StrappingRoll, PinCoil,
+    PaperReelSummary, PastingGumSummary, InkSummary, StrappingRollSummary, PinCoilSummary,
+    InventoryLog, StockMovement, StockIssue,
+)
+
+CHUNK_SIZE = 2000
+
+# Export name -> (model, date column the since/until filters apply to)
+EXPORTS = {
+    'paper_reels': (PaperReel, 'timestamp'),
+    'pasting_gum': (PastingGum, 'timestamp'),
+    'ink_stock': (Ink, 'timestamp'),
+    'strapping_rolls': (StrappingRoll, 'timestamp'),
+    'pin_coils': (PinCoil, 'timestamp'),
+    'paper_reel_summary': (PaperReelSummary, 'last_updated'),
+    'pasting_gum_summary': (PastingGumSummary, 'last_updated'),
+    'ink_summary': (InkSummary, 'last_updated'),
+    'strapping_roll_summary': (StrappingRollSummary, 'last_updated'),
+    'pin_coil_summary': (PinCoilSummary, 'last_updated'),
+    'inventory_logs': (InventoryLog, 'timestamp'),
+    'stock_movements': (StockMovement, 'timestamp'),
+    'stock_issues': (StockIssue, 'timestamp'),
+}
+
+
+class ExportError(ValueError):
+    pass
+
+
+def export_columns(model):
+    return [field.attname for field in model._meta.concrete_fields]
+
+
+def export_queryset(name, since=None, until=None):
+    """``values_list`` rows of export ``name`` in id order, optionally limited to a date range.
+
+    ``since`` and ``until`` are ``YYYY-MM-DD`` strings or dates; both ends are
+    inclusive. They are applied as a half-open range on the date column itself
+    (``>=`` the first day's start, ``<`` the day after the last), which its
+    index can serve.
+    """
+    if name not in EXPORTS:
+        raise ExportError(f"Unknown export '{name}'")
+    model, date_field = EXPORTS[name]
+    queryset = model.objects.order_by('pk')
+    if since:
+        queryset = queryset.filter(**{f'{date_field}__gte': _day_start(since)})
+    if until:
+        queryset = queryset.filter(**{f'{date_field}__lt': _day_start(until) + timedelta(days=1)})
+    return queryset.values_list(*export_columns(model))
+
+
+def _day_start(bound):
+    try:
+        day = parse_date(bound) if isinstance(bound, str) else bound
+    except ValueError:
+        day = None
+    if day is None:
+        raise ExportError(f"Invalid date '{bound}', expected YYYY-MM-DD")
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+class _Echo:
+    """File-like object whose ``write`` hands back what it was given, for ``csv.writer``"""
+
+    def write(self, value):
+        return value
+
+
+def csv_chunks(queryset, chunk_size=CHUNK_SIZE):
+    """Yield an ``export_queryset`` as CSV text, a header line and then one string per chunk of rows"""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(export_columns(queryset.model))
+    chunk = []
+    for row in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(writer.writerow(row))
+        if len(chunk) >= chunk_size:
+            yield ''.join(chunk)
+            chunk = []
+    if chunk:
+        yield ''.join(chunk)
+
+
+def _xlsx_cell(value):
+    # Excel has no time zones; write datetimes in local time like the pages show them
+    if isinstance(value, datetime) and timezone.is_aware(value):
+        return timezone.make_naive(value)
+    return value
+
+
+def write_xlsx(queryset, target, chunk_size=CHUNK_SIZE):
+    """Write an ``export_queryset`` to ``target`` (a path or binary file) as a one-sheet workbook"""
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise ExportError("openpyxl is required to export .xlsx files")
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(queryset.model._meta.model_name)
+    sheet.append(export_columns(queryset.model))
+    for row in queryset.iterator(chunk_size=chunk_size):
+        sheet.append([_xlsx_cell(value) for value in row])
+    workbook.save(target)
@@ -0,0 +1,191 @@
+"""
+Bulk goods-received intake.
+
+A batch is a list of rows shaped like the ``add_inventory`` form: an
+``item_type`` ("Paper Reel", "Pasting Gum", ...) plus the fields for that
+type. The whole batch is validated before anything is written; it is then
+inserted with one ``bulk_create`` per model, one for the log entries, and
+one summary UPDATE per (gsm, bf, size)-style group.
+"""
+import csv
+import io
+import json
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+
+from django.db import transaction
+
+from .models import PaperReel, PastingGum, Ink, StrappingRoll, PinCoil, InventoryLog
+from .summaries import update_summary_tables_bulk
+from .suggestions import record_suggestions
+
+BATCH_SIZE = 500
+
+# item_type -> (model, {field: parser}) using the same names as add_inventory
+ITEM_TYPES = {
+    'Paper Reel': (PaperReel, {
+        'gsm': int, 'bf': str, 'size': str, 'total_weight': Decimal,
+    }),
+    'Pasting Gum': (PastingGum, {
+        'gum_type': str, 'weight_per_bag': Decimal, 'total_qty': int,
+    }),
+    'Ink': (Ink, {
+        'color': str, 'weight_per_can': Decimal, 'total_qty': int,
+    }),
+    'Strapping Roll': (StrappingRoll, {
+        'roll_type': str, 'meters_per_roll': int, 'weight_per_roll': Decimal, 'total_qty': int,
+    }),
+    'Pin Coil': (PinCoil, {
+        'coil_type': str, 'total_qty': int,
+    }),
+}
+
+# Optional pricing fields default to 0 like the single-item form
+PRICE_FIELDS = ('price_per_kg', 'freight', 'extra_charges', 'tax_percent')
+
+
+class IntakeError(ValueError):
+    """Raised when a batch fails validation; ``errors`` lists every bad row."""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__(f"{len(errors)} invalid row(s) in batch")
+
+
+def _clean(value):
+    if value is None:
+        return ''
+    return str(value).strip()
+
+
+def _decimal(raw):
+    value = Decimal(raw)
+    # Decimal accepts "NaN" and "Infinity", which no quantity or price can be
+    if not value.is_finite():
+        raise ValueError
+    return value
+
+
+def _parse(parser, raw):
+    if parser is str:
+        return raw
+    if parser is int:
+        # Spreadsheets hand back 120.0 for an integer cell
+        value = _decimal(raw)
+        if value != value.to_integral_value():
+            raise ValueError
+        return int(value)
+    return _decimal(raw)
+
+
+def build_item(row):
+    """Turn one batch row into an unsaved inventory instance."""
+    if not isinstance(row, dict):
+        raise ValueError(f"Expected an object with item fields, got {row!r}")
+    item_type = _clean(row.get('item_type'))
+    if item_type not in ITEM_TYPES:
+        raise ValueError(f"Invalid item type: {item_type or '(blank)'}")
+    model, fields = ITEM_TYPES[item_type]
+
+    company_name = _clean(row.get('company_name'))
+    if not company_name:
+        raise ValueError("company_name is required")
+    values = {'company_name': company_name}
+
+    for field in PRICE_FIELDS:
+        raw = _clean(row.get(field)) or '0'
+        try:
+            values[field] = _decimal(raw)
+        except (InvalidOperation, ValueError):
+            raise ValueError(f"{field} must be a number, got {raw!r}")
+        if values[field] < 0:
+            raise ValueError(f"{field} cannot be negative")
+
+    for field, parser in fields.items():
+        raw = _clean(row.get(field))
+        if not raw:
+            raise ValueError(f"{field} is required for {item_type}")
+        try:
+            values[field] = _parse(parser, raw)
+        except (InvalidOperation, ValueError):
+            raise ValueError(f"{field} must be a number, got {raw!r}")
+        if parser is not str and values[field] <= 0:
+            raise ValueError(f"{field} must be greater than 0")
+
+    item = model(**values)
+    item.calculate_totals()
+    return item_type, item
+
+
+def validate_batch(rows):
+    """Build every row, collecting all errors before raising ``IntakeError``."""
+    if not isinstance(rows, list):
+        raise IntakeError([{'row': 0, 'error': "Batch must be a list of rows"}])
+    items, errors = [], []
+    for index, row in enumerate(rows, start=1):
+        try:
+            items.append(build_item(row))
+        except ValueError as e:
+            errors.append({'row': index, 'error': str(e)})
+    if errors:
+        raise IntakeError(errors)
+    if not items:
+        raise IntakeError([{'row': 0, 'error': "Batch contains no rows"}])
+    return items
+
+
+def intake_batch(rows, user='System'):
+    """Validate and insert a goods-received batch in a single transaction.
+
+    Returns ``{item_type: rows created}``.
+    """
+    items = validate_batch(rows)
+
+    by_model = {}
+    for item_type, item in items:
+        by_model.setdefault(type(item), []).append((item_type, item))
+
+    created = {}
+    with transaction.atomic():
+        logs = []
+        for model, entries in by_model.items():
+            objs = model.objects.bulk_create([item for _, item in entries], batch_size=BATCH_SIZE)
+            for (item_type, _), obj in zip(entries, objs):
+                logs.append(InventoryLog(
+                    item_type=item_type,
+                    item_id=obj.id,
+                    action='ADD',
+                    details=f"Added {item_type} from {obj.company_name} (bulk intake)",
+                    user=user,
+                ))
+                created[item_type] = created.get(item_type, 0) + 1
+        InventoryLog.objects.bulk_create(logs, batch_size=BATCH_SIZE)
+        update_summary_tables_bulk([item for _, item in items], action='add')
+        record_suggestions([item for _, item in items])
+    return created
+
+
+def read_rows(stream, filename):
+    """Read batch rows from a CSV, XLSX or JSON file-like object."""
+    suffix = Path(filename).suffix.lower()
+    if suffix == '.csv':
+        data = stream.read()
+        if isinstance(data, bytes):
+            data = data.decode('utf-8-sig')
+        return list(csv.DictReader(io.StringIO(data)))
+    if suffix == '.json':
+        data = json.load(stream)
+        return data.get('items', []) if isinstance(data, dict) else data
+    if suffix in ('.xlsx', '.xlsm'):
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise ValueError("openpyxl is required to import .xlsx files")
+        sheet = load_workbook(stream, read_only=True, data_only=True).active
+        rows = sheet.iter_rows(values_only=True)
+        header = [_clean(cell) for cell in next(rows, [])]
+        return [
+            dict(zip(header, row)) for row in rows
+            if any(cell is not None for cell in row)
+        ]
+    raise ValueError(f"Unsupported file type: {suffix or filename}")
@@ -0,0 +1,158 @@
+"""
+Stock issued to the floor.
+
+An issue line names a summary row the way the intake form does (an
+``item_type`` plus its key fields, e.g. gsm/bf/size for paper) and a
+``quantity`` in that row's stock unit: kg of paper, bags of gum, cans of
+ink, rolls of strapping, pin coils. A whole job's lines are validated
+together and then applied in one transaction, with one conditional
+``UPDATE ... SET stock = stock - n WHERE available >= n`` per summary row,
+one ``bulk_create`` of ``StockIssue`` rows and one of ledger entries.
+
+Purchase rows are never touched, so price averages stay as they are and
+nothing is re-aggregated. The paper FIFO position follows ``available``, so
+the next issue is priced from the next layer on its own.
+
+An order's planned material is consumed from its reservation when it goes
+into manufacturing; issuing against an order records what is drawn on top
+of that, such as wastage or a reprint.
+"""
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+
+from .cost_layers import fifo_cost
+from .intake import ITEM_TYPES, _clean, _parse
+from .models import InventoryLog, PaperReelSummary, StockIssue, StockMovement
+from .summaries import SUMMARY_SPECS, _coerce, adjust_stock
+
+
+class IssueError(ValueError):
+    """Raised when an issue fails; ``errors`` lists every bad line."""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__(f"{len(errors)} invalid line(s) in issue")
+
+
+def parse_line(line):
+    """Read one issue line into ``(spec, key, quantity)``"""
+    item_type = _clean(line.get('item_type'))
+    if item_type not in ITEM_TYPES:
+        raise ValueError(f"Invalid item type: {item_type or '(blank)'}")
+    model, parsers = ITEM_TYPES[item_type]
+    spec = SUMMARY_SPECS[model]
+
+    key = []
+    for source in spec.keys.values():
+        raw = _clean(line.get(source))
+        if not raw:
+            raise ValueError(f"{source} is required for {item_type}")
+        try:
+            key.append(_parse(parsers[source], raw))
+        except (InvalidOperation, ValueError):
+            raise ValueError(f"{source} must be a number, got {raw!r}")
+
+    raw = _clean(line.get('quantity'))
+    try:
+        quantity = Decimal(raw)
+    except InvalidOperation:
+        raise ValueError(f"quantity must be a number, got {raw!r}")
+    if not quantity.is_finite() or quantity <= 0:
+        raise ValueError("quantity must be greater than 0")
+    if _coerce(spec.summary_model, spec.stock_field, quantity) != quantity:
+        raise ValueError(f"quantity of {item_type} must be a whole number")
+    return spec, tuple(key), quantity
+
+
+def issue_unit_cost(spec, summary, quantity):
+    """Cost per stock unit of ``quantity`` leaving ``summary``: FIFO for paper, the average price otherwise"""
+    if isinstance(summary, PaperReelSummary):
+        cost = fifo_cost(summary, quantity)
+        if cost is not None:
+            return (cost / quantity).quantize(Decimal('0.0001'))
+    return Decimal(str(getattr(summary, spec.avg_field))).quantize(Decimal('0.0001'))
+
+
+def issue_stock(lines, order=None, shift='', notes='', user='System'):
+    """Issue a job's lines against ``order`` or ``shift`` in one transaction.
+
+    Lines for the same summary row are added together. Nothing is issued
+    unless every line resolves to a row with enough available stock.
+    Returns the ``StockIssue`` rows created.
+    """
+    errors, wanted = [], {}
+    for index, line in enumerate(lines, start=1):
+        try:
+            spec, key, quantity = parse_line(line)
+        except ValueError as e:
+            errors.append({'line': index, 'error': str(e)})
+            continue
+        entry = wanted.setdefault((spec.model, key), {'spec': spec, 'quantity': Decimal('0'), 'lines': []})
+        entry['quantity'] += quantity
+        entry['lines'].append(index)
+    if errors:
+        raise IssueError(errors)
+    if not wanted:
+        raise IssueError([{'line': 0, 'error': "Issue contains no lines"}])
+
+    kind_labels = dict(StockMovement.KIND_CHOICES)
+    with transaction.atomic():
+        issues = []
+        for (_, key), entry in wanted.items():
+            spec, quantity = entry['spec'], entry['quantity']
+            item = f"{kind_labels[spec.kind]} {spec.format_key(key)}"
+            summary = spec.summary_model.objects.select_for_update().filter(**spec.lookup(key)).first()
+            if summary is None:
+                errors.append({'line': entry['lines'][0], 'error': f"No stock of {item}"})
+                continue
+            unit_cost = issue_unit_cost(spec, summary, quantity)
+            if not adjust_stock(summary, consumed=quantity, require_available=True):
+                errors.append({
+                    'line': entry['lines'][0],
+                    'error': f"Only {summary.available} of {item} available, {quantity} requested",
+                })
+                continue
+            issues.append(StockIssue(
+                kind=spec.kind,
+                item_key=spec.format_key(key),
+                summary_type=spec.summary_model.__name__,
+                summary_id=summary.pk,
+                quantity=quantity,
+                unit_cost=unit_cost,
+                order=order,
+                shift=shift,
+                notes=notes,
+                issued_by=user,
+            ))
+        if errors:
+            # Raising inside the block also rolls back the rows already taken off
+            raise IssueError(errors)
+
+        issues = StockIssue.objects.bulk_create(issues)
+        StockMovement.objects.bulk_create([
+            StockMovement(
+                kind=issue.kind,
+                item_key=issue.item_key,
+                company_name='',
+                quantity=issue.quantity,
+                unit_cost=issue.unit_cost,
+                direction='OUT',
+                source='ISSUE',
+                item_id=issue.pk,
+                timestamp=issue.timestamp,
+            )
+            for issue in issues
+        ])
+        target = f"order #{order.pk}" if order is not None else (shift or 'the floor')
+        InventoryLog.objects.bulk_create([
+            InventoryLog(
+                item_type=issue.get_kind_display(),
+                item_id=issue.pk,
+                action='ISSUE',
+                details=f"Issued {issue.quantity} of {issue.item_key} to {target}",
+                user=user,
+            )
+            for issue in issues
+        ])
+    return issues
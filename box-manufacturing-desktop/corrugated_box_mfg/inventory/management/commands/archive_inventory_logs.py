@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory.archive import BATCH_SIZE, archive_logs
+
+
+class Command(BaseCommand):
+    help = "Move inventory log entries older than the retention period into the archive table"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=None,
+            help=f"Archive entries older than this many days "
+                 f"(default: INVENTORY_LOG_RETENTION_DAYS, currently {settings.INVENTORY_LOG_RETENTION_DAYS})",
+        )
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--dry-run', action='store_true', help="Only report what would be archived")
+
+    def handle(self, *args, **options):
+        if options['days'] is not None and options['days'] < 0:
+            raise CommandError("--days must not be negative")
+
+        moved = archive_logs(options['days'], options['batch_size'], options['dry_run'])
+        for month, count in sorted(moved.items()):
+            self.stdout.write(f"{month:%Y-%m}: {count} entries")
+        verb = "Would archive" if options['dry_run'] else "Archived"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {sum(moved.values())} log entries"))
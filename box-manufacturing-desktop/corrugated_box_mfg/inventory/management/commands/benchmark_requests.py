@@ -0,0 +1,83 @@
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, RequestFactory
+from django.urls import reverse
+
+DEFAULT_URLS = ['inventory_home', 'inventory_overview']
+
+
+class Command(BaseCommand):
+    help = (
+        "Time requests to the dashboard and overview through the full Django stack. "
+        "Run it once with DJANGO_DB_CONN_MAX_AGE=0, once with the default persistent "
+        "connections and once with DJANGO_DB_POOL=1 to compare connection handling."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help="Requests per URL")
+        parser.add_argument(
+            '--url', action='append', dest='urls', metavar='URL_NAME',
+            help=f"URL name to request (default: {', '.join(DEFAULT_URLS)}). Can be given more than once.",
+        )
+        parser.add_argument('--user', default='admin', help="Username to log in as")
+        parser.add_argument(
+            '--clear-cache', action='store_true',
+            help="Clear the cache before every request so cached pages hit the database",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['user']}' does not exist")
+
+        settings_dict = connection.settings_dict
+        pool = settings_dict.get('OPTIONS', {}).get('pool')
+        self.stdout.write(
+            f"Database: {connection.vendor}, CONN_MAX_AGE={settings_dict['CONN_MAX_AGE']}, "
+            f"pool={pool or 'off'}"
+        )
+
+        # The test client skips the request_started/request_finished connection
+        # handling we want to measure, so drive the real WSGI handler instead
+        client = Client()
+        client.force_login(user)
+        cookie = client.cookies.output(header='', sep=';').strip()
+        handler = WSGIHandler()
+        factory = RequestFactory()
+
+        def request(url):
+            status = []
+            response = handler(
+                factory.get(url, HTTP_COOKIE=cookie).environ,
+                lambda code, headers: status.append(code),
+            )
+            b''.join(response)
+            response.close()
+            return status[0]
+
+        for name in options['urls'] or DEFAULT_URLS:
+            url = reverse(name)
+            # Warm up templates, URL resolvers and the first connection
+            request(url)
+            timings = []
+            for _ in range(options['requests']):
+                if options['clear_cache']:
+                    cache.clear()
+                start = time.perf_counter()
+                status = request(url)
+                timings.append((time.perf_counter() - start) * 1000)
+                if not status.startswith('200'):
+                    raise CommandError(f"{url} returned {status}")
+            timings.sort()
+            p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+            self.stdout.write(
+                f"{name:<22} n={len(timings)}  mean={statistics.mean(timings):.2f} ms  "
+                f"p50={statistics.median(timings):.2f} ms  p95={p95:.2f} ms  max={timings[-1]:.2f} ms"
+            )
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from inventory.alerts import evaluate_alerts, get_active_alerts
+from inventory.summaries import SUMMARY_MODEL_SPECS
+
+
+class Command(BaseCommand):
+    help = "Check every summary row against its stock alert thresholds"
+
+    def handle(self, *args, **options):
+        for summary_model in SUMMARY_MODEL_SPECS:
+            evaluate_alerts(summary_model)
+        alerts = get_active_alerts()
+        for alert in alerts:
+            self.stdout.write(f"{alert['level']}: {alert['item']} ({alert['quantity']} vs {alert['threshold']})")
+        self.stdout.write(self.style.SUCCESS(f"{len(alerts)} active stock alerts"))
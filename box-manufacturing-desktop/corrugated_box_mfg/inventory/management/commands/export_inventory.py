@@ -0,0 +1,41 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory.exports import CHUNK_SIZE, EXPORTS, ExportError, csv_chunks, export_queryset, write_xlsx
+
+
+class Command(BaseCommand):
+    help = "Write inventory tables to CSV or XLSX files, streaming rows so memory use stays flat"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'names', nargs='*', metavar='name',
+            help=f"Tables to export (default: all). One of: {', '.join(EXPORTS)}",
+        )
+        parser.add_argument('--output-dir', default='.', help="Directory for the <name>.csv or <name>.xlsx files")
+        parser.add_argument('--format', choices=['csv', 'xlsx'], default='csv')
+        parser.add_argument('--since', help="Only rows dated on or after YYYY-MM-DD")
+        parser.add_argument('--until', help="Only rows dated on or before YYYY-MM-DD")
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] <= 0:
+            raise CommandError("--chunk-size must be positive")
+        output_dir = Path(options['output_dir'])
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        for name in options['names'] or EXPORTS:
+            path = output_dir / f"{name}.{options['format']}"
+            try:
+                queryset = export_queryset(name, options['since'], options['until'])
+                if options['format'] == 'xlsx':
+                    write_xlsx(queryset, path, options['chunk_size'])
+                else:
+                    with open(path, 'w', newline='', encoding='utf-8') as f:
+                        for chunk in csv_chunks(queryset, options['chunk_size']):
+                            f.write(chunk)
+            except ExportError as e:
+                raise CommandError(str(e))
+            self.stdout.write(f"{name} -> {path}")
+        self.stdout.write(self.style.SUCCESS("Export finished"))
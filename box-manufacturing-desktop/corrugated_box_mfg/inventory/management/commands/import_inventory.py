@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory.intake import IntakeError, intake_batch, read_rows, validate_batch
+
+
+class Command(BaseCommand):
+    help = "Import a goods-received batch of inventory items from a CSV, XLSX or JSON file"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Batch file (.csv, .xlsx or .json)")
+        parser.add_argument('--user', default='System', help="Name recorded on the inventory log entries")
+        parser.add_argument('--dry-run', action='store_true', help="Validate the batch without saving anything")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        try:
+            with open(path, 'rb') as stream:
+                rows = read_rows(stream, path)
+            if options['dry_run']:
+                items = validate_batch(rows)
+                self.stdout.write(self.style.SUCCESS(f"{len(items)} rows are valid"))
+                return
+            created = intake_batch(rows, user=options['user'])
+        except IntakeError as e:
+            for error in e.errors:
+                self.stderr.write(f"Row {error['row']}: {error['error']}")
+            raise CommandError(str(e))
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        for item_type, count in created.items():
+            self.stdout.write(f"{item_type}: {count} added")
+        self.stdout.write(self.style.SUCCESS(f"Imported {sum(created.values())} items"))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from box_mfg.sqlite_maintenance import optimize_database
+
+
+class Command(BaseCommand):
+    help = "Run PRAGMA optimize and checkpoint the WAL on the SQLite database"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help="Database alias to optimize")
+
+    def handle(self, *args, **options):
+        result = optimize_database(options['database'])
+        if result is None:
+            self.stdout.write("Database is not SQLite, nothing to do")
+            return
+        busy, log_pages, checkpointed = result
+        self.stdout.write(f"WAL checkpoint: {checkpointed}/{log_pages} pages (busy={busy})")
+        self.stdout.write(self.style.SUCCESS("Database optimized"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from inventory.suggestions import rebuild_suggestions
+
+
+class Command(BaseCommand):
+    help = "Recompute the typeahead suggestion index from the transaction tables"
+
+    def handle(self, *args, **options):
+        rows = rebuild_suggestions()
+        self.stdout.write(self.style.SUCCESS(f"Suggestion index rebuilt with {rows} values"))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory.summaries import SUMMARY_SPECS, rebuild_summaries
+
+
+class Command(BaseCommand):
+    help = "Recompute the inventory summary tables from the transaction tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model', action='append', dest='models', metavar='MODEL',
+            help="Only rebuild the summary for this transaction model (e.g. PaperReel). "
+                 "Can be given more than once.",
+        )
+
+    def handle(self, *args, **options):
+        models = None
+        if options['models']:
+            by_name = {model.__name__.lower(): model for model in SUMMARY_SPECS}
+            try:
+                models = [by_name[name.lower()] for name in options['models']]
+            except KeyError as e:
+                raise CommandError(f"Unknown inventory model: {e.args[0]}")
+
+        results = rebuild_summaries(models)
+        for summary_name, rows in results.items():
+            self.stdout.write(f"{summary_name}: {rows} rows rebuilt")
+        self.stdout.write(self.style.SUCCESS("Summary tables rebuilt"))
@@ -0,0 +1,350 @@
+"""
+Synthetic data for load and scale testing.
+
+Purchases are spread evenly over the last ``--days`` days and written with
+``bulk_create`` one batch at a time, each with its ``StockMovement`` ledger
+entries. Folding every batch into the summaries would cost queries per
+summary row per batch, so the summary tables and paper cost layers are
+rebuilt once at the end with ``rebuild_summaries``, the same result a
+``rebuild_summaries`` run gives; the typeahead suggestion index is rebuilt
+from the seeded rows the same way. Box templates only use paper grades that
+were seeded, so orders are costed from real stock. Orders are costed once
+per (template, quantity) and the results stored in bulk.
+
+Everything random comes from one ``random.Random(--seed)``, so a seed
+always produces the same rows (dated relative to the time of the run).
+Seeded orders hold no stock reservations.
+"""
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from finished_goods.calculations import PAPER_LAYERS
+from finished_goods.costing import cost_order, costing_records
+from finished_goods.models import (
+    BoxDetails, BoxOrder, BoxPaperRequirements, MaterialRequirement, ManufacturingCost,
+)
+from finished_goods.order_numbers import reserve_order_numbers
+from inventory.models import (
+    PaperReel, PastingGum, Ink, StrappingRoll, PinCoil, Preset, StockMovement,
+)
+from inventory.suggestions import rebuild_suggestions
+from inventory.summaries import SUMMARY_SPECS, rebuild_summaries
+
+COMPANIES = [
+    'Shree Paper Mills', 'Kraft India', 'Sun Board Industries', 'Ganesh Paper', 'Eastern Kraft',
+    'Royal Paper Traders', 'Vijay Packaging Papers', 'Coastal Mills', 'Prakash Industries', 'Delta Boards',
+]
+GSMS = [100, 120, 140, 150, 180, 200, 230, 250]
+BFS = ['16', '18', '20', '22', '25', '28']
+SIZES = ['36', '40', '44', '48', '52', '56', '60', '64', '72']
+GUM_TYPES = {'Starch': [25, 50], 'PVA': [20, 40], 'Dextrin': [25]}
+INK_COLORS = {'Black': [5, 20], 'Red': [5], 'Blue': [5, 20], 'Green': [5], 'Brown': [5, 20]}
+# Roll type -> (meters per roll options, kg per 1000 m)
+ROLL_TYPES = {'PP 12mm': ([1000, 2000], 6), 'PP 15mm': ([1000, 1500], 8), 'PET 16mm': ([1000], 11)}
+COIL_TYPES = ['Galvanized 18', 'Copper Coated 18', 'Copper Coated 20']
+TAX_PERCENTS = [Decimal('5'), Decimal('12'), Decimal('18')]
+
+CUSTOMER_PREFIXES = [
+    'Apex', 'Bharat', 'Crystal', 'Dynamic', 'Everest', 'Fresh', 'Golden', 'Harvest', 'Indus', 'Jay',
+    'Kiran', 'Lotus', 'Metro', 'Nova', 'Orient', 'Pioneer', 'Quality', 'Rainbow', 'Sagar', 'Trident',
+]
+CUSTOMER_SUFFIXES = [
+    'Foods', 'Pharma', 'Electronics', 'Textiles', 'Exports', 'Agro', 'Ceramics', 'Beverages',
+    'Appliances', 'Cosmetics', 'Traders', 'Industries',
+]
+ORDER_QUANTITIES = [250, 500, 1000, 1500, 2000, 2500, 5000, 10000]
+PROFIT_MARGINS = [Decimal('10'), Decimal('15'), Decimal('20')]
+FLUTES = ['A', 'B', 'C', 'E', 'BC']
+
+CENT = Decimal('0.01')
+
+
+def _money(rng, low, high):
+    """Random amount between ``low`` and ``high`` to the cent"""
+    return Decimal(rng.randint(int(low * 100), int(high * 100))) / 100
+
+
+@contextmanager
+def _backdated(*fields):
+    """Let ``bulk_create`` keep the given ``(model, field)`` timestamps instead of stamping now"""
+    saved = []
+    for model, name in fields:
+        field = model._meta.get_field(name)
+        saved.append((field, field.auto_now, field.auto_now_add))
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def _spread(start, span, index, count, rng):
+    """Timestamp of row ``index`` of ``count`` spread over ``span``, in increasing order"""
+    return start + span * ((index + rng.random()) / count)
+
+
+class Command(BaseCommand):
+    help = (
+        "Add synthetic purchases, summaries, presets, box templates and costed orders to the "
+        "database for load testing, e.g. --reels 1000000 --orders 100000. Rows are added to "
+        "what is already there; the same --seed gives the same data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reels', type=int, default=10000, help="Paper reels to add")
+        parser.add_argument('--gum', type=int, default=500, help="Pasting gum purchases to add")
+        parser.add_argument('--ink', type=int, default=500, help="Ink purchases to add")
+        parser.add_argument('--strapping', type=int, default=300, help="Strapping roll purchases to add")
+        parser.add_argument('--pin-coils', type=int, default=300, help="Pin coil purchases to add")
+        parser.add_argument('--boxes', type=int, default=200, help="Box templates to add")
+        parser.add_argument(
+            '--orders', type=int, default=5000,
+            help="Orders to add, on the new box templates (or the existing ones with --boxes 0)",
+        )
+        parser.add_argument('--customers', type=int, default=300, help="Distinct customer names to use")
+        parser.add_argument('--days', type=int, default=730, help="Days of history to spread rows over")
+        parser.add_argument('--seed', type=int, default=1, help="Random seed")
+        parser.add_argument('--batch-size', type=int, default=5000, help="Rows per bulk insert")
+
+    def handle(self, *args, **options):
+        for name in ('reels', 'gum', 'ink', 'strapping', 'pin_coils', 'boxes', 'orders'):
+            if options[name] < 0:
+                raise CommandError(f"--{name.replace('_', '-')} cannot be negative")
+        if options['days'] < 1 or options['batch_size'] < 1 or options['customers'] < 1:
+            raise CommandError("--days, --batch-size and --customers must be at least 1")
+
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.end = timezone.now()
+        self.start = self.end - timedelta(days=options['days'])
+
+        self._presets()
+        makers = [
+            (PaperReel, options['reels'], self._paper_reel),
+            (PastingGum, options['gum'], self._pasting_gum),
+            (Ink, options['ink'], self._ink),
+            (StrappingRoll, options['strapping'], self._strapping_roll),
+            (PinCoil, options['pin_coils'], self._pin_coil),
+        ]
+        for model, count, make in makers:
+            self._purchases(model, count, make)
+        seeded = [model for model, count, _ in makers if count]
+        if seeded:
+            started = time.perf_counter()
+            rows = sum(rebuild_summaries(seeded).values())
+            self._report('summaries rebuilt', rows, started)
+            started = time.perf_counter()
+            self._report('suggestions rebuilt', rebuild_suggestions(), started)
+
+        boxes = self._boxes(options['boxes'])
+        if options['orders']:
+            # Orders on new templates start once the templates exist
+            start = max(box.created_at for box in boxes) if boxes else self.start
+            if not boxes:
+                boxes = list(BoxDetails.objects.select_related('paper_requirements'))
+            if not boxes:
+                raise CommandError("There are no box templates to place orders on; use --boxes")
+            self._orders(options['orders'], boxes, options['customers'], start)
+        self.stdout.write(self.style.SUCCESS("Synthetic data added"))
+
+    def _report(self, label, count, started):
+        elapsed = time.perf_counter() - started
+        rate = count / elapsed if elapsed else 0
+        self.stdout.write(f"{label}: {count} rows in {elapsed:.1f}s ({rate:.0f}/s)")
+
+    def _presets(self):
+        values = (
+            [('gsm', str(gsm)) for gsm in GSMS]
+            + [('company', company) for company in COMPANIES]
+            + [('gum_type', gum_type) for gum_type in GUM_TYPES]
+            + [('color', color) for color in INK_COLORS]
+            + [('roll_type', roll_type) for roll_type in ROLL_TYPES]
+            + [('coil_type', coil_type) for coil_type in COIL_TYPES]
+        )
+        Preset.objects.bulk_create(
+            [Preset(category=category, value=value) for category, value in values], ignore_conflicts=True,
+        )
+
+    # Purchases
+
+    def _common(self, rng, price_low, price_high):
+        return {
+            'company_name': rng.choice(COMPANIES),
+            'price_per_kg': _money(rng, price_low, price_high),
+            'freight': _money(rng, 0, 1500),
+            'extra_charges': _money(rng, 0, 300) if rng.random() < 0.2 else Decimal('0'),
+            'tax_percent': rng.choice(TAX_PERCENTS),
+        }
+
+    def _paper_reel(self, rng):
+        gsm = rng.choice(GSMS)
+        return PaperReel(
+            gsm=gsm, bf=rng.choice(BFS), size=rng.choice(SIZES),
+            total_weight=_money(rng, 300, 1200),
+            **self._common(rng, 30 + gsm / 50, 45 + gsm / 50),
+        )
+
+    def _pasting_gum(self, rng):
+        gum_type = rng.choice(list(GUM_TYPES))
+        return PastingGum(
+            gum_type=gum_type, weight_per_bag=Decimal(rng.choice(GUM_TYPES[gum_type])),
+            total_qty=rng.randint(10, 200), **self._common(rng, 25, 60),
+        )
+
+    def _ink(self, rng):
+        color = rng.choice(list(INK_COLORS))
+        return Ink(
+            color=color, weight_per_can=Decimal(rng.choice(INK_COLORS[color])),
+            total_qty=rng.randint(2, 40), **self._common(rng, 150, 400),
+        )
+
+    def _strapping_roll(self, rng):
+        roll_type = rng.choice(list(ROLL_TYPES))
+        lengths, kg_per_km = ROLL_TYPES[roll_type]
+        meters = rng.choice(lengths)
+        return StrappingRoll(
+            roll_type=roll_type, meters_per_roll=meters,
+            weight_per_roll=(Decimal(meters) * kg_per_km / 1000).quantize(CENT),
+            total_qty=rng.randint(5, 100), **self._common(rng, 90, 160),
+        )
+
+    def _pin_coil(self, rng):
+        return PinCoil(
+            coil_type=rng.choice(COIL_TYPES), total_qty=rng.randint(20, 500), **self._common(rng, 70, 120),
+        )
+
+    def _purchases(self, model, count, make):
+        if not count:
+            return
+        started = time.perf_counter()
+        span = self.end - self.start
+        spec = SUMMARY_SPECS[model]
+        for offset in range(0, count, self.batch_size):
+            batch = []
+            for index in range(offset, min(offset + self.batch_size, count)):
+                item = make(self.rng)
+                item.calculate_totals()
+                item.timestamp = _spread(self.start, span, index, count, self.rng)
+                batch.append(item)
+            with transaction.atomic(), _backdated((model, 'timestamp')):
+                batch = model.objects.bulk_create(batch)
+                movements = []
+                for item in batch:
+                    movement = spec.movement(item, 'IN', 'RECEIPT')
+                    movement.timestamp = item.timestamp
+                    movements.append(movement)
+                StockMovement.objects.bulk_create(movements)
+        self._report(model._meta.verbose_name_plural, count, started)
+
+    # Box templates and orders
+
+    def _boxes(self, count):
+        if not count:
+            return []
+        started = time.perf_counter()
+        rng = self.rng
+        # Templates are set up at the start, before the orders placed on them
+        span = (self.end - self.start) / 20
+        colors = [''] * 3 + list(INK_COLORS)
+        boxes = []
+        for index in range(count):
+            length = Decimal(rng.randint(100, 600))
+            created = _spread(self.start, span, index, count, rng)
+            boxes.append(BoxDetails(
+                box_name=f"{rng.choice(CUSTOMER_SUFFIXES)} carton {index + 1}",
+                length=length,
+                breadth=Decimal(rng.randint(80, int(length))),
+                height=Decimal(rng.randint(50, 500)),
+                flute_type=rng.choice(FLUTES),
+                num_plies=rng.choices([3, 5, 7], weights=[6, 3, 1])[0],
+                print_color=rng.choice(colors),
+                order_quantity=rng.choice(ORDER_QUANTITIES),
+                created_at=created,
+                updated_at=created,
+            ))
+        with transaction.atomic(), _backdated((BoxDetails, 'created_at'), (BoxDetails, 'updated_at')):
+            boxes = BoxDetails.objects.bulk_create(boxes, batch_size=self.batch_size)
+            requirements = []
+            for box in boxes:
+                # Only grades that were bought, so the orders can be costed from stock
+                values = {}
+                for layer, min_plies, max_plies, _ in PAPER_LAYERS:
+                    if box.num_plies < min_plies or (max_plies and box.num_plies > max_plies):
+                        continue
+                    values[f'{layer}_gsm'] = Decimal(rng.choice(GSMS))
+                    values[f'{layer}_bf'] = Decimal(rng.choice(BFS))
+                requirements.append(BoxPaperRequirements(box=box, **values))
+            BoxPaperRequirements.objects.bulk_create(requirements, batch_size=self.batch_size)
+        self._report('box templates', count, started)
+        return boxes
+
+    def _status(self, age):
+        """Status of an order placed ``age`` ago; most old orders are done"""
+        if age > timedelta(days=30):
+            return self.rng.choices(['COMPLETED', 'DELIVERED'], weights=[9, 1])[0]
+        if age > timedelta(days=7):
+            return self.rng.choice(['PRODUCTION_COMPLETE', 'SHIPPED', 'DELIVERED'])
+        return self.rng.choices(['PLACED', 'MANUFACTURING'], weights=[2, 1])[0]
+
+    def _orders(self, count, boxes, customer_count, start):
+        started = time.perf_counter()
+        rng = self.rng
+        customers = [
+            f"{rng.choice(CUSTOMER_PREFIXES)} {rng.choice(CUSTOMER_SUFFIXES)} {index + 1}"
+            for index in range(customer_count)
+        ]
+        # A few customers place most of the orders
+        weights = [1 / (rank + 1) for rank in range(customer_count)]
+        span = self.end - start
+        # Each template is quoted at its own margin, so a costing serves every order of that quantity
+        margins = {box.pk: rng.choice(PROFIT_MARGINS) for box in boxes}
+        costings = {}
+
+        for offset in range(0, count, self.batch_size):
+            orders = []
+            for index in range(offset, min(offset + self.batch_size, count)):
+                created = _spread(start, span, index, count, rng)
+                box = rng.choice(boxes)
+                orders.append(BoxOrder(
+                    customer_name=rng.choices(customers, weights=weights)[0],
+                    box_template=box,
+                    quantity=rng.choice(ORDER_QUANTITIES),
+                    profit_margin=margins[box.pk],
+                    status=self._status(self.end - created),
+                    created_at=created,
+                    updated_at=created,
+                ))
+            years = {}
+            for order in orders:
+                years.setdefault(order.created_at.year, []).append(order)
+            for year, placed in years.items():
+                for order, number in zip(placed, reserve_order_numbers(len(placed), year)):
+                    order.order_number = number
+
+            backdated = [
+                (BoxOrder, 'created_at'), (BoxOrder, 'updated_at'), (MaterialRequirement, 'computed_at'),
+            ]
+            with transaction.atomic(), _backdated(*backdated):
+                orders = BoxOrder.objects.bulk_create(orders)
+                materials, costs = [], []
+                for order in orders:
+                    key = (order.box_template.pk, order.quantity)
+                    if key not in costings:
+                        costing = cost_order(order.box_template, order.quantity, order.profit_margin)
+                        costings[key] = costing_records(costing)
+                    material, cost = costings[key]
+                    materials.append(
+                        MaterialRequirement(box_order=order, computed_at=order.created_at, **material)
+                    )
+                    costs.append(ManufacturingCost(box_order=order, **cost))
+                MaterialRequirement.objects.bulk_create(materials)
+                ManufacturingCost.objects.bulk_create(costs)
+        self._report(f"orders ({len(costings)} distinct costings)", count, started)
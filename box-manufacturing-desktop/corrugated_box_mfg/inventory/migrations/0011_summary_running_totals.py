@@ -0,0 +1,90 @@
+# Generated by Django 6.1.2 on 2026-10-17 19:18
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+# Transaction model, summary model and the fields shared by both that
+# identify a summary row.
+SUMMARY_KEYS = [
+    ('PaperReel', 'PaperReelSummary', ('gsm', 'bf', 'size')),
+    ('PastingGum', 'PastingGumSummary', ('gum_type', 'weight_per_bag')),
+    ('Ink', 'InkSummary', ('color', 'weight_per_can')),
+    ('StrappingRoll', 'StrappingRollSummary', ('roll_type', 'meters_per_roll')),
+    ('PinCoil', 'PinCoilSummary', ('coil_type',)),
+]
+
+
+def backfill_running_totals(apps, schema_editor):
+    for model_name, summary_name, keys in SUMMARY_KEYS:
+        model = apps.get_model('inventory', model_name)
+        summary_model = apps.get_model('inventory', summary_name)
+        groups = model.objects.values(*keys).annotate(
+            price_sum=Sum('price_per_kg'), entry_count=Count('id'),
+        ).order_by()
+        for group in groups:
+            summary_model.objects.filter(**{key: group[key] for key in keys}).update(
+                price_sum=group['price_sum'] or 0,
+                entry_count=group['entry_count'],
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0010_inksummary_paperreelsummary_pastinggumsummary_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inksummary',
+            name='entry_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='inksummary',
+            name='price_sum',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='paperreelsummary',
+            name='entry_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='paperreelsummary',
+            name='price_sum',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='pastinggumsummary',
+            name='entry_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='pastinggumsummary',
+            name='price_sum',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='pincoilsummary',
+            name='entry_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='pincoilsummary',
+            name='price_sum',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='strappingrollsummary',
+            name='entry_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='strappingrollsummary',
+            name='price_sum',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14),
+        ),
+        migrations.RunPython(backfill_running_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 6.1.2 on 2026-10-17 19:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0011_summary_running_totals'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ink',
+            index=models.Index(fields=['timestamp', 'id'], name='inventory_ink_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='paperreel',
+            index=models.Index(fields=['timestamp', 'id'], name='inventory_paperreel_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pastinggum',
+            index=models.Index(fields=['timestamp', 'id'], name='inventory_pastinggum_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pincoil',
+            index=models.Index(fields=['timestamp', 'id'], name='inventory_pincoil_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='strappingroll',
+            index=models.Index(fields=['timestamp', 'id'], name='inventory_strappingroll_ts_idx'),
+        ),
+    ]
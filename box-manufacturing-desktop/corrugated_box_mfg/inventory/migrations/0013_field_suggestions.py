@@ -0,0 +1,55 @@
+# Generated by Django 6.1.2 on 2026-10-17 19:29
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+# Item type shown on the add form, transaction model and suggestible fields
+SUGGESTION_FIELDS = [
+    ('Paper Reel', 'PaperReel', ('gsm', 'bf', 'size', 'company_name')),
+    ('Pasting Gum', 'PastingGum', ('gum_type', 'weight_per_bag', 'company_name')),
+    ('Ink', 'Ink', ('color', 'weight_per_can', 'company_name')),
+    ('Strapping Roll', 'StrappingRoll', ('roll_type', 'meters_per_roll', 'weight_per_roll', 'company_name')),
+    ('Pin Coil', 'PinCoil', ('coil_type', 'company_name')),
+]
+
+
+def backfill_suggestions(apps, schema_editor):
+    FieldSuggestion = apps.get_model('inventory', 'FieldSuggestion')
+    rows = []
+    for model_type, model_name, fields in SUGGESTION_FIELDS:
+        model = apps.get_model('inventory', model_name)
+        for field in fields:
+            for group in model.objects.values(field).annotate(uses=Count('id')).order_by():
+                if group[field] in (None, ''):
+                    continue
+                rows.append(FieldSuggestion(
+                    model_type=model_type, field=field,
+                    value=str(group[field])[:100], usage_count=group['uses'],
+                ))
+    FieldSuggestion.objects.bulk_create(rows, batch_size=500, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0012_transaction_timestamp_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FieldSuggestion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_type', models.CharField(max_length=50)),
+                ('field', models.CharField(max_length=50)),
+                ('value', models.CharField(max_length=100)),
+                ('usage_count', models.PositiveIntegerField(default=0)),
+                ('last_used', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('model_type', 'field', 'value'), name='unique_field_suggestion')],
+            },
+        ),
+        migrations.RunPython(backfill_suggestions, migrations.RunPython.noop),
+    ]
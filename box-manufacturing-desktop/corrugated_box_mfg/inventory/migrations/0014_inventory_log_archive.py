@@ -0,0 +1,47 @@
+# Generated by Django 6.1.2 on 2026-10-17 19:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0013_field_suggestions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedInventoryLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.IntegerField()),
+                ('item_type', models.CharField(max_length=50)),
+                ('item_id', models.IntegerField()),
+                ('action', models.CharField(choices=[('ADD', 'Added'), ('EDIT', 'Modified'), ('DELETE', 'Deleted')], max_length=10)),
+                ('details', models.TextField()),
+                ('timestamp', models.DateTimeField()),
+                ('user', models.CharField(default='System', max_length=100)),
+                ('archive_month', models.DateField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-timestamp'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='inventorylog',
+            index=models.Index(fields=['timestamp'], name='inventory_log_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedinventorylog',
+            index=models.Index(fields=['archive_month', 'timestamp'], name='inventory_archlog_month_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedinventorylog',
+            index=models.Index(fields=['item_type', 'item_id'], name='inventory_archlog_item_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedinventorylog',
+            index=models.Index(fields=['timestamp'], name='inventory_archlog_ts_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 6.1.2 on 2026-10-17 19:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0014_inventory_log_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockAlert',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('summary_type', models.CharField(max_length=50)),
+                ('summary_id', models.IntegerField()),
+                ('item', models.CharField(max_length=200)),
+                ('level', models.CharField(choices=[('LOW', 'Below minimum'), ('HIGH', 'Above maximum')], max_length=10)),
+                ('quantity', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('threshold', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('is_active', models.BooleanField(default=True)),
+                ('raised_at', models.DateTimeField(auto_now_add=True)),
+                ('resolved_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-raised_at'],
+                'indexes': [models.Index(fields=['is_active', 'raised_at'], name='inventory_alert_active_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('is_active', True)), fields=('summary_type', 'summary_id'), name='unique_active_stock_alert')],
+            },
+        ),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 6.1.2 on 2026-10-17 19:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+STOCK_FIELDS = {
+    'PaperReelSummary': 'total_weight',
+    'PastingGumSummary': 'total_bags',
+    'InkSummary': 'total_cans',
+    'StrappingRollSummary': 'total_rolls',
+    'PinCoilSummary': 'total_quantity',
+}
+
+
+def backfill_available(apps, schema_editor):
+    # Nothing is reserved yet, so everything on hand is available
+    for model_name, stock_field in STOCK_FIELDS.items():
+        apps.get_model('inventory', model_name).objects.update(available=models.F(stock_field))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finished_goods', '0008_ordernumbersequence'),
+        ('inventory', '0015_stock_alerts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inksummary',
+            name='available',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='inksummary',
+            name='reserved',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='paperreelsummary',
+            name='available',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='paperreelsummary',
+            name='reserved',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='pastinggumsummary',
+            name='available',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='pastinggumsummary',
+            name='reserved',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='pincoilsummary',
+            name='available',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='pincoilsummary',
+            name='reserved',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='strappingrollsummary',
+            name='available',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='strappingrollsummary',
+            name='reserved',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14),
+        ),
+        migrations.CreateModel(
+            name='StockReservation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('summary_type', models.CharField(max_length=50)),
+                ('summary_id', models.IntegerField()),
+                ('item', models.CharField(max_length=200)),
+                ('quantity', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('status', models.CharField(choices=[('RESERVED', 'Reserved'), ('CONSUMED', 'Consumed'), ('RELEASED', 'Released')], default='RESERVED', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reservations', to='finished_goods.boxorder')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['summary_type', 'summary_id', 'status'], name='inventory_reservation_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_available, migrations.RunPython.noop),
+    ]
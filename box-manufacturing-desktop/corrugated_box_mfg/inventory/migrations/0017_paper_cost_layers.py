@@ -0,0 +1,57 @@
+# Generated by Django 6.1.2 on 2026-10-17 19:42
+
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_layers(apps, schema_editor):
+    # Lay every summary row's reels end to end in receiving order
+    PaperReel = apps.get_model('inventory', 'PaperReel')
+    PaperReelSummary = apps.get_model('inventory', 'PaperReelSummary')
+    PaperCostLayer = apps.get_model('inventory', 'PaperCostLayer')
+    summaries = {(s.gsm, s.bf, s.size): s for s in PaperReelSummary.objects.all()}
+    totals = {}
+    layers = []
+    for reel in PaperReel.objects.order_by('id'):
+        summary = summaries.get((reel.gsm, reel.bf, reel.size))
+        if summary is None:
+            continue
+        weight = Decimal(str(reel.total_weight))
+        cost_per_kg = (Decimal(str(reel.total_price)) / weight).quantize(Decimal('0.0001')) if weight else Decimal('0')
+        weight_before, cost_before = totals.get(summary.pk, (Decimal('0'), Decimal('0')))
+        layers.append(PaperCostLayer(
+            summary=summary, reel=reel, weight=weight, cost_per_kg=cost_per_kg,
+            cum_weight_start=weight_before, cum_weight_end=weight_before + weight,
+            cum_cost_start=cost_before,
+        ))
+        totals[summary.pk] = (weight_before + weight, cost_before + weight * cost_per_kg)
+    PaperCostLayer.objects.bulk_create(layers, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0016_stock_reservations'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaperCostLayer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weight', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('cost_per_kg', models.DecimalField(decimal_places=4, max_digits=12)),
+                ('cum_weight_start', models.DecimalField(decimal_places=2, max_digits=16)),
+                ('cum_weight_end', models.DecimalField(decimal_places=2, max_digits=16)),
+                ('cum_cost_start', models.DecimalField(decimal_places=4, max_digits=18)),
+                ('reel', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='cost_layer', to='inventory.paperreel')),
+                ('summary', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cost_layers', to='inventory.paperreelsummary')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['summary', 'cum_weight_end'], name='inventory_costlayer_seek_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_layers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 6.1.2 on 2026-10-17 19:51
+
+from decimal import Decimal
+
+import django.utils.timezone
+from django.db import migrations, models
+
+# model -> (kind, key fields, stock quantity fields multiplied together)
+MOVEMENT_SOURCES = {
+    'PaperReel': ('PAPER_REEL', ('gsm', 'bf', 'size'), ('total_weight',)),
+    'PastingGum': ('PASTING_GUM', ('gum_type', 'weight_per_bag'), ('total_qty',)),
+    'Ink': ('INK', ('color', 'weight_per_can'), ('total_qty',)),
+    'StrappingRoll': ('STRAPPING_ROLL', ('roll_type', 'meters_per_roll'), ('total_qty',)),
+    'PinCoil': ('PIN_COIL', ('coil_type',), ('total_qty',)),
+}
+
+
+def item_key(item, keys):
+    parts = []
+    for field in keys:
+        value = getattr(item, field)
+        if isinstance(value, (float, Decimal)):
+            value = format(Decimal(str(value)).normalize(), 'f')
+        parts.append(str(value))
+    return '|'.join(parts)
+
+
+def backfill_receipts(apps, schema_editor):
+    # Every transaction still on file enters the ledger as a receipt at its own timestamp
+    StockMovement = apps.get_model('inventory', 'StockMovement')
+    for model_name, (kind, keys, quantity_fields) in MOVEMENT_SOURCES.items():
+        movements = []
+        for item in apps.get_model('inventory', model_name).objects.order_by('id').iterator(chunk_size=2000):
+            quantity = Decimal('1')
+            for field in quantity_fields:
+                quantity *= Decimal(str(getattr(item, field)))
+            unit_cost = Decimal(str(item.total_price)) / quantity if quantity else Decimal('0')
+            movements.append(StockMovement(
+                kind=kind,
+                item_key=item_key(item, keys),
+                company_name=item.company_name,
+                quantity=quantity,
+                unit_cost=unit_cost.quantize(Decimal('0.0001')),
+                direction='IN',
+                source='RECEIPT',
+                item_id=item.id,
+                timestamp=item.timestamp,
+            ))
+        StockMovement.objects.bulk_create(movements, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0017_paper_cost_layers'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockMovement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('PAPER_REEL', 'Paper Reel'), ('PASTING_GUM', 'Pasting Gum'), ('INK', 'Ink'), ('STRAPPING_ROLL', 'Strapping Roll'), ('PIN_COIL', 'Pin Coil')], max_length=20)),
+                ('item_key', models.CharField(max_length=200)),
+                ('company_name', models.CharField(max_length=100)),
+                ('quantity', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('unit_cost', models.DecimalField(decimal_places=4, max_digits=12)),
+                ('direction', models.CharField(choices=[('IN', 'In'), ('OUT', 'Out')], max_length=3)),
+                ('source', models.CharField(choices=[('RECEIPT', 'Receipt'), ('CORRECTION', 'Correction'), ('DELETION', 'Deletion')], max_length=20)),
+                ('item_id', models.IntegerField()),
+                ('timestamp', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'item_key', 'timestamp'], name='inventory_move_item_idx'), models.Index(fields=['company_name', 'timestamp'], name='inventory_move_company_idx'), models.Index(fields=['timestamp'], name='inventory_move_ts_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_receipts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 6.1.2 on 2026-10-17 19:54
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finished_goods', '0010_list_indexes'),
+        ('inventory', '0018_stock_movements'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='archivedinventorylog',
+            name='action',
+            field=models.CharField(choices=[('ADD', 'Added'), ('EDIT', 'Modified'), ('DELETE', 'Deleted'), ('ISSUE', 'Issued')], max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='inventorylog',
+            name='action',
+            field=models.CharField(choices=[('ADD', 'Added'), ('EDIT', 'Modified'), ('DELETE', 'Deleted'), ('ISSUE', 'Issued')], max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='stockmovement',
+            name='source',
+            field=models.CharField(choices=[('RECEIPT', 'Receipt'), ('CORRECTION', 'Correction'), ('DELETION', 'Deletion'), ('ISSUE', 'Issue')], max_length=20),
+        ),
+        migrations.CreateModel(
+            name='StockIssue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('PAPER_REEL', 'Paper Reel'), ('PASTING_GUM', 'Pasting Gum'), ('INK', 'Ink'), ('STRAPPING_ROLL', 'Strapping Roll'), ('PIN_COIL', 'Pin Coil')], max_length=20)),
+                ('item_key', models.CharField(max_length=200)),
+                ('summary_type', models.CharField(max_length=50)),
+                ('summary_id', models.IntegerField()),
+                ('quantity', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('unit_cost', models.DecimalField(decimal_places=4, max_digits=12)),
+                ('shift', models.CharField(blank=True, max_length=50)),
+                ('notes', models.TextField(blank=True)),
+                ('issued_by', models.CharField(default='System', max_length=100)),
+                ('timestamp', models.DateTimeField(default=django.utils.timezone.now)),
+                ('order', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='stock_issues', to='finished_goods.boxorder')),
+            ],
+            options={
+                'ordering': ['-timestamp'],
+                'indexes': [models.Index(fields=['summary_type', 'summary_id'], name='inventory_issue_summary_idx'), models.Index(fields=['timestamp'], name='inventory_issue_ts_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 6.1.2 on 2026-10-17 19:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0019_stock_issues'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ink',
+            index=models.Index(fields=['company_name', 'timestamp'], name='inventory_ink_co_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='paperreel',
+            index=models.Index(fields=['company_name', 'timestamp'], name='inventory_paperreel_co_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='paperreel',
+            index=models.Index(fields=['gsm', 'bf', 'timestamp'], name='inventory_paper_gsm_bf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pastinggum',
+            index=models.Index(fields=['company_name', 'timestamp'], name='inventory_pastinggum_co_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pincoil',
+            index=models.Index(fields=['company_name', 'timestamp'], name='inventory_pincoil_co_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='strappingroll',
+            index=models.Index(fields=['company_name', 'timestamp'], name='inventory_strappingroll_co_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 6.1.2 on 2026-10-17 20:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finished_goods', '0011_order_updated_at'),
+        ('inventory', '0020_api_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='stockreservation',
+            name='order',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reservations', to='finished_goods.boxorder'),
+        ),
+    ]
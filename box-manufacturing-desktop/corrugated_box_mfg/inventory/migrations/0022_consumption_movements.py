@@ -0,0 +1,64 @@
+# Generated by Django 6.1.2 on 2026-10-17 20:19
+
+from decimal import Decimal
+
+from django.db import migrations, models
+
+# summary model -> (kind, key fields, average price field)
+CONSUMPTION_SOURCES = {
+    'PaperReelSummary': ('PAPER_REEL', ('gsm', 'bf', 'size'), 'avg_price_per_kg'),
+    'PastingGumSummary': ('PASTING_GUM', ('gum_type', 'weight_per_bag'), 'avg_price_per_kg'),
+    'InkSummary': ('INK', ('color', 'weight_per_can'), 'avg_price_per_kg'),
+}
+
+
+def item_key(item, keys):
+    parts = []
+    for field in keys:
+        value = getattr(item, field)
+        if isinstance(value, (float, Decimal)):
+            value = format(Decimal(str(value)).normalize(), 'f')
+        parts.append(str(value))
+    return '|'.join(parts)
+
+
+def backfill_consumption(apps, schema_editor):
+    # Stock already consumed by orders leaves the ledger when it was consumed, at the row's average price
+    StockMovement = apps.get_model('inventory', 'StockMovement')
+    StockReservation = apps.get_model('inventory', 'StockReservation')
+    for summary_type, (kind, keys, price_field) in CONSUMPTION_SOURCES.items():
+        summaries = apps.get_model('inventory', summary_type).objects.in_bulk()
+        reservations = StockReservation.objects.filter(summary_type=summary_type, status='CONSUMED').order_by('id')
+        movements = []
+        for reservation in reservations.iterator(chunk_size=2000):
+            summary = summaries.get(reservation.summary_id)
+            if summary is None:
+                continue
+            movements.append(StockMovement(
+                kind=kind,
+                item_key=item_key(summary, keys),
+                company_name='',
+                quantity=reservation.quantity,
+                unit_cost=Decimal(str(getattr(summary, price_field))).quantize(Decimal('0.0001')),
+                direction='OUT',
+                source='CONSUMPTION',
+                item_id=reservation.id,
+                timestamp=reservation.updated_at,
+            ))
+        StockMovement.objects.bulk_create(movements, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0021_reservation_order_set_null'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='stockmovement',
+            name='source',
+            field=models.CharField(choices=[('RECEIPT', 'Receipt'), ('CORRECTION', 'Correction'), ('DELETION', 'Deletion'), ('ISSUE', 'Issue'), ('CONSUMPTION', 'Order consumption')], max_length=20),
+        ),
+        migrations.RunPython(backfill_consumption, migrations.RunPython.noop),
+    ]
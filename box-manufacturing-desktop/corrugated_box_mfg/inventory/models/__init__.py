@@ -1,21 +1,25 @@
 from .transaction_models import (
     BaseInventory, PaperReel, PastingGum, 
     Ink, StrappingRoll, PinCoil, 
-    InventoryLog, Preset
+    InventoryLog, ArchivedInventoryLog, Preset, FieldSuggestion, StockMovement,
+    StockIssue,
 )
 
 from .summary_models import (
     PaperReelSummary, PastingGumSummary,
-    InkSummary, StrappingRollSummary, PinCoilSummary
+    InkSummary, StrappingRollSummary, PinCoilSummary,
+    StockAlert, StockReservation, PaperCostLayer
 )
 
 __all__ = [
     # Transaction Models
     'BaseInventory', 'PaperReel', 'PastingGum', 
     'Ink', 'StrappingRoll', 'PinCoil',
-    'InventoryLog', 'Preset',
+    'InventoryLog', 'ArchivedInventoryLog', 'Preset', 'FieldSuggestion', 'StockMovement',
+    'StockIssue',
     
     # Summary Models
     'PaperReelSummary', 'PastingGumSummary',
-    'InkSummary', 'StrappingRollSummary', 'PinCoilSummary'
+    'InkSummary', 'StrappingRollSummary', 'PinCoilSummary',
+    'StockAlert', 'StockReservation', 'PaperCostLayer'
 ]
\ No newline at end of file
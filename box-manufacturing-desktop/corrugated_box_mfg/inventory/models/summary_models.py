@@ -8,8 +8,12 @@ class PaperReelSummary(models.Model):
     total_weight = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     total_rolls = models.PositiveIntegerField(default=0)
     avg_price_per_kg = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    price_sum = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    entry_count = models.PositiveIntegerField(default=0)
     min_stock_alert = models.DecimalField(max_digits=10, decimal_places=2, default=1000)
     max_stock_alert = models.DecimalField(max_digits=10, decimal_places=2, default=10000)
+    reserved = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    available = models.DecimalField(max_digits=14, decimal_places=2, default=0)  # on hand - reserved
     last_updated = models.DateTimeField(auto_now=True)
 
     class Meta:
@@ -22,8 +26,12 @@ class PastingGumSummary(models.Model):
     total_bags = models.PositiveIntegerField(default=0)
     total_weight = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     avg_price_per_kg = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    price_sum = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    entry_count = models.PositiveIntegerField(default=0)
     min_stock_alert = models.PositiveIntegerField(default=10)
     max_stock_alert = models.PositiveIntegerField(default=100)
+    reserved = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    available = models.DecimalField(max_digits=14, decimal_places=2, default=0)  # on hand - reserved
     last_updated = models.DateTimeField(auto_now=True)
 
     class Meta:
@@ -36,8 +44,12 @@ class InkSummary(models.Model):
     total_cans = models.PositiveIntegerField(default=0)
     total_weight = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     avg_price_per_kg = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    price_sum = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    entry_count = models.PositiveIntegerField(default=0)
     min_stock_alert = models.PositiveIntegerField(default=5)
     max_stock_alert = models.PositiveIntegerField(default=50)
+    reserved = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    available = models.DecimalField(max_digits=14, decimal_places=2, default=0)  # on hand - reserved
     last_updated = models.DateTimeField(auto_now=True)
 
     class Meta:
@@ -51,8 +63,12 @@ class StrappingRollSummary(models.Model):
     total_rolls = models.PositiveIntegerField(default=0)
     total_meters = models.PositiveIntegerField(default=0)
     avg_price_per_roll = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    price_sum = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    entry_count = models.PositiveIntegerField(default=0)
     min_stock_alert = models.PositiveIntegerField(default=10)
     max_stock_alert = models.PositiveIntegerField(default=100)
+    reserved = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    available = models.DecimalField(max_digits=14, decimal_places=2, default=0)  # on hand - reserved
     last_updated = models.DateTimeField(auto_now=True)
 
     class Meta:
@@ -63,8 +79,12 @@ class PinCoilSummary(models.Model):
     coil_type = models.CharField(max_length=100)
     total_quantity = models.PositiveIntegerField(default=0)
     avg_price_per_unit = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    price_sum = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    entry_count = models.PositiveIntegerField(default=0)
     min_stock_alert = models.PositiveIntegerField(default=100)
     max_stock_alert = models.PositiveIntegerField(default=1000)
+    reserved = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    available = models.DecimalField(max_digits=14, decimal_places=2, default=0)  # on hand - reserved
     last_updated = models.DateTimeField(auto_now=True)
 
     class Meta:
@@ -72,4 +92,100 @@ class PinCoilSummary(models.Model):
         verbose_name_plural = "Pin Coil Summaries"
 
     def __str__(self):
-        return f"{self.coil_type} - {self.total_quantity} units"
\ No newline at end of file
+        return f"{self.coil_type} - {self.total_quantity} units"
+
+class StockAlert(models.Model):
+    """One spell of a summary row's stock sitting outside its alert thresholds.
+
+    Raised when stock leaves the min/max range and resolved when it returns,
+    so the table is the history of OK -> LOW/HIGH -> OK transitions. Only
+    one alert per summary row can be active at a time.
+    """
+    LEVEL_CHOICES = [
+        ('LOW', 'Below minimum'),
+        ('HIGH', 'Above maximum'),
+    ]
+
+    summary_type = models.CharField(max_length=50)  # summary model name, e.g. 'PaperReelSummary'
+    summary_id = models.IntegerField()
+    item = models.CharField(max_length=200)
+    level = models.CharField(max_length=10, choices=LEVEL_CHOICES)
+    quantity = models.DecimalField(max_digits=14, decimal_places=2)
+    threshold = models.DecimalField(max_digits=14, decimal_places=2)
+    is_active = models.BooleanField(default=True)
+    raised_at = models.DateTimeField(auto_now_add=True)
+    resolved_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-raised_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['summary_type', 'summary_id'], condition=models.Q(is_active=True),
+                name='unique_active_stock_alert',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['is_active', 'raised_at'], name='inventory_alert_active_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_level_display()}: {self.item} ({self.quantity} vs {self.threshold})"
+
+class StockReservation(models.Model):
+    """Stock of one summary row set aside for, or used by, an order.
+
+    ``quantity`` is in the unit of the summary's stock field: kg of paper,
+    bags of gum, cans of ink. While ``RESERVED`` it is counted in the row's
+    ``reserved`` figure; once ``CONSUMED`` it has been taken off the stock.
+    """
+    STATUS_CHOICES = [
+        ('RESERVED', 'Reserved'),
+        ('CONSUMED', 'Consumed'),
+        ('RELEASED', 'Released'),
+    ]
+
+    # Consumed stock stays consumed when its order is deleted, so the row outlives the order
+    order = models.ForeignKey(
+        'finished_goods.BoxOrder', on_delete=models.SET_NULL, null=True, blank=True, related_name='reservations',
+    )
+    summary_type = models.CharField(max_length=50)  # summary model name, e.g. 'PaperReelSummary'
+    summary_id = models.IntegerField()
+    item = models.CharField(max_length=200)
+    quantity = models.DecimalField(max_digits=14, decimal_places=2)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='RESERVED')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['summary_type', 'summary_id', 'status'], name='inventory_reservation_idx'),
+        ]
+
+    def __str__(self):
+        order = self.order or 'a deleted order'
+        return f"{self.item}: {self.quantity} {self.get_status_display().lower()} for {order}"
+
+class PaperCostLayer(models.Model):
+    """One paper reel's receipt as a FIFO cost layer of its summary row.
+
+    Layers of a summary row are laid end to end in receiving order:
+    ``cum_weight_start``/``cum_weight_end`` are the running kg totals either
+    side of this reel, and ``cum_cost_start`` is the landed cost of every kg
+    received before it. The cost of any kg range is then a difference of two
+    prefix costs, each found with one seek on ``(summary, cum_weight_end)``.
+    """
+    summary = models.ForeignKey(PaperReelSummary, on_delete=models.CASCADE, related_name='cost_layers')
+    reel = models.OneToOneField('inventory.PaperReel', on_delete=models.CASCADE, related_name='cost_layer')
+    weight = models.DecimalField(max_digits=10, decimal_places=2)
+    cost_per_kg = models.DecimalField(max_digits=12, decimal_places=4)  # landed: price, freight, charges and tax
+    cum_weight_start = models.DecimalField(max_digits=16, decimal_places=2)
+    cum_weight_end = models.DecimalField(max_digits=16, decimal_places=2)
+    cum_cost_start = models.DecimalField(max_digits=18, decimal_places=4)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['summary', 'cum_weight_end'], name='inventory_costlayer_seek_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.summary_id}: {self.weight} kg @ {self.cost_per_kg}/kg"
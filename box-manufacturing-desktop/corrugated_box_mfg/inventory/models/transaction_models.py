@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 
 class Preset(models.Model):
@@ -17,6 +18,22 @@ class Preset(models.Model):
     def __str__(self):
         return f"{self.get_category_display()}: {self.value}"
 
+class FieldSuggestion(models.Model):
+    """Distinct value seen in an inventory form field, with how often it's used"""
+    model_type = models.CharField(max_length=50)  # e.g. 'Paper Reel'
+    field = models.CharField(max_length=50)
+    value = models.CharField(max_length=100)
+    usage_count = models.PositiveIntegerField(default=0)
+    last_used = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['model_type', 'field', 'value'], name='unique_field_suggestion'),
+        ]
+
+    def __str__(self):
+        return f"{self.model_type}.{self.field}: {self.value} ({self.usage_count})"
+
 class BaseInventory(models.Model):
     company_name = models.CharField(max_length=100)
     price_per_kg = models.DecimalField(max_digits=10, decimal_places=2)
@@ -30,8 +47,19 @@ class BaseInventory(models.Model):
 
     class Meta:
         abstract = True
+        indexes = [
+            # Keyset pagination of the transaction history
+            models.Index(fields=['timestamp', 'id'], name='%(app_label)s_%(class)s_ts_idx'),
+            # Supplier history, e.g. the API's ?company= filter
+            models.Index(fields=['company_name', 'timestamp'], name='%(app_label)s_%(class)s_co_idx'),
+        ]
 
     def save(self, *args, **kwargs):
+        self.calculate_totals()
+        super().save(*args, **kwargs)
+
+    def calculate_totals(self):
+        """Fill in the derived price fields; also used before bulk_create, which skips save()"""
         # Calculate total price ex tax
         if hasattr(self, 'total_weight'):
             quantity = float(self.total_weight)
@@ -47,8 +75,6 @@ class BaseInventory(models.Model):
         
         # Calculate total price
         self.total_price = float(self.total_price_ex_tax) + float(self.tax_amount)
-        
-        super().save(*args, **kwargs)
 
 class PaperReel(BaseInventory):
     gsm = models.PositiveIntegerField()
@@ -56,6 +82,11 @@ class PaperReel(BaseInventory):
     size = models.CharField(max_length=50)
     total_weight = models.DecimalField(max_digits=10, decimal_places=2)
 
+    class Meta(BaseInventory.Meta):
+        indexes = BaseInventory.Meta.indexes + [
+            models.Index(fields=['gsm', 'bf', 'timestamp'], name='inventory_paper_gsm_bf_idx'),
+        ]
+
 class PastingGum(BaseInventory):
     gum_type = models.CharField(max_length=50)
     weight_per_bag = models.DecimalField(max_digits=10, decimal_places=2)
@@ -80,7 +111,8 @@ class InventoryLog(models.Model):
     ACTION_CHOICES = [
         ('ADD', 'Added'),
         ('EDIT', 'Modified'),
-        ('DELETE', 'Deleted')
+        ('DELETE', 'Deleted'),
+        ('ISSUE', 'Issued'),
     ]
     
     item_type = models.CharField(max_length=50)
@@ -91,4 +123,115 @@ class InventoryLog(models.Model):
     user = models.CharField(max_length=100, default='System')  # Can be linked to Django User model later
 
     class Meta:
-        ordering = ['-timestamp']
\ No newline at end of file
+        ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['timestamp'], name='inventory_log_ts_idx'),
+        ]
+
+class StockMovement(models.Model):
+    """One receipt, correction or removal of stock, across every material.
+
+    Written alongside each inventory transaction and never updated, so
+    cross-material questions ("everything from supplier X last month", "all
+    movements today") read this one table instead of five. ``item_key`` is
+    the summary row the stock belongs to, e.g. ``180|18|42`` for paper
+    (gsm|bf|size); ``quantity`` is in that row's stock unit (kg of paper,
+    bags of gum, cans of ink, rolls of strapping, pin coils) and
+    ``unit_cost`` is the landed cost per unit.
+    """
+    KIND_CHOICES = [
+        ('PAPER_REEL', 'Paper Reel'),
+        ('PASTING_GUM', 'Pasting Gum'),
+        ('INK', 'Ink'),
+        ('STRAPPING_ROLL', 'Strapping Roll'),
+        ('PIN_COIL', 'Pin Coil'),
+    ]
+    DIRECTION_CHOICES = [
+        ('IN', 'In'),
+        ('OUT', 'Out'),
+    ]
+    SOURCE_CHOICES = [
+        ('RECEIPT', 'Receipt'),
+        ('CORRECTION', 'Correction'),
+        ('DELETION', 'Deletion'),
+        ('ISSUE', 'Issue'),
+        ('CONSUMPTION', 'Order consumption'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    item_key = models.CharField(max_length=200)
+    company_name = models.CharField(max_length=100)
+    quantity = models.DecimalField(max_digits=14, decimal_places=2)
+    unit_cost = models.DecimalField(max_digits=12, decimal_places=4)
+    direction = models.CharField(max_length=3, choices=DIRECTION_CHOICES)
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    # The transaction row: a purchase, a StockIssue or, for consumption, a StockReservation
+    item_id = models.IntegerField()
+    timestamp = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['kind', 'item_key', 'timestamp'], name='inventory_move_item_idx'),
+            models.Index(fields=['company_name', 'timestamp'], name='inventory_move_company_idx'),
+            models.Index(fields=['timestamp'], name='inventory_move_ts_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_direction_display()} {self.quantity} {self.get_kind_display()} {self.item_key} ({self.get_source_display()})"
+
+class StockIssue(models.Model):
+    """Stock of one summary row issued to the floor, for an order or a production shift.
+
+    Issues only ever take stock off the summary row; purchase history, price
+    averages and cost layers are left alone. ``quantity`` is in the row's
+    stock unit and ``unit_cost`` is what it was issued at: the FIFO landed
+    cost for paper, the row's average price otherwise.
+    """
+    kind = models.CharField(max_length=20, choices=StockMovement.KIND_CHOICES)
+    item_key = models.CharField(max_length=200)
+    summary_type = models.CharField(max_length=50)  # summary model name, e.g. 'PaperReelSummary'
+    summary_id = models.IntegerField()
+    quantity = models.DecimalField(max_digits=14, decimal_places=2)
+    unit_cost = models.DecimalField(max_digits=12, decimal_places=4)
+    order = models.ForeignKey(
+        'finished_goods.BoxOrder', on_delete=models.SET_NULL, null=True, blank=True, related_name='stock_issues',
+    )
+    shift = models.CharField(max_length=50, blank=True)
+    notes = models.TextField(blank=True)
+    issued_by = models.CharField(max_length=100, default='System')
+    timestamp = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['summary_type', 'summary_id'], name='inventory_issue_summary_idx'),
+            models.Index(fields=['timestamp'], name='inventory_issue_ts_idx'),
+        ]
+
+    def __str__(self):
+        target = f"order #{self.order_id}" if self.order_id else (self.shift or 'floor')
+        return f"{self.quantity} {self.get_kind_display()} {self.item_key} to {target}"
+
+class ArchivedInventoryLog(models.Model):
+    """InventoryLog entry moved out of the hot table by ``archive_inventory_logs``"""
+    original_id = models.IntegerField()
+    item_type = models.CharField(max_length=50)
+    item_id = models.IntegerField()
+    action = models.CharField(max_length=10, choices=InventoryLog.ACTION_CHOICES)
+    details = models.TextField()
+    timestamp = models.DateTimeField()
+    user = models.CharField(max_length=100, default='System')
+    # First day of the month the entry was logged in; archives are grouped by it
+    archive_month = models.DateField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['archive_month', 'timestamp'], name='inventory_archlog_month_idx'),
+            models.Index(fields=['item_type', 'item_id'], name='inventory_archlog_item_idx'),
+            models.Index(fields=['timestamp'], name='inventory_archlog_ts_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_action_display()} {self.item_type} #{self.item_id} ({self.timestamp:%Y-%m-%d})"
\ No newline at end of file
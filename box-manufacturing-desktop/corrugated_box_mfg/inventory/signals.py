@@ -0,0 +1,57 @@
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+
+from finished_goods.models import BoxOrder
+from finished_goods.reservations import release_order
+from .dashboard import invalidate_dashboard
+from .alerts import evaluate_alerts
+from .availability import invalidate_paper_availability
+from .models import (
+    PaperReel, PastingGum, Ink, StrappingRoll, PinCoil, InventoryLog, Preset,
+    PaperReelSummary, PastingGumSummary, InkSummary, StrappingRollSummary, PinCoilSummary,
+)
+from .summaries import summary_changed
+from .suggestions import invalidate_presets
+
+
+@receiver(summary_changed)
+def summary_changed_handler(sender, lookup=None, **kwargs):
+    invalidate_dashboard()
+    evaluate_alerts(sender, lookup)
+    if sender is PaperReelSummary:
+        invalidate_paper_availability(lookup)
+
+
+@receiver(post_save, sender=PaperReelSummary)
+@receiver(post_save, sender=PastingGumSummary)
+@receiver(post_save, sender=InkSummary)
+@receiver(post_save, sender=StrappingRollSummary)
+@receiver(post_save, sender=PinCoilSummary)
+def summary_saved_handler(sender, instance, **kwargs):
+    # Saving a summary directly, e.g. editing its thresholds in the admin
+    evaluate_alerts(sender, {'pk': instance.pk})
+
+
+@receiver(post_save, sender=PaperReel)
+@receiver(post_save, sender=PastingGum)
+@receiver(post_save, sender=Ink)
+@receiver(post_save, sender=StrappingRoll)
+@receiver(post_save, sender=PinCoil)
+@receiver(post_save, sender=InventoryLog)
+@receiver(post_save, sender=BoxOrder)
+@receiver(post_delete, sender=BoxOrder)
+def inventory_write_handler(sender, **kwargs):
+    invalidate_dashboard()
+
+
+@receiver(pre_delete, sender=BoxOrder)
+def order_deleted_handler(sender, instance, **kwargs):
+    # Hand back what the order still holds. Consumed rows stay in the ledger
+    # (their order is set to NULL), so the stock they took stays taken.
+    release_order(instance)
+
+
+@receiver(post_save, sender=Preset)
+@receiver(post_delete, sender=Preset)
+def preset_write_handler(sender, instance, **kwargs):
+    invalidate_presets(instance.category)
@@ -0,0 +1,154 @@
+"""
+Typeahead suggestions for the inventory forms.
+
+Every distinct value typed into a suggestible field is kept in
+``FieldSuggestion`` with a usage count, updated alongside the summary tables
+whenever inventory is added, edited or deleted. Lookups never touch the
+transaction tables: the values for one (model, field) are loaded once into
+the cache, sorted by usage, and ranked in Python with prefix matches ahead of
+substring matches.
+"""
+from collections import Counter
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DecimalField, F
+from django.db.models.functions import Greatest
+
+from .models import PaperReel, PastingGum, Ink, StrappingRoll, PinCoil, FieldSuggestion, Preset
+
+# Form fields offered as suggestions, keyed by the item type the form sends
+SUGGESTION_FIELDS = {
+    'Paper Reel': (PaperReel, ('gsm', 'bf', 'size', 'company_name')),
+    'Pasting Gum': (PastingGum, ('gum_type', 'weight_per_bag', 'company_name')),
+    'Ink': (Ink, ('color', 'weight_per_can', 'company_name')),
+    'Strapping Roll': (StrappingRoll, ('roll_type', 'meters_per_roll', 'weight_per_roll', 'company_name')),
+    'Pin Coil': (PinCoil, ('coil_type', 'company_name')),
+}
+MODEL_TYPES = {model: model_type for model_type, (model, _) in SUGGESTION_FIELDS.items()}
+
+MAX_SUGGESTIONS = 10
+SUGGESTION_CACHE_TIMEOUT = 60 * 60
+
+
+def _cache_key(model_type, field):
+    return f"suggestions:{model_type}:{field}".replace(' ', '_')
+
+
+def _preset_cache_key(category):
+    return f"presets:{category}"
+
+
+def display_value(model, field, value):
+    """String form of ``value`` as it reads back from the database"""
+    model_field = model._meta.get_field(field)
+    if isinstance(model_field, DecimalField):
+        value = Decimal(str(value)).quantize(Decimal(1).scaleb(-model_field.decimal_places))
+    return str(value)
+
+
+def record_suggestions(instances, sign=1):
+    """Add (or with ``sign=-1`` remove) one use of each field value in ``instances``"""
+    counts = Counter()
+    for instance in instances:
+        model_type = MODEL_TYPES.get(type(instance))
+        if model_type is None:
+            continue
+        for field in SUGGESTION_FIELDS[model_type][1]:
+            value = getattr(instance, field)
+            if value in (None, ''):
+                continue
+            counts[(model_type, field, display_value(type(instance), field, value))] += sign
+    if not counts:
+        return
+
+    with transaction.atomic():
+        for (model_type, field, value), delta in counts.items():
+            lookup = {'model_type': model_type, 'field': field, 'value': value[:100]}
+            updated = FieldSuggestion.objects.filter(**lookup).update(
+                usage_count=Greatest(F('usage_count') + delta, 0),
+            )
+            if updated or delta <= 0:
+                continue
+            try:
+                with transaction.atomic():
+                    FieldSuggestion.objects.create(usage_count=delta, **lookup)
+            except IntegrityError:
+                # Another writer created the row first
+                FieldSuggestion.objects.filter(**lookup).update(usage_count=F('usage_count') + delta)
+
+    touched = {(model_type, field) for model_type, field, _ in counts}
+    transaction.on_commit(lambda: cache.delete_many([_cache_key(*key) for key in touched]))
+
+
+def rebuild_suggestions():
+    """Recompute every suggestion from the transaction tables"""
+    rows = []
+    for model_type, (model, fields) in SUGGESTION_FIELDS.items():
+        for field in fields:
+            for group in model.objects.values(field).annotate(uses=Count('id')).order_by():
+                if group[field] in (None, ''):
+                    continue
+                rows.append(FieldSuggestion(
+                    model_type=model_type, field=field,
+                    value=display_value(model, field, group[field])[:100],
+                    usage_count=group['uses'],
+                ))
+    with transaction.atomic():
+        FieldSuggestion.objects.all().delete()
+        FieldSuggestion.objects.bulk_create(rows, batch_size=500, ignore_conflicts=True)
+    invalidate_suggestions()
+    return len(rows)
+
+
+def invalidate_suggestions():
+    """Drop every cached suggestion list"""
+    cache.delete_many([
+        _cache_key(model_type, field)
+        for model_type, (_, fields) in SUGGESTION_FIELDS.items() for field in fields
+    ])
+
+
+def get_suggestion_index(model_type, field):
+    """``[(value, lowercase value)]`` for one field, most used first"""
+    key = _cache_key(model_type, field)
+    index = cache.get(key)
+    if index is None:
+        values = FieldSuggestion.objects.filter(
+            model_type=model_type, field=field, usage_count__gt=0,
+        ).order_by('-usage_count', 'value').values_list('value', flat=True)
+        index = [(value, value.lower()) for value in values]
+        cache.set(key, index, SUGGESTION_CACHE_TIMEOUT)
+    return index
+
+
+def suggest(model_type, field, query, limit=MAX_SUGGESTIONS):
+    """Values matching ``query``: prefix matches first, then substring matches"""
+    if model_type not in SUGGESTION_FIELDS or field not in SUGGESTION_FIELDS[model_type][1]:
+        return []
+    query = query.strip().lower()
+    if not query:
+        return []
+    prefix, substring = [], []
+    for value, lowered in get_suggestion_index(model_type, field):
+        if lowered.startswith(query):
+            prefix.append(value)
+            if len(prefix) == limit:
+                break
+        elif len(substring) < limit and query in lowered:
+            substring.append(value)
+    return (prefix + substring)[:limit]
+
+
+def get_preset_values(category):
+    key = _preset_cache_key(category)
+    values = cache.get(key)
+    if values is None:
+        values = list(Preset.objects.filter(category=category).values_list('value', flat=True))
+        cache.set(key, values, SUGGESTION_CACHE_TIMEOUT)
+    return values
+
+
+def invalidate_presets(category):
+    transaction.on_commit(lambda: cache.delete(_preset_cache_key(category)))
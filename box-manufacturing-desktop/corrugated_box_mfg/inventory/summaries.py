@@ -0,0 +1,482 @@
+"""
+Incremental maintenance of the inventory summary tables.
+
+Every summary row keeps running totals (quantities, ``price_sum`` and
+``entry_count``) so a transaction can be folded into it with a single
+``UPDATE ... SET col = col + delta`` instead of re-aggregating the whole
+purchase history. ``rebuild_summaries`` recomputes the same totals from the
+transaction tables and is used by the management command of the same name.
+
+Each row also carries ``reserved``, the stock held for orders, and
+``available``, stock on hand minus ``reserved``. Both move in the same
+``UPDATE`` as the stock itself, so reading availability is a single row.
+
+Every transaction folded in also appends a ``StockMovement`` to the
+cross-material ledger.
+"""
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, DecimalField, F, Max, Sum, Value, When
+from django.db.models.functions import Greatest
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .cost_layers import rebuild_cost_layers, record_reels
+from .models import (
+    PaperReel, PastingGum, Ink, StrappingRoll, PinCoil,
+    PaperReelSummary, PastingGumSummary, InkSummary,
+    StrappingRollSummary, PinCoilSummary, StockReservation, StockMovement, StockIssue,
+)
+
+ZERO = Decimal('0.00')
+
+# Sent after a summary row changes. Queryset updates bypass post_save, so
+# anything derived from the summaries listens here instead.
+summary_changed = Signal()
+
+
+def _coerce(summary_model, field, value):
+    """Match ``value`` to the python type of the summary field."""
+    if isinstance(summary_model._meta.get_field(field), DecimalField):
+        return Decimal(value)
+    return int(value)
+
+
+class SummarySpec:
+    """Describes how one transaction model rolls up into its summary model.
+
+    ``keys`` maps summary fields to the transaction fields identifying the
+    group, ``counters`` maps summary quantity fields to the transaction fields
+    whose product is added per row (an empty tuple counts rows), and
+    ``extra_defaults`` are copied from the transaction when a summary row is
+    first created. ``price_scale`` optionally multiplies the average price,
+    e.g. to turn a per-kg price into a per-roll price. ``stock_field`` is the
+    counter compared against the row's min/max stock alert thresholds.
+    ``kind`` is the material's ``StockMovement.kind``.
+    """
+
+    def __init__(self, model, summary_model, kind, keys, counters, avg_field, stock_field,
+                 extra_defaults=(), price_scale=None):
+        self.model = model
+        self.summary_model = summary_model
+        self.kind = kind
+        self.keys = keys
+        self.counters = counters
+        self.avg_field = avg_field
+        self.stock_field = stock_field
+        self.extra_defaults = extra_defaults
+        self.price_scale = price_scale
+
+    def group_key(self, instance):
+        return tuple(getattr(instance, source) for source in self.keys.values())
+
+    def lookup(self, key):
+        return dict(zip(self.keys, key))
+
+    def summary_lookup(self, summary):
+        return {field: getattr(summary, field) for field in self.keys}
+
+    def stock_counters(self):
+        """Counters that move with the stock field, as ``{field: summary fields it is multiplied by}``.
+
+        Taking n bags off a gum row takes n off ``total_bags`` and
+        n * ``weight_per_bag`` off ``total_weight``.
+        """
+        base = self.counters[self.stock_field]
+        fields_by_source = {source: field for field, source in self.keys.items()}
+        counters = {}
+        for field, sources in self.counters.items():
+            if field == self.stock_field:
+                counters[field] = ()
+            elif base and sources[:len(base)] == base:
+                counters[field] = tuple(fields_by_source[source] for source in sources[len(base):])
+        return counters
+
+    def counter_values(self, instance):
+        values = {}
+        for field, sources in self.counters.items():
+            value = Decimal('1')
+            for source in sources:
+                value *= Decimal(str(getattr(instance, source)))
+            values[field] = value
+        return values
+
+    def format_key(self, key):
+        """``StockMovement.item_key`` of a group key: joined with ``|``, numbers without trailing zeros"""
+        parts = []
+        for value in key:
+            if isinstance(value, (float, Decimal)):
+                value = format(Decimal(str(value)).normalize(), 'f')
+            parts.append(str(value))
+        return '|'.join(parts)
+
+    def movement(self, instance, direction, source):
+        """Ledger entry for ``instance`` moving in or out of stock"""
+        quantity = self.counter_values(instance)[self.stock_field]
+        unit_cost = Decimal(str(instance.total_price)) / quantity if quantity else ZERO
+        return StockMovement(
+            kind=self.kind,
+            item_key=self.format_key(self.group_key(instance)),
+            company_name=instance.company_name,
+            quantity=quantity,
+            unit_cost=unit_cost.quantize(Decimal('0.0001')),
+            direction=direction,
+            source=source,
+            item_id=instance.pk,
+        )
+
+
+SUMMARY_SPECS = {
+    PaperReel: SummarySpec(
+        PaperReel, PaperReelSummary, 'PAPER_REEL',
+        keys={'gsm': 'gsm', 'bf': 'bf', 'size': 'size'},
+        counters={'total_weight': ('total_weight',), 'total_rolls': ()},
+        avg_field='avg_price_per_kg',
+        stock_field='total_weight',
+    ),
+    PastingGum: SummarySpec(
+        PastingGum, PastingGumSummary, 'PASTING_GUM',
+        keys={'gum_type': 'gum_type', 'weight_per_bag': 'weight_per_bag'},
+        counters={'total_bags': ('total_qty',), 'total_weight': ('total_qty', 'weight_per_bag')},
+        avg_field='avg_price_per_kg',
+        stock_field='total_bags',
+    ),
+    Ink: SummarySpec(
+        Ink, InkSummary, 'INK',
+        keys={'color': 'color', 'weight_per_can': 'weight_per_can'},
+        counters={'total_cans': ('total_qty',), 'total_weight': ('total_qty', 'weight_per_can')},
+        avg_field='avg_price_per_kg',
+        stock_field='total_cans',
+    ),
+    StrappingRoll: SummarySpec(
+        StrappingRoll, StrappingRollSummary, 'STRAPPING_ROLL',
+        keys={'roll_type': 'roll_type', 'meters_per_roll': 'meters_per_roll'},
+        counters={'total_rolls': ('total_qty',), 'total_meters': ('total_qty', 'meters_per_roll')},
+        avg_field='avg_price_per_roll',
+        stock_field='total_rolls',
+        extra_defaults=('weight_per_roll',),
+        price_scale='weight_per_roll',
+    ),
+    PinCoil: SummarySpec(
+        PinCoil, PinCoilSummary, 'PIN_COIL',
+        keys={'coil_type': 'coil_type'},
+        counters={'total_quantity': ('total_qty',)},
+        avg_field='avg_price_per_unit',
+        stock_field='total_quantity',
+    ),
+}
+
+
+SUMMARY_MODEL_SPECS = {spec.summary_model: spec for spec in SUMMARY_SPECS.values()}
+
+
+def get_spec(model_or_instance):
+    model = model_or_instance if isinstance(model_or_instance, type) else type(model_or_instance)
+    return SUMMARY_SPECS.get(model)
+
+
+class SummaryDelta:
+    """Accumulated change to a single summary row."""
+
+    def __init__(self, spec, key, defaults=None):
+        self.spec = spec
+        self.key = key
+        self.defaults = defaults or {}
+        self.counters = {field: ZERO for field in spec.counters}
+        self.price_sum = ZERO
+        self.entry_count = 0
+
+    @classmethod
+    def from_instance(cls, instance, sign=1):
+        spec = get_spec(instance)
+        defaults = {field: getattr(instance, field) for field in spec.extra_defaults}
+        delta = cls(spec, spec.group_key(instance), defaults)
+        delta.add_instance(instance, sign)
+        return delta
+
+    def add_instance(self, instance, sign=1):
+        for field, value in self.spec.counter_values(instance).items():
+            self.counters[field] += value * sign
+        self.price_sum += Decimal(str(instance.price_per_kg)) * sign
+        self.entry_count += sign
+
+    def _average_expression(self):
+        new_count = F('entry_count') + self.entry_count
+        average = (F('price_sum') + self.price_sum) * Value(Decimal('1.0')) / new_count
+        if self.spec.price_scale:
+            average = average * F(self.spec.price_scale)
+        return Case(
+            When(entry_count__gt=-self.entry_count, then=average),
+            default=Value(ZERO),
+            output_field=DecimalField(max_digits=10, decimal_places=2),
+        )
+
+    def update_kwargs(self):
+        summary_model = self.spec.summary_model
+        kwargs = {
+            self.spec.avg_field: self._average_expression(),
+            'last_updated': timezone.now(),
+        }
+        totals = dict(self.counters, price_sum=self.price_sum, entry_count=self.entry_count)
+        for field, value in totals.items():
+            value = _coerce(summary_model, field, value)
+            kwargs[field] = Greatest(
+                F(field) + value, Value(type(value)(0)),
+                output_field=summary_model._meta.get_field(field),
+            )
+        kwargs['available'] = kwargs[self.spec.stock_field] - F('reserved')
+        return kwargs
+
+    def create_kwargs(self):
+        summary_model = self.spec.summary_model
+        kwargs = dict(self.spec.lookup(self.key), **self.defaults)
+        totals = dict(self.counters, price_sum=self.price_sum, entry_count=self.entry_count)
+        for field, value in totals.items():
+            kwargs[field] = _coerce(summary_model, field, max(value, 0))
+        average = ZERO
+        if kwargs['entry_count'] > 0:
+            average = kwargs['price_sum'] / kwargs['entry_count']
+            if self.spec.price_scale:
+                average *= Decimal(str(self.defaults[self.spec.price_scale]))
+        kwargs[self.spec.avg_field] = average.quantize(Decimal('0.01'))
+        kwargs['available'] = Decimal(kwargs[self.spec.stock_field])
+        return kwargs
+
+    def apply(self):
+        """Fold the delta into its summary row, creating the row if needed."""
+        summary_model = self.spec.summary_model
+        lookup = self.spec.lookup(self.key)
+        with transaction.atomic():
+            if not summary_model.objects.filter(**lookup).update(**self.update_kwargs()):
+                try:
+                    with transaction.atomic():
+                        summary_model.objects.create(**self.create_kwargs())
+                except IntegrityError:
+                    # Another writer created the row first; fold into theirs.
+                    summary_model.objects.filter(**lookup).update(**self.update_kwargs())
+        summary_changed.send(sender=summary_model, lookup=lookup)
+
+
+def record_movements(instances, action='add', source=None):
+    """Append the ledger entries for transactions added or removed.
+
+    ``source`` defaults to ``RECEIPT`` for additions and ``DELETION`` for
+    removals; an edit records both halves as ``CORRECTION``.
+    """
+    direction = 'OUT' if action == 'delete' else 'IN'
+    source = source or ('DELETION' if action == 'delete' else 'RECEIPT')
+    movements = []
+    for instance in instances:
+        spec = get_spec(instance)
+        if spec is not None:
+            movements.append(spec.movement(instance, direction, source))
+    StockMovement.objects.bulk_create(movements, batch_size=500)
+
+
+def update_summary_tables(instance, action='add', source=None):
+    """Update summary tables when transactions occur"""
+    if get_spec(instance) is None:
+        return
+    with transaction.atomic():
+        SummaryDelta.from_instance(instance, -1 if action == 'delete' else 1).apply()
+        record_movements([instance], action, source)
+        if isinstance(instance, PaperReel):
+            record_reels([instance], action)
+
+
+def update_summary_tables_bulk(instances, action='add', source=None):
+    """Apply many transactions at once with one UPDATE per summary row touched.
+
+    Returns the number of summary rows updated.
+    """
+    sign = -1 if action == 'delete' else 1
+    deltas = {}
+    for instance in instances:
+        spec = get_spec(instance)
+        if spec is None:
+            continue
+        key = (spec.model, spec.group_key(instance))
+        if key in deltas:
+            deltas[key].add_instance(instance, sign)
+        else:
+            deltas[key] = SummaryDelta.from_instance(instance, sign)
+    with transaction.atomic():
+        for delta in deltas.values():
+            delta.apply()
+        record_movements(instances, action, source)
+        record_reels([instance for instance in instances if isinstance(instance, PaperReel)], action)
+    return len(deltas)
+
+
+def adjust_stock(summary, reserved=0, consumed=0, require_available=False):
+    """Add ``reserved`` to a summary row's reservations and take ``consumed`` off its stock.
+
+    Quantities are in the unit of the row's stock field; negative values
+    release a reservation or put consumed stock back. ``available`` is
+    updated in the same statement. With ``require_available`` the row is
+    only changed if at least ``consumed`` is available, checked in that same
+    statement. Returns the number of rows changed (0 or 1).
+    """
+    summary_model = type(summary)
+    spec = SUMMARY_MODEL_SPECS[summary_model]
+    reserved, consumed = Decimal(str(reserved)), Decimal(str(consumed))
+    kwargs = {'last_updated': timezone.now()}
+    if consumed:
+        for field, multipliers in spec.stock_counters().items():
+            change = Value(_coerce(summary_model, field, consumed))
+            for multiplier in multipliers:
+                change = change * F(multiplier)
+            zero = _coerce(summary_model, field, 0)
+            kwargs[field] = Greatest(
+                F(field) - change, Value(zero),
+                output_field=summary_model._meta.get_field(field),
+            )
+    stock = kwargs.get(spec.stock_field, F(spec.stock_field))
+    kwargs['reserved'] = F('reserved') + reserved
+    kwargs['available'] = stock - F('reserved') - reserved
+    rows = summary_model.objects.filter(pk=summary.pk)
+    if require_available:
+        rows = rows.filter(available__gte=consumed)
+    changed = rows.update(**kwargs)
+    if changed:
+        summary_changed.send(sender=summary_model, lookup=spec.summary_lookup(summary))
+    return changed
+
+
+def clear_reservations():
+    """Zero ``reserved`` on every summary row, for when the reservation ledger is wiped"""
+    for spec in SUMMARY_SPECS.values():
+        summary_model = spec.summary_model
+        cleared = summary_model.objects.exclude(reserved=0).update(
+            reserved=0, available=F(spec.stock_field), last_updated=timezone.now(),
+        )
+        if cleared:
+            summary_changed.send(sender=summary_model, lookup=None)
+
+
+def _reservation_totals(summary_model):
+    """``{summary id: {'RESERVED': qty, 'CONSUMED': qty}}`` from the reservation ledger"""
+    totals = {}
+    rows = (
+        StockReservation.objects
+        .filter(summary_type=summary_model.__name__, status__in=['RESERVED', 'CONSUMED'])
+        .values('summary_id', 'status')
+        .annotate(quantity=Sum('quantity'))
+        .order_by()
+    )
+    for row in rows:
+        totals.setdefault(row['summary_id'], {})[row['status']] = row['quantity']
+    return totals
+
+
+def _issue_totals(summary_model):
+    """``{summary id: quantity issued}`` from the stock issues"""
+    rows = (
+        StockIssue.objects
+        .filter(summary_type=summary_model.__name__)
+        .values('summary_id')
+        .annotate(quantity=Sum('quantity'))
+        .order_by()
+    )
+    return {row['summary_id']: row['quantity'] for row in rows}
+
+
+def _apply_reservations(summary, spec, totals):
+    """Take consumed and issued stock off a rebuilt row and set its reserved/available figures"""
+    consumed = (totals.get('CONSUMED') or ZERO) + (totals.get('ISSUED') or ZERO)
+    if consumed:
+        for field, multipliers in spec.stock_counters().items():
+            change = consumed
+            for multiplier in multipliers:
+                change *= Decimal(str(getattr(summary, multiplier)))
+            value = max(Decimal(str(getattr(summary, field))) - change, ZERO)
+            setattr(summary, field, _coerce(spec.summary_model, field, value))
+    summary.reserved = totals.get('RESERVED') or ZERO
+    summary.available = Decimal(str(getattr(summary, spec.stock_field))) - summary.reserved
+
+
+def rebuild_summaries(models=None):
+    """Recompute every summary row from the transaction tables.
+
+    Summary rows whose group no longer has any transactions are zeroed rather
+    than deleted so their stock alert thresholds survive. Stock consumed by
+    orders or issued to the floor is taken off again and ``reserved``/``available`` are recomputed
+    from the reservation ledger, and paper cost layers are laid out again.
+    Returns a dict of ``{summary model name: rows written}``.
+    """
+    results = {}
+    for model, spec in SUMMARY_SPECS.items():
+        if models and model not in models:
+            continue
+        summary_model = spec.summary_model
+        annotations = {
+            'price_sum': Sum('price_per_kg'),
+            'entry_count': Count('id'),
+        }
+        for field, sources in spec.counters.items():
+            if not sources:
+                annotations[field] = Count('id')
+                continue
+            expression = F(sources[0])
+            for source in sources[1:]:
+                expression = expression * F(source)
+            annotations[field] = Sum(expression, output_field=DecimalField(max_digits=14, decimal_places=2))
+        for field in spec.extra_defaults:
+            annotations['default_' + field] = Max(field)
+
+        groups = spec.model.objects.values(*spec.keys.values()).annotate(**annotations).order_by()
+
+        with transaction.atomic():
+            existing = {
+                tuple(getattr(summary, field) for field in spec.keys): summary
+                for summary in summary_model.objects.select_for_update()
+            }
+            to_create, to_update = [], []
+            for group in groups:
+                key = tuple(group[source] for source in spec.keys.values())
+                delta = SummaryDelta(spec, key, {
+                    field: group['default_' + field] for field in spec.extra_defaults
+                })
+                delta.price_sum = Decimal(str(group['price_sum'] or 0))
+                delta.entry_count = group['entry_count']
+                for field in spec.counters:
+                    delta.counters[field] = Decimal(str(group[field] or 0))
+                values = delta.create_kwargs()
+                summary = existing.pop(key, None)
+                if summary is None:
+                    to_create.append(summary_model(**values))
+                    continue
+                for field, value in values.items():
+                    if field not in spec.keys and field not in spec.extra_defaults:
+                        setattr(summary, field, value)
+                to_update.append(summary)
+
+            now = timezone.now()
+            for summary in to_update:
+                summary.last_updated = now
+            for summary in existing.values():
+                summary.last_updated = now
+                summary.price_sum = ZERO
+                summary.entry_count = 0
+                setattr(summary, spec.avg_field, ZERO)
+                for field in spec.counters:
+                    setattr(summary, field, 0)
+                to_update.append(summary)
+            reservations = _reservation_totals(summary_model)
+            for summary_id, quantity in _issue_totals(summary_model).items():
+                reservations.setdefault(summary_id, {})['ISSUED'] = quantity
+            for summary in to_update:
+                _apply_reservations(summary, spec, reservations.get(summary.pk, {}))
+
+            fields = [
+                'price_sum', 'entry_count', spec.avg_field, 'last_updated', 'reserved', 'available',
+                *spec.counters,
+            ]
+            summary_model.objects.bulk_create(to_create, batch_size=500)
+            summary_model.objects.bulk_update(to_update, fields, batch_size=500)
+        results[summary_model.__name__] = len(to_create) + len(to_update)
+        summary_changed.send(sender=summary_model, lookup=None)
+    if not models or PaperReel in models:
+        rebuild_cost_layers()
+    return results
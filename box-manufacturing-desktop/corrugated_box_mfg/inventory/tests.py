@@ -1,3 +1,159 @@
+import importlib.util
+import io
+import json
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .exports import ExportError, export_queryset
+from .intake import IntakeError, validate_batch
+from .models import Ink, InkSummary, InventoryLog, PaperReel
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('tester', password='pw'))
+        day = timezone.make_aware(datetime(2024, 3, 10))
+        # First and last moment of 10 March, and the first of the 11th
+        for offset in (timedelta(0), timedelta(days=1, microseconds=-1), timedelta(days=1)):
+            log = InventoryLog.objects.create(action='ADD', item_type='Ink', item_id=1, details='')
+            InventoryLog.objects.filter(pk=log.pk).update(timestamp=day + offset)
+
+    def exported(self, since=None, until=None):
+        return len(export_queryset('inventory_logs', since, until))
+
+    def test_date_range_is_inclusive(self):
+        self.assertEqual(self.exported('2024-03-10', '2024-03-10'), 2)
+        self.assertEqual(self.exported(since='2024-03-11'), 1)
+        self.assertEqual(self.exported(until='2024-03-09'), 0)
+        with self.assertRaises(ExportError):
+            self.exported(since='2024-02-30')
+
+    def test_csv_download(self):
+        response = self.client.get(reverse('export_inventory', args=['inventory_logs']), {'until': '2024-03-10'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(b''.join(response.streaming_content).decode().splitlines()), 3)
+        response = self.client.get(reverse('export_inventory', args=['inventory_logs']), {'since': 'yesterday'})
+        self.assertEqual(response.status_code, 400)
+
+    @unittest.skipUnless(importlib.util.find_spec('openpyxl'), "openpyxl is not installed")
+    def test_xlsx_download(self):
+        from openpyxl import load_workbook
+
+        response = self.client.get(reverse('export_inventory_xlsx', args=['inventory_logs']), {'since': '2024-03-11'})
+        self.assertEqual(response.status_code, 200)
+        rows = list(load_workbook(io.BytesIO(b''.join(response.streaming_content))).active.values)
+        self.assertEqual(rows[0][0], 'id')
+        self.assertEqual(rows[1][5], datetime(2024, 3, 11))
+
+
+class IntakeTests(TestCase):
+    ink = {'item_type': 'Ink', 'company_name': 'Acme', 'color': 'Red', 'weight_per_can': '5', 'total_qty': '2'}
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('tester', password='pw'))
+
+    def errors(self, rows):
+        with self.assertRaises(IntakeError) as raised:
+            validate_batch(rows)
+        return [error['row'] for error in raised.exception.errors]
+
+    def test_rejects_non_finite_numbers(self):
+        rows = [
+            dict(self.ink, weight_per_can='NaN'),
+            dict(self.ink, price_per_kg='Infinity'),
+            dict(self.ink, total_qty='nan'),
+            self.ink,
+        ]
+        self.assertEqual(self.errors(rows), [1, 2, 3])
+
+    def test_rejects_rows_that_are_not_objects(self):
+        self.assertEqual(self.errors([1, 'Ink', self.ink]), [1, 2])
+        self.assertEqual(self.errors({'items': []}), [0])
+        response = self.client.post(
+            reverse('bulk_add_inventory'), json.dumps({'items': [None]}), content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_add_inventory_is_atomic(self):
+        with mock.patch('inventory.views.update_summary_tables', side_effect=RuntimeError("summary failed")):
+            self.client.post(reverse('add_inventory'), self.ink)
+        self.assertFalse(Ink.objects.exists())
+        self.assertFalse(InventoryLog.objects.exists())
+        self.client.post(reverse('add_inventory'), self.ink)
+        self.assertEqual(InkSummary.objects.get().total_cans, 2)
+
+
+class ApiTests(TestCase):
+    url = '/api/paper-reels/'
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('tester', password='pw'))
+        for gsm in ('120', '120', '150'):
+            self.add_reel(gsm)
+
+    def add_reel(self, gsm):
+        self.client.post(reverse('add_inventory'), {
+            'item_type': 'Paper Reel', 'company_name': 'Mill', 'gsm': gsm, 'bf': '18', 'size': '40',
+            'total_weight': '100', 'price_per_kg': '40',
+        })
+
+    def test_requires_login(self):
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_list_pages_and_filters(self):
+        response = self.client.get(self.url, {'page_size': 2})
+        self.assertEqual(len(response.json()['results']), 2)
+        rest = self.client.get(response.json()['next']).json()
+        self.assertEqual(len(rest['results']), 1)
+        self.assertIsNone(rest['next'])
+
+        self.assertEqual(len(self.client.get(self.url, {'gsm': 120}).json()['results']), 2)
+        today = timezone.now().date()
+        self.assertEqual(len(self.client.get(self.url, {'until': today - timedelta(days=1)}).json()['results']), 0)
+        for bad in ({'gsm': 'heavy'}, {'since': '2024-02-30'}):
+            with self.subTest(**bad):
+                self.assertEqual(self.client.get(self.url, bad).status_code, 400)
+
+    def test_sparse_fields(self):
+        rows = self.client.get(self.url, {'fields': 'id,gsm'}).json()['results']
+        self.assertEqual([set(row) for row in rows], [{'id', 'gsm'}] * 3)
+        self.assertEqual(self.client.get(self.url, {'fields': 'id,colour'}).status_code, 400)
+        reel = PaperReel.objects.first()
+        self.assertEqual(self.client.get(f'{self.url}{reel.pk}/', {'fields': 'gsm'}).json(), {'gsm': reel.gsm})
+
+    def test_conditional_get(self):
+        response = self.client.get(self.url)
+        etag = response['ETag']
+        unchanged = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(unchanged.status_code, 304)
+        self.assertEqual(unchanged['ETag'], etag)
+        # A different filter is a different resource
+        self.assertEqual(self.client.get(self.url, {'gsm': 120}, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        self.add_reel('150')
+        changed = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], etag)
+        self.assertEqual(len(changed.json()['results']), 4)
+
 
-# Create your tests here.
+class SeedSyntheticTests(TestCase):
+    def test_seeded_rows_are_suggested(self):
+        call_command(
+            'seed_synthetic', reels=20, gum=5, ink=5, strapping=5, pin_coils=5, boxes=0, orders=0,
+            stdout=io.StringIO(),
+        )
+        self.client.force_login(User.objects.create_user('tester', password='pw'))
+        company = PaperReel.objects.values_list('company_name', flat=True).first()
+        response = self.client.get(reverse('field-suggestions'), {
+            'model_type': 'Paper Reel', 'field': 'company_name', 'query': company[:3],
+        })
+        self.assertIn(company, response.json()['suggestions'])
@@ -5,9 +5,15 @@ from . import views
 urlpatterns = [
     path("", inventory_home, name="inventory_home"),  # ✅ Home page route
     path("add/", add_inventory, name="add_inventory"),
+    path("add/bulk/", views.bulk_add_inventory, name="bulk_add_inventory"),
+    path("issue/", views.issue_inventory, name="issue_inventory"),
     path("overview/", inventory_overview, name="inventory_overview"),
+    path("transactions/<str:model_name>/", views.transaction_page, name="transaction_page"),
+    path("export/<str:name>.csv", views.export_inventory, name="export_inventory"),
+    path("export/<str:name>.xlsx", views.export_inventory_xlsx, name="export_inventory_xlsx"),
     path("get-presets/", get_presets, name="get_presets"),
     path('delete/<str:model_name>/<int:item_id>/', views.delete_inventory, name='delete_inventory'),
     path('edit/<str:model_name>/<int:item_id>/', views.edit_inventory, name='edit_inventory'),
     path('suggestions/', views.get_field_suggestions, name='field-suggestions'),
+    path('alerts/', views.stock_alerts, name='stock_alerts'),
 ]
@@ -1,8 +1,10 @@
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import JsonResponse
+from django.http import FileResponse, JsonResponse, StreamingHttpResponse
+from django.utils.cache import patch_cache_control
 from django.contrib import messages
-from django.db.models import Sum, Avg, Q
 from django.contrib.auth.decorators import login_required
+from django.db import transaction
+from finished_goods.models import BoxOrder
 from .models import (
     # Transaction Models
     PaperReel, PastingGum, Ink, StrappingRoll, PinCoil,
@@ -12,23 +14,107 @@ from .models import (
     # Other Models
     Preset, InventoryLog
 )
+from .summaries import update_summary_tables
+from .suggestions import get_preset_values, record_suggestions, suggest
+from .intake import IntakeError, intake_batch, read_rows
+from .pagination import InvalidCursor, keyset_page, parse_page_size
+from .dashboard import get_dashboard_snapshot
+from .alerts import get_active_alerts
+from .exports import EXPORTS, ExportError, csv_chunks, export_queryset, write_xlsx
+from .issues import IssueError, issue_stock
 from decimal import Decimal
-from finished_goods.models import BoxOrder
+import io
+import json
+import tempfile
+
+# Seconds the browser may reuse a typeahead or preset response
+SUGGESTION_MAX_AGE = 30
+
+# URL/template names of the transaction tables
+TRANSACTION_MODELS = {
+    'paper_reels': PaperReel,
+    'pasting_gum': PastingGum,
+    'ink_stock': Ink,
+    'strapping_rolls': StrappingRoll,
+    'pin_coils': PinCoil,
+}
 
 @login_required
 def inventory_overview(request):
     view_type = request.GET.get('view', 'summary')
     context = {
         'view_type': view_type,
-        'paper_reels': PaperReelSummary.objects.all() if view_type == 'summary' else PaperReel.objects.all().order_by('-timestamp'),
-        'pasting_gum': PastingGumSummary.objects.all() if view_type == 'summary' else PastingGum.objects.all().order_by('-timestamp'),
-        'ink_stock': InkSummary.objects.all() if view_type == 'summary' else Ink.objects.all().order_by('-timestamp'),
-        'strapping_rolls': StrappingRollSummary.objects.all() if view_type == 'summary' else StrappingRoll.objects.all().order_by('-timestamp'),
-        'pin_coils': PinCoilSummary.objects.all() if view_type == 'summary' else PinCoil.objects.all().order_by('-timestamp'),
         'activity_logs': InventoryLog.objects.all()[:50]
     }
+    if view_type == 'summary':
+        context.update({
+            'paper_reels': PaperReelSummary.objects.all(),
+            'pasting_gum': PastingGumSummary.objects.all(),
+            'ink_stock': InkSummary.objects.all(),
+            'strapping_rolls': StrappingRollSummary.objects.all(),
+            'pin_coils': PinCoilSummary.objects.all(),
+        })
+    else:
+        # Only the first page of each history; the rest is fetched by transaction_page
+        next_cursors = {}
+        for name, model in TRANSACTION_MODELS.items():
+            context[name], next_cursors[name] = keyset_page(model.objects.all())
+        context['next_cursors'] = next_cursors
     return render(request, 'inventory/inventory_overview.html', context)
 
+@login_required
+def transaction_page(request, model_name):
+    """JSON page of a transaction history, newest first, for infinite scroll"""
+    model = TRANSACTION_MODELS.get(model_name)
+    if not model:
+        return JsonResponse({'status': 'error', 'message': 'Invalid model name'}, status=404)
+    try:
+        items, next_cursor = keyset_page(
+            model.objects.all(),
+            cursor=request.GET.get('cursor'),
+            page_size=parse_page_size(request.GET.get('limit')),
+        )
+    except InvalidCursor as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    return JsonResponse({
+        'status': 'success',
+        'items': [
+            {field.attname: getattr(item, field.attname) for field in model._meta.concrete_fields}
+            for item in items
+        ],
+        'next_cursor': next_cursor,
+    })
+
+@login_required
+def export_inventory(request, name):
+    """Stream an inventory table as CSV, optionally limited with ?since=/&until= (YYYY-MM-DD)"""
+    if name not in EXPORTS:
+        return JsonResponse({'status': 'error', 'message': 'Invalid export name'}, status=404)
+    try:
+        queryset = export_queryset(name, request.GET.get('since'), request.GET.get('until'))
+    except ExportError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    response = StreamingHttpResponse(csv_chunks(queryset), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{name}.csv"'
+    return response
+
+@login_required
+def export_inventory_xlsx(request, name):
+    """The same export as ``export_inventory``, as an Excel workbook"""
+    if name not in EXPORTS:
+        return JsonResponse({'status': 'error', 'message': 'Invalid export name'}, status=404)
+    workbook = tempfile.TemporaryFile()
+    try:
+        write_xlsx(export_queryset(name, request.GET.get('since'), request.GET.get('until')), workbook)
+    except ExportError as e:
+        workbook.close()
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    workbook.seek(0)
+    return FileResponse(
+        workbook, as_attachment=True, filename=f"{name}.xlsx",
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    )
+
 @login_required
 def get_summary_context():
     """Get aggregated inventory data"""
@@ -56,20 +142,10 @@ def inventory_home(request):
     if request.user.is_authenticated:
         # Show the full dashboard for authenticated users
         try:
-            from inventory.models import (
-                PaperReelSummary, PastingGumSummary, InkSummary, 
-                StrappingRollSummary, PinCoilSummary, InventoryLog
-            )
-            
             context = {
                 'title': 'Dashboard',
-                'paper_reels': PaperReelSummary.objects.all(),
-                'pasting_gum': PastingGumSummary.objects.all(),
-                'ink_stock': InkSummary.objects.all(),
-                'strapping_rolls': StrappingRollSummary.objects.all(),
-                'pin_coils': PinCoilSummary.objects.all(),
-                'recent_orders': BoxOrder.objects.all().order_by('-created_at')[:5],
-                'activity_logs': InventoryLog.objects.all()[:10],
+                **get_dashboard_snapshot(),
+                'stock_alerts': get_active_alerts(),
             }
         except Exception as e:
             # Handle any import or model errors gracefully
@@ -112,52 +188,55 @@ def add_inventory(request):
                 "extra_charges": float(request.POST.get("extra_charges", 0)),
                 "tax_percent": float(request.POST.get("tax_percent", 0)),
             }
-            # Create item based on type
-            if item_type == "Paper Reel":
-                item = PaperReel.objects.create(
-                    gsm=int(request.POST.get("gsm")),
-                    bf=request.POST.get("bf"),
-                    size=request.POST.get("size"),
-                    total_weight=float(request.POST.get("total_weight")),
-                    **common_data
-                )
-            elif item_type == "Pasting Gum":
-                item = PastingGum.objects.create(
-                    gum_type=request.POST.get("gum_type"),
-                    weight_per_bag=float(request.POST.get("weight_per_bag")),
-                    total_qty=int(request.POST.get("total_qty")),
-                    **common_data
-                )
-            elif item_type == "Ink":
-                item = Ink.objects.create(
-                    color=request.POST.get("color"),
-                    weight_per_can=float(request.POST.get("weight_per_can")),
-                    total_qty=int(request.POST.get("total_qty")),
-                    **common_data
-                )
-            elif item_type == "Strapping Roll":
-                item = StrappingRoll.objects.create(
-                    roll_type=request.POST.get("roll_type"),
-                    meters_per_roll=int(request.POST.get("meters_per_roll")),
-                    weight_per_roll=float(request.POST.get("weight_per_roll")),
-                    total_qty=int(request.POST.get("total_qty")),
-                    **common_data
-                )
-            elif item_type == "Pin Coil":
-                item = PinCoil.objects.create(
-                    coil_type=request.POST.get("coil_type"),
-                    total_qty=int(request.POST.get("total_qty")),
-                    **common_data
-                )
-            else:
-                raise ValueError(f"Invalid item type: {item_type}")
+            # The item, its log entry and the summary change commit together
+            with transaction.atomic():
+                # Create item based on type
+                if item_type == "Paper Reel":
+                    item = PaperReel.objects.create(
+                        gsm=int(request.POST.get("gsm")),
+                        bf=request.POST.get("bf"),
+                        size=request.POST.get("size"),
+                        total_weight=float(request.POST.get("total_weight")),
+                        **common_data
+                    )
+                elif item_type == "Pasting Gum":
+                    item = PastingGum.objects.create(
+                        gum_type=request.POST.get("gum_type"),
+                        weight_per_bag=float(request.POST.get("weight_per_bag")),
+                        total_qty=int(request.POST.get("total_qty")),
+                        **common_data
+                    )
+                elif item_type == "Ink":
+                    item = Ink.objects.create(
+                        color=request.POST.get("color"),
+                        weight_per_can=float(request.POST.get("weight_per_can")),
+                        total_qty=int(request.POST.get("total_qty")),
+                        **common_data
+                    )
+                elif item_type == "Strapping Roll":
+                    item = StrappingRoll.objects.create(
+                        roll_type=request.POST.get("roll_type"),
+                        meters_per_roll=int(request.POST.get("meters_per_roll")),
+                        weight_per_roll=float(request.POST.get("weight_per_roll")),
+                        total_qty=int(request.POST.get("total_qty")),
+                        **common_data
+                    )
+                elif item_type == "Pin Coil":
+                    item = PinCoil.objects.create(
+                        coil_type=request.POST.get("coil_type"),
+                        total_qty=int(request.POST.get("total_qty")),
+                        **common_data
+                    )
+                else:
+                    raise ValueError(f"Invalid item type: {item_type}")
 
-            # Log the action
-            details = f"Added {item_type} from {common_data['company_name']}"
-            log_inventory_action(request, item_type, item.id, 'ADD', details)
+                # Log the action
+                details = f"Added {item_type} from {common_data['company_name']}"
+                log_inventory_action(request, item_type, item.id, 'ADD', details)
 
-            # Update summary tables
-            update_summary_tables(item, action='add')
+                # Update summary tables
+                update_summary_tables(item, action='add')
+                record_suggestions([item])
             messages.success(request, f"{item_type} added successfully!")
             return redirect("inventory_overview")
         except Exception as e:
@@ -165,11 +244,85 @@ def add_inventory(request):
             return redirect("add_inventory")
     return render(request, "inventory/add_inventory.html")
 
+@login_required
+def bulk_add_inventory(request):
+    """
+    Add a whole goods-received batch at once.
+    Accepts an uploaded CSV/XLSX/JSON ``file`` or a JSON body of
+    ``{"items": [...]}`` rows shaped like the add_inventory form.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'status': 'error', 'message': 'Invalid request method'}, status=405)
+    try:
+        if 'file' in request.FILES:
+            upload = request.FILES['file']
+            rows = read_rows(upload, upload.name)
+        else:
+            rows = read_rows(io.BytesIO(request.body), 'batch.json')
+        created = intake_batch(rows, user=request.user.username)
+    except IntakeError as e:
+        return JsonResponse({'status': 'error', 'message': str(e), 'errors': e.errors}, status=400)
+    except (ValueError, KeyError) as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    return JsonResponse({
+        'status': 'success',
+        'created': created,
+        'message': f"Added {sum(created.values())} items",
+    })
+
+@login_required
+def issue_inventory(request):
+    """
+    Issue stock to the floor, a whole job at once.
+    Expects a JSON body of ``{"lines": [...], "order": id, "shift": "...", "notes": "..."}``
+    where each line is an ``item_type``, its key fields (gsm/bf/size for
+    paper, gum_type/weight_per_bag for gum, ...) and a ``quantity``.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'status': 'error', 'message': 'Invalid request method'}, status=405)
+    try:
+        data = json.loads(request.body)
+        lines = data.get('lines')
+        if not isinstance(lines, list):
+            raise ValueError('Expected a "lines" list')
+        order = None
+        if data.get('order'):
+            order = BoxOrder.objects.filter(pk=data['order']).first()
+            if order is None:
+                raise ValueError(f"Order {data['order']} does not exist")
+        issues = issue_stock(
+            lines,
+            order=order,
+            shift=str(data.get('shift') or '').strip(),
+            notes=str(data.get('notes') or '').strip(),
+            user=request.user.username,
+        )
+    except IssueError as e:
+        return JsonResponse({'status': 'error', 'message': str(e), 'errors': e.errors}, status=400)
+    except (ValueError, AttributeError) as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    return JsonResponse({
+        'status': 'success',
+        'issued': [
+            {'id': issue.id, 'item': f"{issue.get_kind_display()} {issue.item_key}",
+             'quantity': str(issue.quantity), 'unit_cost': str(issue.unit_cost)}
+            for issue in issues
+        ],
+        'message': f"Issued {len(issues)} items",
+    })
+
 @login_required
 def get_presets(request):
     category = request.GET.get("category")
-    presets = Preset.objects.filter(category=category).values_list("value", flat=True)
-    return JsonResponse(list(presets), safe=False)
+    response = JsonResponse(get_preset_values(category), safe=False)
+    patch_cache_control(response, private=True, max_age=SUGGESTION_MAX_AGE)
+    return response
+
+@login_required
+def stock_alerts(request):
+    """Currently active stock alerts, for the dashboard badge"""
+    alerts = get_active_alerts()
+    return JsonResponse({'status': 'success', 'count': len(alerts), 'alerts': alerts})
 
 @login_required
 def delete_inventory(request, model_name, item_id):
@@ -187,10 +340,12 @@ def delete_inventory(request, model_name, item_id):
             if model:
                 item = get_object_or_404(model, id=item_id)
                 details = f"Deleted {model_name} - {item.company_name}"
-                update_summary_tables(item, 'delete')
-                item.delete()
-                # Log the action
-                log_inventory_action(request, model_name, item_id, 'DELETE', details)
+                with transaction.atomic():
+                    update_summary_tables(item, 'delete')
+                    record_suggestions([item], sign=-1)
+                    item.delete()
+                    # Log the action
+                    log_inventory_action(request, model_name, item_id, 'DELETE', details)
                 return JsonResponse({
                     'status': 'success',
                     'message': f'{model_name.replace("_", " ").title()} deleted successfully'
@@ -222,41 +377,44 @@ def edit_inventory(request, model_name, item_id):
     item = get_object_or_404(model, id=item_id)
     if request.method == 'POST':
         try:
-            # Before updating, subtract old values
-            update_summary_tables(item, 'delete')
-            # Update common fields
-            item.company_name = request.POST.get('company_name')
-            item.price_per_kg = Decimal(request.POST.get('price_per_kg'))
-            item.freight = Decimal(request.POST.get('freight'))
-            item.extra_charges = Decimal(request.POST.get('extra_charges'))
-            item.tax_percent = Decimal(request.POST.get('tax_percent'))
-            # Update model-specific fields
-            if model_name == 'paper_reels':
-                item.gsm = int(request.POST.get('gsm'))
-                item.bf = request.POST.get('bf')
-                item.size = request.POST.get('size')
-                item.total_weight = Decimal(request.POST.get('total_weight'))
-            elif model_name in ['pasting_gum', 'ink_stock', 'pin_coils']:
-                item.total_qty = int(request.POST.get('total_qty'))
-                if model_name == 'pasting_gum':
-                    item.gum_type = request.POST.get('gum_type')
-                    item.weight_per_bag = Decimal(request.POST.get('weight_per_bag'))
-                elif model_name == 'ink_stock':
-                    item.color = request.POST.get('color')
-                    item.weight_per_can = Decimal(request.POST.get('weight_per_can'))
-                else:  # pin_coils
-                    item.coil_type = request.POST.get('coil_type')
-            elif model_name == 'strapping_rolls':
-                item.roll_type = request.POST.get('roll_type')
-                item.meters_per_roll = int(request.POST.get('meters_per_roll'))
-                item.weight_per_roll = Decimal(request.POST.get('weight_per_roll'))
-                item.total_qty = int(request.POST.get('total_qty'))
-            item.save()  # This will trigger the save method to recalculate totals
-            # After updating, add new values
-            update_summary_tables(item, 'add')
-            # Log the action
-            details = f"Modified {model_name} - {item.company_name}"
-            log_inventory_action(request, model_name, item_id, 'EDIT', details)
+            with transaction.atomic():
+                # Before updating, subtract old values
+                update_summary_tables(item, 'delete', source='CORRECTION')
+                record_suggestions([item], sign=-1)
+                # Update common fields
+                item.company_name = request.POST.get('company_name')
+                item.price_per_kg = Decimal(request.POST.get('price_per_kg'))
+                item.freight = Decimal(request.POST.get('freight'))
+                item.extra_charges = Decimal(request.POST.get('extra_charges'))
+                item.tax_percent = Decimal(request.POST.get('tax_percent'))
+                # Update model-specific fields
+                if model_name == 'paper_reels':
+                    item.gsm = int(request.POST.get('gsm'))
+                    item.bf = request.POST.get('bf')
+                    item.size = request.POST.get('size')
+                    item.total_weight = Decimal(request.POST.get('total_weight'))
+                elif model_name in ['pasting_gum', 'ink_stock', 'pin_coils']:
+                    item.total_qty = int(request.POST.get('total_qty'))
+                    if model_name == 'pasting_gum':
+                        item.gum_type = request.POST.get('gum_type')
+                        item.weight_per_bag = Decimal(request.POST.get('weight_per_bag'))
+                    elif model_name == 'ink_stock':
+                        item.color = request.POST.get('color')
+                        item.weight_per_can = Decimal(request.POST.get('weight_per_can'))
+                    else:  # pin_coils
+                        item.coil_type = request.POST.get('coil_type')
+                elif model_name == 'strapping_rolls':
+                    item.roll_type = request.POST.get('roll_type')
+                    item.meters_per_roll = int(request.POST.get('meters_per_roll'))
+                    item.weight_per_roll = Decimal(request.POST.get('weight_per_roll'))
+                    item.total_qty = int(request.POST.get('total_qty'))
+                item.save()  # This will trigger the save method to recalculate totals
+                # After updating, add new values
+                update_summary_tables(item, 'add', source='CORRECTION')
+                record_suggestions([item])
+                # Log the action
+                details = f"Modified {model_name} - {item.company_name}"
+                log_inventory_action(request, model_name, item_id, 'EDIT', details)
             return JsonResponse({'status': 'success'})
         except Exception as e:
             return JsonResponse({'status': 'error', 'message': str(e)})
@@ -313,173 +471,6 @@ def log_inventory_action(request, item_type, item_id, action, details):
     )
 
 
-def update_summary_tables(instance, action='add'):
-    """Update summary tables when transactions occur"""
-    if isinstance(instance, PaperReel):
-        summary, created = PaperReelSummary.objects.get_or_create(
-            gsm=instance.gsm,
-            bf=instance.bf,
-            size=instance.size,
-            defaults={
-                'total_weight': Decimal('0.00'),
-                'total_rolls': 0,
-                'avg_price_per_kg': Decimal('0.00')
-            }
-        )
-        
-        if action == 'add':
-            summary.total_weight = Decimal(str(summary.total_weight)) + Decimal(str(instance.total_weight))
-            summary.total_rolls = int(summary.total_rolls) + 1
-        elif action == 'delete':
-            if summary.total_rolls > 0 and Decimal(str(summary.total_weight)) >= Decimal(str(instance.total_weight)):
-                summary.total_weight = Decimal(str(summary.total_weight)) - Decimal(str(instance.total_weight))
-                summary.total_rolls = int(summary.total_rolls) - 1
-            else:
-                summary.total_weight = Decimal('0.00')
-                summary.total_rolls = 0
-        
-        if summary.total_weight > 0:
-            total_items = PaperReel.objects.filter(
-                gsm=instance.gsm,
-                bf=instance.bf,
-                size=instance.size
-            )
-            avg_price = total_items.aggregate(Avg('price_per_kg'))['price_per_kg__avg']
-            summary.avg_price_per_kg = Decimal(str(avg_price)) if avg_price else Decimal('0.00')
-        else:
-            summary.avg_price_per_kg = Decimal('0.00')
-        
-        summary.save()
-
-    elif isinstance(instance, PastingGum):
-        summary, created = PastingGumSummary.objects.get_or_create(
-            gum_type=instance.gum_type,
-            weight_per_bag=instance.weight_per_bag,
-            defaults={
-                'total_bags': 0,
-                'total_weight': 0,
-                'avg_price_per_kg': 0
-            }
-        )
-        
-        if action == 'add':
-            summary.total_bags = int(summary.total_bags) + int(instance.total_qty)
-            summary.total_weight = float(summary.total_weight) + (float(instance.total_qty) * float(instance.weight_per_bag))
-        elif action == 'delete':
-            if summary.total_bags >= int(instance.total_qty):
-                summary.total_bags = int(summary.total_bags) - int(instance.total_qty)
-                summary.total_weight = float(summary.total_weight) - (float(instance.total_qty) * float(instance.weight_per_bag))
-            else:
-                summary.total_bags = 0
-                summary.total_weight = 0
-        
-        if summary.total_bags > 0:
-            total_items = PastingGum.objects.filter(
-                gum_type=instance.gum_type,
-                weight_per_bag=instance.weight_per_bag
-            )
-            avg_price = total_items.aggregate(Avg('price_per_kg'))['price_per_kg__avg']
-            summary.avg_price_per_kg = float(avg_price) if avg_price else 0
-        else:
-            summary.avg_price_per_kg = 0
-        
-        summary.save()
-
-    elif isinstance(instance, Ink):
-        summary, created = InkSummary.objects.get_or_create(
-            color=instance.color,
-            weight_per_can=instance.weight_per_can,
-            defaults={
-                'total_cans': 0,
-                'total_weight': 0,
-                'avg_price_per_kg': 0
-            }
-        )
-        
-        if action == 'add':
-            summary.total_cans = int(summary.total_cans) + int(instance.total_qty)
-            summary.total_weight = float(summary.total_weight) + (float(instance.total_qty) * float(instance.weight_per_can))
-        elif action == 'delete':
-            if summary.total_cans >= int(instance.total_qty):
-                summary.total_cans = int(summary.total_cans) - int(instance.total_qty)
-                summary.total_weight = float(summary.total_weight) - (float(instance.total_qty) * float(instance.weight_per_can))
-            else:
-                summary.total_cans = 0
-                summary.total_weight = 0
-        
-        if summary.total_weight > 0:
-            total_items = Ink.objects.filter(
-                color=instance.color,
-                weight_per_can=instance.weight_per_can
-            )
-            avg_price = total_items.aggregate(Avg('price_per_kg'))['price_per_kg__avg']
-            summary.avg_price_per_kg = float(avg_price) if avg_price else 0
-        else:
-            summary.avg_price_per_kg = 0
-        
-        summary.save()
-
-    elif isinstance(instance, StrappingRoll):
-        summary, created = StrappingRollSummary.objects.get_or_create(
-            roll_type=instance.roll_type,
-            meters_per_roll=instance.meters_per_roll,
-            weight_per_roll=instance.weight_per_roll,
-            defaults={
-                'total_rolls': 0,
-                'total_meters': 0,
-                'avg_price_per_roll': 0
-            }
-        )
-        
-        if action == 'add':
-            summary.total_rolls = int(summary.total_rolls) + int(instance.total_qty)
-            summary.total_meters = int(summary.total_meters) + (int(instance.total_qty) * int(instance.meters_per_roll))
-        elif action == 'delete':
-            if summary.total_rolls >= int(instance.total_qty):
-                summary.total_rolls = int(summary.total_rolls) - int(instance.total_qty)
-                summary.total_meters = int(summary.total_meters) - (int(instance.total_qty) * int(instance.meters_per_roll))
-            else:
-                summary.total_rolls = 0
-                summary.total_meters = 0
-        
-        if summary.total_rolls > 0:
-            total_items = StrappingRoll.objects.filter(
-                roll_type=instance.roll_type,
-                meters_per_roll=instance.meters_per_roll
-            )
-            avg_price = total_items.aggregate(Avg('price_per_kg'))['price_per_kg__avg']
-            summary.avg_price_per_roll = float(avg_price) * float(instance.weight_per_roll) if avg_price else 0
-        else:
-            summary.avg_price_per_roll = 0
-        
-        summary.save()
-
-    elif isinstance(instance, PinCoil):
-        summary, created = PinCoilSummary.objects.get_or_create(
-            coil_type=instance.coil_type,
-            defaults={
-                'total_quantity': 0,
-                'avg_price_per_unit': 0
-            }
-        )
-        
-        if action == 'add':
-            summary.total_quantity = int(summary.total_quantity) + int(instance.total_qty)
-        elif action == 'delete':
-            if summary.total_quantity >= int(instance.total_qty):
-                summary.total_quantity = int(summary.total_quantity) - int(instance.total_qty)
-            else:
-                summary.total_quantity = 0
-        
-        if summary.total_quantity > 0:
-            total_items = PinCoil.objects.filter(coil_type=instance.coil_type)
-            avg_price = total_items.aggregate(Avg('price_per_kg'))['price_per_kg__avg']
-            summary.avg_price_per_unit = float(avg_price) if avg_price else 0
-        else:
-            summary.avg_price_per_unit = 0
-        
-        summary.save()
-
 @login_required
 def get_field_suggestions(request):
     """
@@ -489,44 +480,10 @@ def get_field_suggestions(request):
     field = request.GET.get('field')
     model_type = request.GET.get('model_type')
     query = request.GET.get('query', '').strip()
-    
-    print(f"Looking for suggestions: field={field}, model_type={model_type}, query={query}")
-    
-    # Map URL parameters to model classes
-    model_map = {
-        'Paper Reel': PaperReel,
-        'Pasting Gum': PastingGum,
-        'Ink': Ink,
-        'Strapping Roll': StrappingRoll,
-        'Pin Coil': PinCoil
-    }
-    
+
     if not field or not model_type or query == '':
         return JsonResponse({'suggestions': []})
-    
-    model = model_map.get(model_type)
-    if not model:
-        return JsonResponse({'suggestions': []})
-    
-    # Get unique values for the requested field
-    try:
-        # For numeric fields like gsm, handle them differently
-        if field == 'gsm':
-            # For numeric fields, we want exact matches at the beginning
-            queryset = model.objects.filter(
-                **{f"{field}__startswith": query}
-            ).values_list(field, flat=True).distinct().order_by(field)[:10]
-        else:
-            # For text fields, use case-insensitive contains
-            queryset = model.objects.filter(
-                **{f"{field}__icontains": query}
-            ).values_list(field, flat=True).distinct().order_by(field)[:10]
-        
-        # Convert all values to strings for consistent output
-        suggestions = [str(value) for value in queryset]
-        
-        print(f"Found {len(suggestions)} suggestions for {field}: {suggestions}")
-        return JsonResponse({'suggestions': suggestions})
-    except Exception as e:
-        print(f"Error getting suggestions: {str(e)}")
-        return JsonResponse({'suggestions': [], 'error': str(e)})
\ No newline at end of file
+
+    response = JsonResponse({'suggestions': suggest(model_type, field, query)})
+    patch_cache_control(response, private=True, max_age=SUGGESTION_MAX_AGE)
+    return response
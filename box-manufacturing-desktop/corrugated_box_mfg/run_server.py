@@ -1,8 +1,13 @@
 #!/usr/bin/env python
+import time
+PROCESS_START = time.perf_counter()
+
 import os
 import sys
 from pathlib import Path
 import logging
+import hashlib
+from contextlib import contextmanager
 import django
 import shutil
 
@@ -14,6 +19,53 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Set to 1 to run migrate and the superuser check even if the schema looks current
+FORCE_STARTUP_CHECKS = os.environ.get('BOX_MFG_FORCE_STARTUP_CHECKS') == '1'
+
+# --serve runs the app under the production server in box_mfg/server.py
+# (waitress or gunicorn) instead of Django's development runserver
+SERVE_MODE = '--serve' in sys.argv
+if SERVE_MODE:
+    sys.argv.remove('--serve')
+
+@contextmanager
+def startup_phase(name, timings):
+    """Log how long a startup phase takes and record it in ``timings``"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        timings.append((name, elapsed))
+        logger.info(f"Startup phase '{name}' took {elapsed * 1000:.0f} ms")
+
+def migration_fingerprint():
+    """Hash of every bundled migration, as a positive 32-bit integer"""
+    from django.db.migrations.loader import MigrationLoader
+
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    digest = hashlib.sha256()
+    for app_label, name in sorted(loader.disk_migrations):
+        digest.update(f"{app_label}.{name}\n".encode())
+    # Zero is SQLite's default user_version, so never use it as a fingerprint
+    return int.from_bytes(digest.digest()[:4], 'big') & 0x7FFFFFFF or 1
+
+def stored_fingerprint():
+    """Fingerprint saved in the SQLite header by the last successful migrate"""
+    from django.db import connection
+    if connection.vendor != 'sqlite':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA user_version')
+        return cursor.fetchone()[0]
+
+def store_fingerprint(fingerprint):
+    from django.db import connection
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'PRAGMA user_version = {int(fingerprint)}')
+
 def setup_django_environment():
     try:
         # Set the Django settings module
@@ -77,8 +129,11 @@ def run_server():
     """Run the Django server with appropriate settings"""
     from django.core.management import execute_from_command_line
     
+    timings = []
     try:
-        if not setup_django_environment():
+        with startup_phase('django setup', timings):
+            django_ready = setup_django_environment()
+        if not django_ready:
             logger.error("Failed to setup Django environment")
             input("Press Enter to exit...")
             return
@@ -90,20 +145,47 @@ def run_server():
             server_args = sys.argv
 
         try:
-            # Apply migrations
-            logger.info("Applying migrations...")
-            execute_from_command_line(['manage.py', 'migrate', '--noinput'])
-            
-            # Create superuser if needed
-            from django.contrib.auth.models import User
-            if not User.objects.filter(is_superuser=True).exists():
-                logger.info("Creating default admin user...")
-                User.objects.create_superuser('admin', 'admin@example.com', 'admin')
-                logger.info("Default admin user created with username 'admin' and password 'admin'")
-            
+            # Only migrate when the bundled migrations differ from the ones
+            # recorded in the database on the last launch
+            with startup_phase('migration check', timings):
+                fingerprint = migration_fingerprint()
+                needs_migrate = FORCE_STARTUP_CHECKS or stored_fingerprint() != fingerprint
+
+            if needs_migrate:
+                # Apply migrations
+                with startup_phase('migrate', timings):
+                    logger.info("Applying migrations...")
+                    execute_from_command_line(['manage.py', 'migrate', '--noinput'])
+
+                # Create superuser if needed
+                with startup_phase('superuser check', timings):
+                    from django.contrib.auth.models import User
+                    if not User.objects.filter(is_superuser=True).exists():
+                        logger.info("Creating default admin user...")
+                        User.objects.create_superuser('admin', 'admin@example.com', 'admin')
+                        logger.info("Default admin user created with username 'admin' and password 'admin'")
+
+                store_fingerprint(fingerprint)
+            else:
+                logger.info("Database schema is up to date, skipping migrations")
+
+            logger.info(
+                f"Startup finished in {(time.perf_counter() - PROCESS_START) * 1000:.0f} ms ("
+                + ", ".join(f"{name}: {elapsed * 1000:.0f} ms" for name, elapsed in timings)
+                + ")"
+            )
+
+            # Keep the SQLite planner statistics and WAL file in shape while running
+            from box_mfg.sqlite_maintenance import start_maintenance_thread
+            start_maintenance_thread()
+
             # Start the server
-            logger.info("Starting Django server on http://127.0.0.1:8000")
-            execute_from_command_line(server_args)
+            if SERVE_MODE:
+                from box_mfg.server import serve
+                serve()
+            else:
+                logger.info("Starting Django server on http://127.0.0.1:8000")
+                execute_from_command_line(server_args)
         
         except Exception as e:
             logger.error(f"Error during server operations: {str(e)}")
@@ -172,7 +172,7 @@ function startDjangoServer() {
   }
   
   // Configure the process
-  const args = isDev ? ['manage.py', 'runserver'] : [];
+  const args = isDev ? ['manage.py', 'runserver'] : ['--serve'];
   const cwd = isDev 
     ? path.join(projectRoot, 'corrugated_box_mfg')
     : path.dirname(djangoExecutable);